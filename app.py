@@ -1,12 +1,20 @@
 from flask import Flask, jsonify
 from src.config.config import Config
-from src.config.database import db
+from src.config.database import db, init_foreign_keys, init_read_routing
+from src.config.json_provider import init_json_provider
+from src.config.metrics import init_metrics
+from src.config.profiling import init_profiling
+from src.controllers.stats_controller import StatsController
 from src.routes.routes import api_bp
+from src.services.cache import init_user_cache
 
 def create_app(config_class=Config):
     """
     Factory para crear la aplicación Flask.
     
+    No accede a la base de datos: el esquema se gestiona con migraciones
+    versionadas (carpeta migrations/, CLI en manage.py).
+    
     Args:
         config_class: Clase de configuración a usar
     
@@ -16,8 +24,22 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
-    # Inicializar base de datos
+    # Instalar el serializador JSON configurado
+    init_json_provider(app)
+    
+    # Inicializar base de datos y enrutamiento de lecturas a réplicas
     db.init_app(app)
+    init_foreign_keys(app)
+    init_read_routing(app)
+    
+    # Inicializar caché de usuarios
+    init_user_cache(app)
+    
+    # Inicializar métricas (los hooks de petición están en api_bp)
+    init_metrics(app)
+    
+    # Perfilado opcional por petición (PROFILING_ENABLED)
+    init_profiling(app)
     
     # Registrar blueprints (rutas)
     app.register_blueprint(api_bp)
@@ -31,22 +53,38 @@ def create_app(config_class=Config):
             'endpoints': {
                 'users': {
                     'POST /api/users': 'Crear usuario',
-                    'GET /api/users/:id': 'Consultar usuario por ID'
+                    'GET /api/users/:id': 'Consultar usuario por ID',
+                    'GET /api/users/:id/summary': 'Resumen de tareas de usuario'
+                },
+                'stats': {
+                    'GET /api/stats/cache': 'Contadores de la caché de usuarios',
+                    'GET /api/stats/pool': 'Estado de los pools de conexiones'
                 },
                 'tasks': {
                     'POST /api/tasks': 'Crear tarea',
+                    'POST /api/tasks/bulk': 'Crear tareas en lote',
                     'GET /api/users/:id/tasks': 'Listar tareas de usuario',
+                    'GET /api/users/:id/tasks/search': 'Buscar tareas de usuario por texto',
+                    'GET /api/users/:id/tasks/export': 'Exportar tareas de usuario (NDJSON/CSV)',
                     'PUT /api/tasks/:id': 'Actualizar estado de tarea',
                     'PATCH /api/tasks/:id/complete': 'Marcar tarea como completada',
-                    'DELETE /api/tasks/:id': 'Eliminar tarea'
+                    'PATCH /api/tasks/bulk': 'Completar o reabrir tareas en lote',
+                    'DELETE /api/tasks/:id': 'Eliminar tarea',
+                    'DELETE /api/tasks/bulk': 'Eliminar tareas en lote'
                 }
+            },
+            'metrics': {
+                'GET /metrics': 'Métricas de peticiones y SQL (Prometheus)'
             }
         }), 200
     
-    # Crear tablas en la base de datos
-    with app.app_context():
-        db.create_all()
+    # Métricas en formato de texto de Prometheus
+    @app.route('/metrics')
+    def metrics():
+        return StatsController.get_metrics()
     
+    # El esquema no se crea aquí: se aplica con las migraciones
+    # (flask --app manage db upgrade) antes de arrancar los workers
     return app
 
 if __name__ == '__main__':
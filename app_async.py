@@ -0,0 +1,64 @@
+from quart import Quart, jsonify
+from src.config.config import AsyncConfig
+from src.config.async_database import async_db
+from src.routes.async_routes import async_api_bp
+from src.services.cache import init_user_cache
+
+def create_async_app(config_class=AsyncConfig):
+    """
+    Factory para crear la aplicación en modo ASGI (Quart).
+    
+    Los controladores y servicios se ejecutan como corrutinas sobre un engine
+    asíncrono (asyncpg en PostgreSQL), de modo que un solo proceso atiende
+    muchas peticiones concurrentes mientras esperan a la base de datos.
+    
+    Uso:
+        hypercorn "app_async:create_async_app()" --bind 127.0.0.1:8888
+    
+    Args:
+        config_class: Clase de configuración a usar
+    
+    Returns:
+        Quart: Aplicación Quart configurada
+    """
+    app = Quart(__name__)
+    app.config.from_object(config_class)
+    
+    # Inicializar base de datos asíncrona
+    async_db.init_app(app)
+    
+    # Caché de usuarios: las escrituras asíncronas invalidan sus entradas
+    # (con USER_CACHE_URL, las mismas que leen los workers síncronos)
+    init_user_cache(app)
+    
+    # Registrar blueprints (rutas)
+    app.register_blueprint(async_api_bp)
+    
+    # Ruta raíz
+    @app.route('/')
+    async def index():
+        return jsonify({
+            'message': 'ToDo API - Sistema de Gestión de Tareas (ASGI)',
+            'version': '1.0.0',
+            'endpoints': {
+                'users': {
+                    'POST /api/users': 'Crear usuario',
+                    'GET /api/users/:id': 'Consultar usuario por ID',
+                    'GET /api/users/:id/summary': 'Resumen de tareas de usuario'
+                },
+                'tasks': {
+                    'POST /api/tasks': 'Crear tarea',
+                    'GET /api/users/:id/tasks': 'Listar tareas de usuario',
+                    'PUT /api/tasks/:id': 'Actualizar estado de tarea',
+                    'PATCH /api/tasks/:id/complete': 'Marcar tarea como completada',
+                    'DELETE /api/tasks/:id': 'Eliminar tarea'
+                }
+            }
+        }), 200
+    
+    # El esquema se aplica con las migraciones (flask --app manage db upgrade)
+    return app
+
+if __name__ == '__main__':
+    app = create_async_app()
+    app.run(host='127.0.0.1', port=8888, debug=True)
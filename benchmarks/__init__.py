@@ -0,0 +1 @@
+# Inicializador del paquete benchmarks
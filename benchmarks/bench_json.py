@@ -0,0 +1,78 @@
+"""
+Micro-benchmark - Serialización JSON de respuestas
+Compara el proveedor estándar de Flask con FastJSONProvider sobre un
+listado de tareas (por defecto 10.000).
+
+Uso:
+    python -m benchmarks.bench_json --tasks 10000 --repeat 20
+"""
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from src.config import json_provider
+from src.config.json_provider import FastJSONProvider
+
+
+def build_payload(count):
+    """Genera un cuerpo equivalente al de GET /api/users/:id/tasks."""
+    start = datetime(2025, 1, 1)
+    tasks = [
+        {
+            'id': i,
+            'title': f'Tarea número {i}',
+            'description': 'Descripción de ejemplo con texto de longitud media ' * 2,
+            'is_completed': i % 3 == 0,
+            'user_id': 1,
+            'created_at': (start + timedelta(seconds=i)).isoformat()
+        }
+        for i in range(1, count + 1)
+    ]
+    return {'user_id': 1, 'tasks': tasks, 'total': count, 'next_cursor': None}
+
+
+def measure(app, provider, payload, repeat):
+    """Devuelve los tiempos (en ms) de generar la respuesta completa."""
+    app.json = provider
+    timings = []
+    with app.app_context():
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = provider.response(payload)
+            response.get_data()
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tasks', type=int, default=10000, help='Tareas en el payload')
+    parser.add_argument('--repeat', type=int, default=20, help='Repeticiones por proveedor')
+    args = parser.parse_args(argv)
+    
+    app = Flask(__name__)
+    payload = build_payload(args.tasks)
+    
+    candidates = [('flask (json estándar)', DefaultJSONProvider(app))]
+    if json_provider.orjson is not None:
+        candidates.append(('fast (orjson)', FastJSONProvider(app)))
+    else:
+        print('orjson no está instalado: FastJSONProvider usará el json estándar')
+        candidates.append(('fast (fallback json)', FastJSONProvider(app)))
+    
+    print(f'Payload: {args.tasks} tareas, {args.repeat} repeticiones\n')
+    print(f"{'proveedor':<24}{'mediana (ms)':>14}{'mínimo (ms)':>14}")
+    baseline = None
+    for name, provider in candidates:
+        timings = measure(app, provider, payload, args.repeat)
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f'{name:<24}{median:>14.2f}{min(timings):>14.2f}   x{baseline / median:.1f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
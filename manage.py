@@ -0,0 +1,13 @@
+"""
+Aplicación para la CLI de migraciones del esquema (Flask-Migrate).
+
+Uso:
+    flask --app manage db upgrade                     # aplicar migraciones
+    flask --app manage db migrate -m "descripción"    # nueva revisión
+    flask --app manage db stamp 0001                  # base de la versión original (create_all),
+                                                      # después db upgrade
+"""
+from app import create_app
+from src.config.migrations import init_migrations
+
+app = init_migrations(create_app())
@@ -0,0 +1,60 @@
+"""Contadores de tareas por usuario (task_count, completed_task_count)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 21:05:12.418306
+
+Añade los contadores que mantienen las escrituras de tareas y los
+inicializa con las tareas que ya existen, para que /summary sea correcto
+desde el primer momento en bases con datos.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+users = sa.table(
+    'users',
+    sa.column('id', sa.Integer),
+    sa.column('task_count', sa.Integer),
+    sa.column('completed_task_count', sa.Integer)
+)
+tasks = sa.table('tasks', sa.column('user_id', sa.Integer), sa.column('is_completed', sa.Boolean))
+
+
+def _task_count(*conditions):
+    """Subconsulta correlacionada con el número de tareas de cada usuario."""
+    return (
+        sa.select(sa.func.count())
+        .select_from(tasks)
+        .where(tasks.c.user_id == users.c.id, *conditions)
+        .scalar_subquery()
+    )
+
+
+def upgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('task_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(
+            sa.Column('completed_task_count', sa.Integer(), server_default='0', nullable=False)
+        )
+
+    # Inicializar los contadores con las tareas existentes
+    op.execute(
+        users.update().values(
+            task_count=_task_count(),
+            completed_task_count=_task_count(tasks.c.is_completed == sa.true())
+        )
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('completed_task_count')
+        batch_op.drop_column('task_count')
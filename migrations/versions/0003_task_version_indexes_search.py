@@ -0,0 +1,133 @@
+"""Versión de tareas, índices de listado y búsqueda de texto completo
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 21:24:37.902114
+
+Añade users.task_version (ETag de usuario y tareas), los índices
+compuestos y el parcial de tareas pendientes, y el índice de búsqueda por
+dialecto. En SQLite el índice FTS5 se reconstruye con las tareas que ya
+existían; en PostgreSQL la columna generada se calcula al añadirla.
+
+Bloqueos en PostgreSQL:
+- users.task_version tiene un DEFAULT constante: desde PostgreSQL 11 se
+  añade sin reescribir la tabla.
+- tasks.search_vector es una columna generada STORED: añadirla reescribe
+  la tabla tasks con un bloqueo ACCESS EXCLUSIVE (bloquea lecturas y
+  escrituras) durante todo el cálculo. En tablas grandes hay que aplicar
+  esta revisión en una ventana de mantenimiento.
+- Los índices se crean con CREATE INDEX CONCURRENTLY fuera de la
+  transacción de la migración, sin bloquear las escrituras.
+
+Si la revisión falla a medias en PostgreSQL, puede repetirse: la columna y
+los índices se crean con IF NOT EXISTS. Un índice cuya creación falló
+queda INVALID y IF NOT EXISTS lo daría por creado, así que antes de
+repetir hay que eliminarlo con DROP INDEX CONCURRENTLY.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+# PostgreSQL: columna tsvector generada (título con más peso) e índice GIN
+POSTGRESQL_SEARCH_COLUMN = """ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(description, '')), 'B')
+    ) STORED"""
+POSTGRESQL_SEARCH_INDEX = (
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector)'
+)
+
+# SQLite: índice FTS5 de contenido externo sincronizado por triggers
+SQLITE_SEARCH_DDL = (
+    """CREATE VIRTUAL TABLE tasks_fts USING fts5(
+        title, description, content='tasks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER tasks_fts_after_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER tasks_fts_after_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER tasks_fts_after_update AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+)
+
+# Objetos de búsqueda que eliminar en downgrade, por dialecto
+POSTGRESQL_SEARCH_DROP = (
+    'DROP INDEX IF EXISTS ix_tasks_search_vector',
+    'ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector',
+)
+SQLITE_SEARCH_DROP = (
+    'DROP TRIGGER IF EXISTS tasks_fts_after_insert',
+    'DROP TRIGGER IF EXISTS tasks_fts_after_delete',
+    'DROP TRIGGER IF EXISTS tasks_fts_after_update',
+    'DROP TABLE IF EXISTS tasks_fts',
+)
+
+
+# Índices de tareas: paginación por cursor, filtros y ordenamiento por
+# usuario, y el parcial de tareas pendientes (nombre, columnas, condición)
+_PENDING = sa.column('is_completed') == sa.false()
+TASK_INDEXES = (
+    ('ix_tasks_user_id_id', ['user_id', 'id'], None),
+    ('ix_tasks_user_id_created_at_id', ['user_id', 'created_at', 'id'], None),
+    ('ix_tasks_user_id_is_completed_id', ['user_id', 'is_completed', 'id'], None),
+    ('ix_tasks_user_id_pending_created_at', ['user_id', 'created_at', 'id'], _PENDING),
+)
+
+
+def _create_task_indexes(**kwargs):
+    for name, columns, where in TASK_INDEXES:
+        op.create_index(name, 'tasks', columns, postgresql_where=where, sqlite_where=where, **kwargs)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        # Reescribe la tabla tasks (ver el docstring del módulo); va en su
+        # propia transacción para no retener el bloqueo de users
+        op.execute(POSTGRESQL_SEARCH_COLUMN)
+        # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+        with op.get_context().autocommit_block():
+            _create_task_indexes(postgresql_concurrently=True, if_not_exists=True)
+            op.execute(POSTGRESQL_SEARCH_INDEX)
+    else:
+        _create_task_indexes()
+        if dialect == 'sqlite':
+            for statement in SQLITE_SEARCH_DDL:
+                op.execute(statement)
+            # Indexar las tareas existentes (los triggers solo cubren las nuevas)
+            op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('task_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for statement in POSTGRESQL_SEARCH_DROP:
+            op.execute(statement)
+    elif dialect == 'sqlite':
+        for statement in SQLITE_SEARCH_DROP:
+            op.execute(statement)
+
+    for name, _, _ in reversed(TASK_INDEXES):
+        op.drop_index(name, table_name='tasks')
+
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('task_version')
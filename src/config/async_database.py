@@ -0,0 +1,61 @@
+from quart import current_app, g
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from src.config.database import db, enable_foreign_keys
+
+
+class AsyncDatabase:
+    """
+    Equivalente asíncrono de la instancia db de Flask-SQLAlchemy para el
+    modo ASGI: un engine asíncrono por aplicación y una AsyncSession por
+    petición (guardada en g y cerrada al terminar la petición).
+
+    Los modelos son los mismos (User, Task); solo cambia la forma de
+    ejecutar las consultas.
+    """
+
+    def init_app(self, app):
+        """
+        Crea el engine asíncrono a partir de ASYNC_DATABASE_URI y
+        ASYNC_ENGINE_OPTIONS y registra el cierre de sesiones y del engine.
+        """
+        engine = create_async_engine(
+            app.config['ASYNC_DATABASE_URI'],
+            **app.config.get('ASYNC_ENGINE_OPTIONS', {})
+        )
+        enable_foreign_keys(engine.sync_engine)
+        app.extensions['async_db'] = {
+            'engine': engine,
+            'session_factory': async_sessionmaker(engine, expire_on_commit=False)
+        }
+
+        @app.teardown_appcontext
+        async def close_async_session(exception=None):
+            session = g.pop('async_session', None)
+            if session is not None:
+                await session.close()
+
+        @app.after_serving
+        async def dispose_async_engine():
+            await engine.dispose()
+
+    @property
+    def engine(self):
+        """Engine asíncrono de la aplicación actual."""
+        return current_app.extensions['async_db']['engine']
+
+    @property
+    def session(self):
+        """AsyncSession de la petición actual (se crea en el primer uso)."""
+        if 'async_session' not in g:
+            g.async_session = current_app.extensions['async_db']['session_factory']()
+        return g.async_session
+
+    async def create_all(self):
+        """Crea las tablas de los modelos en la base de datos asíncrona (pruebas)."""
+        async with self.engine.begin() as connection:
+            await connection.run_sync(db.metadata.create_all)
+
+
+# Instancia global para el modo ASGI
+# Se inicializa con la app en app_async.py
+async_db = AsyncDatabase()
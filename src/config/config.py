@@ -1,9 +1,63 @@
 import os
 from dotenv import load_dotenv
+from sqlalchemy.pool import NullPool
+from src.config.pool import InstrumentedQueuePool
 
 # Cargar variables de entorno desde .env
 load_dotenv()
 
+
+def _env_bool(name, default):
+    """Lee una variable de entorno booleana ('True'/'False')."""
+    return os.getenv(name, str(default)).strip().lower() in ('true', '1', 'yes')
+
+
+def build_engine_options():
+    """
+    Construye SQLALCHEMY_ENGINE_OPTIONS a partir de variables de entorno.
+    
+    DB_PGBOUNCER_TRANSACTION_MODE=True desactiva el pool de la aplicación
+    (NullPool): PgBouncer en modo transacción ya reparte las conexiones y
+    mantener conexiones propias abiertas entre transacciones no aporta nada.
+    
+    Returns:
+        dict: Opciones para create_engine
+    """
+    if _env_bool('DB_PGBOUNCER_TRANSACTION_MODE', False):
+        return {'poolclass': NullPool}
+    
+    return {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '10')),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', '30')),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800')),
+        'pool_pre_ping': _env_bool('DB_POOL_PRE_PING', True)
+    }
+
+def build_async_engine_options():
+    """
+    Opciones del engine asíncrono (create_async_engine) a partir de las
+    mismas variables de entorno que build_engine_options.
+    
+    asyncio necesita su propio pool (AsyncAdaptedQueuePool), así que no se
+    usa InstrumentedQueuePool. En modo PgBouncer se desactivan además las
+    sentencias preparadas de asyncpg, que no funcionan en modo transacción.
+    
+    Returns:
+        dict: Opciones para create_async_engine
+    """
+    options = build_engine_options()
+    if options['poolclass'] is NullPool:
+        options['connect_args'] = {
+            'statement_cache_size': 0,
+            'prepared_statement_cache_size': 0
+        }
+    else:
+        del options['poolclass']
+    return options
+
+
 class Config:
     """
     Clase de configuración para la aplicación Flask.
@@ -25,6 +79,63 @@ class Config:
     # Deshabilitar el seguimiento de modificaciones (ahorra recursos)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Pool de conexiones (tamaño, overflow, reciclado, pre-ping, modo PgBouncer)
+    SQLALCHEMY_ENGINE_OPTIONS = build_engine_options()
+    
+    # Réplica de lectura opcional: las lecturas de los servicios se envían a
+    # este bind; las escrituras siempre van al primario
+    DATABASE_REPLICA_HOST = os.getenv('DATABASE_REPLICA_HOST')
+    DATABASE_REPLICA_PORT = os.getenv('DATABASE_REPLICA_PORT', DATABASE_PORT)
+    SQLALCHEMY_BINDS = {
+        'replica': {
+            'url': (
+                f"postgresql://{DATABASE_USER}:{DATABASE_PASSWORD}@"
+                f"{DATABASE_REPLICA_HOST}:{DATABASE_REPLICA_PORT}/{DATABASE_NAME}"
+            ),
+            **SQLALCHEMY_ENGINE_OPTIONS
+        }
+    } if DATABASE_REPLICA_HOST else {}
+    
+    # Segundos durante los que un cliente lee del primario tras escribir
+    # (debe cubrir el retraso de replicación esperado)
+    READ_YOUR_WRITES_SECONDS = float(os.getenv('READ_YOUR_WRITES_SECONDS', '5'))
+    
+    # Clave con la que se firma la cookie read-your-writes (obligatoria si
+    # hay réplica de lectura)
+    SECRET_KEY = os.getenv('SECRET_KEY')
+    
+    # Caché de usuarios: 'memory' (en proceso), 'shared' (Redis o sustituto local) o 'none'
+    USER_CACHE_BACKEND = os.getenv('USER_CACHE_BACKEND', 'memory')
+    USER_CACHE_MAX_SIZE = int(os.getenv('USER_CACHE_MAX_SIZE', '10000'))
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', '60'))
+    USER_CACHE_URL = os.getenv('USER_CACHE_URL')
+    
+    # Serializador JSON de las respuestas: 'fast' (orjson si está instalado) o 'default'
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'fast')
+    
+    # Métricas de peticiones y SQL expuestas en /metrics (por proceso)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+    
+    # Perfilado por petición (cProfile): desactivado por defecto. Se perfilan
+    # las peticiones con la cabecera X-Profile igual a PROFILING_TOKEN y una
+    # fracción aleatoria PROFILING_SAMPLE_RATE (0.0 a 1.0)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False') == 'True'
+    PROFILING_TOKEN = os.getenv('PROFILING_TOKEN')
+    PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+    PROFILING_DIR = os.getenv('PROFILING_DIR', 'profiles')
+    
     # Configuración de Flask
     DEBUG = os.getenv('FLASK_DEBUG', 'True') == 'True'
     TESTING = False
+
+
+class AsyncConfig(Config):
+    """
+    Configuración del modo ASGI (app_async.py): engine asíncrono con el
+    driver asyncpg sobre la misma base de datos PostgreSQL.
+    """
+    ASYNC_DATABASE_URI = (
+        f"postgresql+asyncpg://{Config.DATABASE_USER}:{Config.DATABASE_PASSWORD}@"
+        f"{Config.DATABASE_HOST}:{Config.DATABASE_PORT}/{Config.DATABASE_NAME}"
+    )
+    ASYNC_ENGINE_OPTIONS = build_async_engine_options()
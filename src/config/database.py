@@ -1,5 +1,195 @@
+from contextlib import contextmanager
+from flask import current_app, g, has_request_context, request
 from flask_sqlalchemy import SQLAlchemy
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+
+# Bind de las réplicas de lectura en SQLALCHEMY_BINDS
+REPLICA_BIND_KEY = 'replica'
+
+# Cookie que fija las lecturas del cliente al primario tras una escritura
+PRIMARY_PIN_COOKIE = 'primary_until'
+
+# Salt de la firma de esa cookie (separa su firma de otros usos de SECRET_KEY)
+PRIMARY_PIN_SALT = 'read-your-writes'
+
+# Métodos HTTP que escriben y abren la ventana read-your-writes
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+# SQLSTATE de PostgreSQL para violación de clave foránea
+FOREIGN_KEY_VIOLATION = '23503'
+
+
+class RoutingSession(Session):
+    """
+    Sesión que envía a la réplica de lectura las consultas ejecutadas dentro
+    de replica_reads(), siempre que:
+
+    - exista un bind 'replica' configurado,
+    - la sentencia no sea una escritura ni un flush,
+    - la sesión no haya escrito nada todavía (su propia escritura aún no
+      estaría en la réplica), y
+    - el cliente no esté dentro de su ventana read-your-writes.
+
+    Todo lo demás va al primario. Si la sesión se configuró con un bind
+    explícito, se usa ese bind para todo.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        # Una sesión ligada a una conexión concreta (p. ej. la transacción
+        # externa de las pruebas) la usa siempre
+        if bind is None and self.bind is not None:
+            return self.bind
+        if bind is None and self._use_replica(clause):
+            engine = self._db.engines.get(REPLICA_BIND_KEY)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _use_replica(self, clause):
+        if not self.info.get('replica_reads') or self.info.get('has_written'):
+            return False
+        if self._flushing or isinstance(clause, UpdateBase):
+            return False
+        return not primary_pinned()
+
+
+# La marca de escritura se mantiene tras el commit (la réplica puede no
+# tenerlo aún) hasta que la sesión se cierra al final de la petición
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_flush_as_write(session, flush_context):
+    session.info['has_written'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _mark_dml_as_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['has_written'] = True
+
 
 # Instancia global de SQLAlchemy
 # Se inicializa con la app en app.py
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+
+def enable_foreign_keys(engine):
+    """
+    Activa la validación de claves foráneas en cada conexión nueva de un
+    engine SQLite (PostgreSQL las valida siempre). Admite engines síncronos
+    y el sync_engine de un engine asíncrono.
+    """
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', _enable_sqlite_foreign_keys)
+
+
+def init_foreign_keys(app):
+    """
+    Activa la validación de claves foráneas en todos los engines de la
+    aplicación. Las escrituras dependen de ella en lugar de comprobar antes
+    la existencia de las filas referenciadas.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            enable_foreign_keys(engine)
+
+
+def is_foreign_key_violation(error):
+    """
+    Indica si un IntegrityError se debe a una clave foránea inexistente.
+    
+    Args:
+        error (IntegrityError): Error lanzado por SQLAlchemy
+    
+    Returns:
+        bool: True en PostgreSQL (SQLSTATE 23503) y SQLite (FOREIGN KEY constraint failed)
+    """
+    original = error.orig
+    code = getattr(original, 'pgcode', None) or getattr(original, 'sqlstate', None)
+    if code is not None:
+        return code == FOREIGN_KEY_VIOLATION
+    return 'FOREIGN KEY constraint failed' in str(original)
+
+
+def primary_pinned():
+    """
+    Indica si el cliente de la petición actual está dentro de su ventana
+    read-your-writes (todas sus lecturas van al primario).
+    """
+    return has_request_context() and g.get('pin_primary', False)
+
+
+def replica_configured():
+    """Indica si la aplicación actual tiene un bind de réplica de lectura."""
+    return REPLICA_BIND_KEY in db.engines
+
+
+@contextmanager
+def replica_reads():
+    """
+    Contexto para operaciones de solo lectura que pueden servirse desde la
+    réplica. Sin réplica configurada no tiene efecto.
+
+    Uso:
+        with replica_reads():
+            return db.session.get(User, user_id)
+    """
+    session = db.session()
+    session.info['replica_reads'] = session.info.get('replica_reads', 0) + 1
+    try:
+        yield
+    finally:
+        session.info['replica_reads'] -= 1
+
+
+def init_read_routing(app):
+    """
+    Registra la ventana read-your-writes: tras una escritura exitosa el
+    cliente recibe una cookie que fija sus lecturas al primario durante
+    READ_YOUR_WRITES_SECONDS, el tiempo máximo de retraso esperado de las
+    réplicas. Solo se activa si hay réplica configurada.
+
+    La cookie va firmada con SECRET_KEY y lleva la hora de la escritura: la
+    ventana la calcula el servidor, así que un cliente no puede fijarse al
+    primario más tiempo ni por su cuenta.
+
+    Raises:
+        RuntimeError: Si hay réplica configurada y falta SECRET_KEY
+    """
+    if REPLICA_BIND_KEY not in app.config.get('SQLALCHEMY_BINDS', {}):
+        return
+    if not app.config.get('SECRET_KEY'):
+        raise RuntimeError(
+            'SECRET_KEY es obligatoria con réplica de lectura: firma la cookie read-your-writes'
+        )
+    serializer = URLSafeTimedSerializer(app.config['SECRET_KEY'], salt=PRIMARY_PIN_SALT)
+
+    @app.before_request
+    def pin_primary_after_write():
+        token = request.cookies.get(PRIMARY_PIN_COOKIE)
+        window = current_app.config.get('READ_YOUR_WRITES_SECONDS', 5)
+        try:
+            # Caducada (max_age) o alterada: lecturas normales
+            g.pin_primary = token is not None and serializer.loads(token, max_age=window)
+        except BadSignature:
+            g.pin_primary = False
+
+    @app.after_request
+    def open_read_your_writes_window(response):
+        if request.method in WRITE_METHODS and response.status_code < 400:
+            window = current_app.config.get('READ_YOUR_WRITES_SECONDS', 5)
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                serializer.dumps(True),
+                max_age=int(window) + 1,
+                httponly=True,
+                samesite='Lax'
+            )
+        return response
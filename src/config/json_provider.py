@@ -0,0 +1,86 @@
+from datetime import date, datetime
+from flask.json.provider import DefaultJSONProvider
+
+# Dependencia opcional: si orjson no está instalado se usa el json estándar
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+
+def _default(obj):
+    """
+    Serializa tipos no nativos de JSON. Las fechas se escriben en ISO 8601
+    (el proveedor por defecto de Flask usa el formato HTTP/RFC 822).
+    """
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return DefaultJSONProvider.default(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Proveedor JSON de alto rendimiento para todas las respuestas de la API.
+    
+    Con orjson instalado serializa directamente a bytes, con soporte nativo
+    de datetime, y entrega esos bytes a la respuesta sin pasar por str.
+    Sin orjson usa el json estándar con el mismo formato de fechas ISO 8601.
+    """
+    
+    default = staticmethod(_default)
+    
+    @property
+    def backend(self):
+        """Nombre del serializador efectivo ('orjson' o 'json')."""
+        return 'orjson' if orjson is not None else 'json'
+    
+    def _orjson_options(self, indent=False):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+    
+    def dumps(self, obj, **kwargs):
+        """
+        Serializa a str. Si se pasan argumentos propios de json.dumps se
+        respeta el comportamiento estándar.
+        """
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._orjson_options()).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        """
+        Genera la respuesta JSON escribiendo los bytes de orjson directamente
+        en el cuerpo (sin codificar/decodificar a str).
+        """
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(
+            obj,
+            default=self.default,
+            option=self._orjson_options(indent=indent) | orjson.OPT_APPEND_NEWLINE
+        )
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json_provider(app):
+    """
+    Instala FastJSONProvider si JSON_PROVIDER es 'fast'. Con 'default' se
+    mantiene el proveedor estándar de Flask.
+    """
+    provider = app.config.get('JSON_PROVIDER', 'fast')
+    if provider == 'fast':
+        app.json = FastJSONProvider(app)
+    elif provider != 'default':
+        raise ValueError(f"Proveedor JSON desconocido: {provider}")
@@ -0,0 +1,235 @@
+import threading
+import time
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from src.config.database import db
+
+# Límites (en segundos) de los buckets de latencia de las peticiones
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Límites de los buckets de sentencias SQL por petición
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# Tipo MIME del formato de texto de Prometheus
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_labels(names, values):
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{escaped}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base de las métricas: nombre, ayuda, etiquetas y un lock propio."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_samples(items))
+        return lines
+
+    def _render_samples(self, items):
+        return [
+            f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}'
+            for labels, value in items
+        ]
+
+
+class Counter(_Metric):
+    """Contador monótono por combinación de etiquetas."""
+
+    kind = 'counter'
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    """Valor que sube y baja (p. ej. peticiones en curso)."""
+
+    kind = 'gauge'
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, labels=(), amount=1):
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    """Histograma con buckets acumulativos, suma y número de observaciones."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value, labels=()):
+        with self._lock:
+            counts, total = self._values.get(labels, ([0] * len(self.buckets), 0.0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._values[labels] = (counts, total + value)
+
+    def _render_samples(self, items):
+        lines = []
+        bucket_labels = self.labelnames + ('le',)
+        for labels, (counts, total) in items:
+            for bound, count in zip(self.buckets, counts):
+                label_text = _format_labels(bucket_labels, labels + (_format_value(bound),))
+                lines.append(f'{self.name}_bucket{label_text} {count}')
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f'{self.name}_sum{label_text} {_format_value(total)}')
+            lines.append(f'{self.name}_count{label_text} {counts[-1]}')
+        return lines
+
+
+class RequestMetrics:
+    """
+    Registro de métricas HTTP y SQL de la aplicación, por método y ruta
+    (la regla de URL, p. ej. /api/users/<int:user_id>/tasks, no la URL
+    concreta, para acotar el número de series).
+    """
+
+    def __init__(self):
+        route_labels = ('method', 'route')
+        self.requests = Counter(
+            'todo_api_http_requests_total',
+            'Peticiones HTTP atendidas por método, ruta y código de estado',
+            route_labels + ('status',)
+        )
+        self.latency = Histogram(
+            'todo_api_http_request_duration_seconds',
+            'Latencia de las peticiones HTTP en segundos',
+            route_labels
+        )
+        self.in_progress = Gauge(
+            'todo_api_http_requests_in_progress',
+            'Peticiones HTTP en curso',
+            route_labels
+        )
+        self.db_queries = Histogram(
+            'todo_api_db_queries_per_request',
+            'Sentencias SQL ejecutadas por petición',
+            route_labels,
+            buckets=QUERY_COUNT_BUCKETS
+        )
+        self.db_time = Histogram(
+            'todo_api_db_duration_seconds',
+            'Tiempo acumulado en SQL por petición en segundos',
+            route_labels
+        )
+
+    def render(self):
+        """
+        Returns:
+            str: Todas las métricas en el formato de texto de Prometheus
+        """
+        lines = []
+        for metric in (self.requests, self.latency, self.in_progress, self.db_queries, self.db_time):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+def _route_labels():
+    rule = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    return (request.method, rule)
+
+
+def _metrics():
+    """Registro de métricas de la aplicación actual (None si está desactivado)."""
+    return current_app.extensions.get('metrics')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'metrics_started' in g:
+        conn.info.setdefault('metrics_query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('metrics_query_started')
+    if started and has_request_context() and 'metrics_started' in g:
+        g.metrics_db_time += time.perf_counter() - started.pop()
+        g.metrics_db_queries += 1
+
+
+def _handle_error(exception_context):
+    # Una sentencia fallida también cuenta; se descarta su marca de inicio
+    connection = exception_context.connection
+    started = connection.info.get('metrics_query_started') if connection is not None else None
+    if started and has_request_context() and 'metrics_started' in g:
+        g.metrics_db_time += time.perf_counter() - started.pop()
+        g.metrics_db_queries += 1
+
+
+def start_request_metrics():
+    """before_request: marca el inicio de la petición y la cuenta como en curso."""
+    metrics = _metrics()
+    if metrics is None:
+        return
+    g.metrics_started = time.perf_counter()
+    g.metrics_db_queries = 0
+    g.metrics_db_time = 0.0
+    metrics.in_progress.inc(_route_labels())
+
+
+def record_request_metrics(response):
+    """after_request: registra código de estado, latencia y uso de SQL."""
+    metrics = _metrics()
+    if metrics is not None and 'metrics_started' in g:
+        labels = _route_labels()
+        metrics.requests.inc(labels + (str(response.status_code),))
+        metrics.latency.observe(time.perf_counter() - g.metrics_started, labels)
+        metrics.db_queries.observe(g.metrics_db_queries, labels)
+        metrics.db_time.observe(g.metrics_db_time, labels)
+    return response
+
+
+def finish_request_metrics(exception=None):
+    """teardown_request: la petición deja de estar en curso (también si falló)."""
+    if g.pop('metrics_started', None) is not None:
+        _metrics().in_progress.dec(_route_labels())
+
+
+def init_metrics(app):
+    """
+    Activa las métricas de la aplicación si METRICS_ENABLED: crea el
+    registro en app.extensions['metrics'] y registra los eventos de los
+    engines que cuentan las sentencias SQL y su duración por petición.
+    
+    Los hooks de petición (start/record/finish_request_metrics) se registran
+    en el blueprint de la API. Las métricas son por proceso: con varios
+    workers cada uno expone las suyas.
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    app.extensions['metrics'] = RequestMetrics()
+    
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(engine, 'handle_error', _handle_error)
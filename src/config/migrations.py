@@ -0,0 +1,24 @@
+import os
+from src.config.database import db
+
+# Carpeta de las migraciones versionadas (Alembic), en la raíz del proyecto
+MIGRATIONS_DIRECTORY = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', 'migrations')
+)
+
+
+def init_migrations(app):
+    """
+    Registra Flask-Migrate en la aplicación para los comandos "flask db".
+    
+    Solo lo usan la CLI (manage.py) y las pruebas: create_app no lo llama
+    para que los workers no importen Alembic al arrancar. render_as_batch
+    permite ALTER TABLE en SQLite.
+    
+    Returns:
+        Flask: La misma aplicación
+    """
+    # Se importa aquí para no cargar Alembic en el arranque de la API
+    from flask_migrate import Migrate
+    Migrate(app, db, directory=MIGRATIONS_DIRECTORY, render_as_batch=True)
+    return app
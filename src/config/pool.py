@@ -0,0 +1,100 @@
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStats:
+    """
+    Contadores acumulados de un pool de conexiones: checkouts, tiempo de
+    espera por una conexión libre y timeouts. Seguros para hilos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_checkout(self, waited, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def as_dict(self):
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_seconds_total': round(self.wait_seconds_total, 6),
+                'wait_seconds_avg': round(self.wait_seconds_total / attempts, 6) if attempts else 0.0,
+                'wait_seconds_max': round(self.wait_seconds_max, 6)
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool que mide cuánto espera cada petición por una conexión.
+    Permite distinguir la latencia del pool de la latencia de PostgreSQL.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        self._depth = threading.local()
+
+    def _do_get(self):
+        # QueuePool._do_get se llama a sí mismo recursivamente; solo se mide
+        # la llamada externa
+        depth = getattr(self._depth, 'value', 0)
+        if depth:
+            return super()._do_get()
+
+        self._depth.value = 1
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_checkout(time.perf_counter() - started, timed_out=True)
+            raise
+        finally:
+            self._depth.value = 0
+        self.stats.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # Conservar los contadores cuando SQLAlchemy recrea el pool
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def pool_status(engine):
+    """
+    Estado actual del pool de un engine.
+
+    Returns:
+        dict: Clase del pool, conexiones en uso/libres, overflow y, si el
+        pool está instrumentado, estadísticas de espera
+    """
+    pool = engine.pool
+    status = {'pool_class': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            # overflow() es negativo mientras el pool base no está lleno
+            'overflow': max(pool.overflow(), 0),
+            'max_overflow': pool._max_overflow
+        })
+    stats = getattr(pool, 'stats', None)
+    if stats is not None:
+        status.update(stats.as_dict())
+    return status
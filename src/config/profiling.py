@@ -0,0 +1,172 @@
+import cProfile
+import hmac
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from src.config.database import db
+
+# Cabecera que pide perfilar una petición (su valor debe ser PROFILING_TOKEN)
+PROFILING_HEADER = 'X-Profile'
+
+# Solo se perfila una petición a la vez por proceso: acota el coste y, desde
+# Python 3.12, cProfile no admite dos perfiles activos simultáneamente
+_profiling_lock = threading.Lock()
+
+
+def _route_slug():
+    rule = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    return re.sub(r'[^A-Za-z0-9]+', '_', rule).strip('_') or 'index'
+
+
+def _should_profile(config):
+    """
+    Decide si se perfila la petición actual: por la cabecera X-Profile con el
+    token configurado o por muestreo con PROFILING_SAMPLE_RATE.
+    """
+    token = config.get('PROFILING_TOKEN')
+    header = request.headers.get(PROFILING_HEADER)
+    # Comparación en tiempo constante para no filtrar el token
+    if token and header and hmac.compare_digest(header.encode(), token.encode()):
+        return True
+    sample_rate = config.get('PROFILING_SAMPLE_RATE', 0.0)
+    # Muestreo estadístico, no criptográfico
+    return sample_rate > 0 and random.random() < sample_rate  # nosec B311
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'profiling_profiler' in g:
+        conn.info.setdefault('profiling_query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('profiling_query_started')
+    if started and has_request_context() and 'profiling_profiler' in g:
+        g.profiling_queries.append((statement, time.perf_counter() - started.pop()))
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    started = connection.info.get('profiling_query_started') if connection is not None else None
+    if started and has_request_context() and 'profiling_profiler' in g:
+        g.profiling_queries.append((exception_context.statement, time.perf_counter() - started.pop()))
+
+
+def sql_breakdown(queries):
+    """
+    Agrupa las sentencias ejecutadas durante la petición.
+    
+    Args:
+        queries (list): Pares (sentencia, segundos) en orden de ejecución
+    
+    Returns:
+        list: Por sentencia distinta, número de ejecuciones y tiempo total en
+              milisegundos, de mayor a menor tiempo
+    """
+    grouped = {}
+    for statement, duration in queries:
+        entry = grouped.setdefault(statement, {'statement': statement, 'count': 0, 'total_ms': 0.0})
+        entry['count'] += 1
+        entry['total_ms'] += duration * 1000
+    for entry in grouped.values():
+        entry['total_ms'] = round(entry['total_ms'], 3)
+    return sorted(grouped.values(), key=lambda entry: entry['total_ms'], reverse=True)
+
+
+def start_request_profile():
+    """before_request: activa cProfile si la petición debe perfilarse."""
+    config = current_app.config
+    if not config.get('PROFILING_ENABLED', False) or not _should_profile(config):
+        return
+    if not _profiling_lock.acquire(blocking=False):
+        return
+    profiler = cProfile.Profile()
+    g.profiling_profiler = profiler
+    g.profiling_queries = []
+    g.profiling_started = time.perf_counter()
+    profiler.enable()
+
+
+def record_profile_status(response):
+    """after_request: guarda el código de estado para el perfil."""
+    if 'profiling_profiler' in g:
+        g.profiling_status = response.status_code
+    return response
+
+
+def finish_request_profile(exception=None):
+    """
+    teardown_request: detiene el perfil y lo escribe en PROFILING_DIR.
+    
+    Por cada petición se escriben dos ficheros con el mismo nombre: el perfil
+    en formato pstats (.prof) y un JSON con la ruta, el código de estado, la
+    duración y el desglose del tiempo en SQL (.json).
+    """
+    profiler = g.pop('profiling_profiler', None)
+    if profiler is None:
+        return
+    try:
+        profiler.disable()
+        elapsed = time.perf_counter() - g.pop('profiling_started')
+        queries = g.pop('profiling_queries')
+        status = g.pop('profiling_status', 500)
+        
+        rule = request.url_rule.rule if request.url_rule is not None else None
+        name = (
+            f"{time.strftime('%Y%m%dT%H%M%S')}_{request.method}_{_route_slug()}_"
+            f"{int(elapsed * 1000)}ms_{uuid.uuid4().hex[:8]}"
+        )
+        path = os.path.join(current_app.config['PROFILING_DIR'], name)
+        profiler.dump_stats(f'{path}.prof')
+        
+        sql_seconds = sum(duration for _, duration in queries)
+        with open(f'{path}.json', 'w', encoding='utf-8') as file:
+            json.dump({
+                'method': request.method,
+                'route': rule,
+                'path': request.path,
+                'status': status,
+                'duration_ms': round(elapsed * 1000, 3),
+                'sql': {
+                    'queries': len(queries),
+                    'total_ms': round(sql_seconds * 1000, 3),
+                    'share': round(sql_seconds / elapsed, 4) if elapsed else 0.0,
+                    'statements': sql_breakdown(queries)
+                },
+                'profile': f'{name}.prof'
+            }, file, indent=2)
+    except OSError:
+        # Un fallo al escribir el perfil no debe afectar a la petición
+        current_app.logger.exception('No se pudo escribir el perfil de la petición')
+    finally:
+        _profiling_lock.release()
+
+
+def init_profiling(app):
+    """
+    Activa el perfilado por petición si PROFILING_ENABLED: se perfilan las
+    peticiones que envían la cabecera X-Profile con PROFILING_TOKEN y una
+    muestra aleatoria con probabilidad PROFILING_SAMPLE_RATE.
+    
+    Registra los hooks de petición en la aplicación (cubren todas sus rutas,
+    incluidos los hooks de métricas del blueprint) y los eventos de los
+    engines que anotan cada sentencia SQL con su duración.
+    """
+    if not app.config.get('PROFILING_ENABLED', False):
+        return
+    os.makedirs(app.config['PROFILING_DIR'], exist_ok=True)
+    
+    app.before_request(start_request_profile)
+    app.after_request(record_profile_status)
+    app.teardown_request(finish_request_profile)
+    
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(engine, 'handle_error', _handle_error)
@@ -1,5 +1,6 @@
 # Inicializador del paquete controllers
 from src.controllers.user_controller import UserController
 from src.controllers.task_controller import TaskController
+from src.controllers.stats_controller import StatsController
 
-__all__ = ['UserController', 'TaskController']
+__all__ = ['UserController', 'TaskController', 'StatsController']
@@ -0,0 +1,191 @@
+from quart import jsonify, request
+from src.controllers.params import (
+    parse_bool_arg, parse_datetime_arg, parse_fields_arg, parse_int_arg
+)
+from src.models.task import Task
+from src.services.async_task_service import AsyncTaskService
+
+class AsyncTaskController:
+    """
+    Capa de Controladores asíncrona para Task (modo ASGI con Quart).
+    Mismo contrato HTTP que TaskController para las rutas portadas.
+    """
+    
+    @staticmethod
+    async def create_task():
+        """
+        POST /api/tasks - Crear tarea asociada a usuario
+        
+        Returns:
+            Response: JSON con tarea creada (201) o error (400/500)
+        """
+        try:
+            data = await request.get_json()
+            
+            if not data:
+                return jsonify({
+                    'error': 'No se proporcionaron datos'
+                }), 400
+            
+            title = data.get('title')
+            user_id = data.get('user_id')
+            description = data.get('description')
+            
+            if not title or not user_id:
+                return jsonify({
+                    'error': 'Los campos title y user_id son obligatorios'
+                }), 400
+            
+            task = await AsyncTaskService.create_task(title, user_id, description)
+            
+            return jsonify({
+                'message': 'Tarea creada exitosamente',
+                'task': task.to_dict()
+            }), 201
+            
+        except ValueError as e:
+            # Error de validación de negocio
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+    
+    @staticmethod
+    async def get_user_tasks(user_id):
+        """
+        GET /api/users/:id/tasks - Listar las tareas de un usuario (paginado)
+        
+        Acepta los mismos query params que TaskController.get_user_tasks.
+        
+        Args:
+            user_id (int): ID del usuario
+        
+        Returns:
+            Response: JSON con página de tareas (200) o error (400/404/500)
+        """
+        try:
+            limit = parse_int_arg(request.args, 'limit')
+            is_completed = parse_bool_arg(request.args, 'is_completed')
+            created_after = parse_datetime_arg(request.args, 'created_after')
+            created_before = parse_datetime_arg(request.args, 'created_before')
+            cursor = request.args.get('cursor')
+            sort = request.args.get('sort', 'id')
+            order = request.args.get('order', 'asc')
+            fields = Task.validate_fields(parse_fields_arg(request.args))
+            
+            # Existencia del usuario y página de tareas en una sola consulta
+            task_version, tasks, next_cursor = await AsyncTaskService.get_user_tasks_page(
+                user_id,
+                limit=limit,
+                cursor=cursor,
+                is_completed=is_completed,
+                created_after=created_after,
+                created_before=created_before,
+                sort=sort,
+                order=order,
+                fields=fields
+            )
+            if task_version is None:
+                return jsonify({
+                    'error': f'Usuario con ID {user_id} no encontrado'
+                }), 404
+            
+            return jsonify({
+                'user_id': user_id,
+                'tasks': tasks,
+                'count': len(tasks),
+                'next_cursor': next_cursor
+            }), 200
+            
+        except ValueError as e:
+            # Parámetros de paginación, filtro u orden inválidos
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+    
+    @staticmethod
+    async def update_task(task_id):
+        """
+        PUT /api/tasks/:id - Actualizar estado de tarea
+        
+        Args:
+            task_id (int): ID de la tarea
+        
+        Returns:
+            Response: JSON con tarea actualizada (200) o error (400/404/500)
+        """
+        try:
+            data = await request.get_json()
+            
+            if not data or 'is_completed' not in data:
+                return jsonify({
+                    'error': 'El campo is_completed es obligatorio'
+                }), 400
+            
+            is_completed = data.get('is_completed')
+            
+            if not isinstance(is_completed, bool):
+                return jsonify({
+                    'error': 'El campo is_completed debe ser un booleano'
+                }), 400
+            
+            task = await AsyncTaskService.update_task_completion(task_id, is_completed)
+            
+            return jsonify({
+                'message': 'Tarea actualizada exitosamente',
+                'task': Task.row_to_dict(task)
+            }), 200
+            
+        except ValueError as e:
+            # Tarea no encontrada
+            return jsonify({'error': str(e)}), 404
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+    
+    @staticmethod
+    async def mark_task_completed(task_id):
+        """
+        PATCH /api/tasks/:id/complete - Marcar tarea como completada
+        
+        Args:
+            task_id (int): ID de la tarea
+        
+        Returns:
+            Response: JSON con tarea completada (200) o error (404/500)
+        """
+        try:
+            task = await AsyncTaskService.mark_task_as_completed(task_id)
+            
+            return jsonify({
+                'message': 'Tarea marcada como completada',
+                'task': Task.row_to_dict(task)
+            }), 200
+            
+        except ValueError as e:
+            # Tarea no encontrada
+            return jsonify({'error': str(e)}), 404
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+    
+    @staticmethod
+    async def delete_task(task_id):
+        """
+        DELETE /api/tasks/:id - Eliminar tarea
+        
+        Args:
+            task_id (int): ID de la tarea
+        
+        Returns:
+            Response: JSON con confirmación (200) o error (404/500)
+        """
+        try:
+            await AsyncTaskService.delete_task(task_id)
+            
+            return jsonify({
+                'message': f'Tarea con ID {task_id} eliminada exitosamente'
+            }), 200
+            
+        except ValueError as e:
+            # Tarea no encontrada
+            return jsonify({'error': str(e)}), 404
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
@@ -0,0 +1,114 @@
+from quart import jsonify, request
+from src.controllers.params import parse_fields_arg
+from src.models.user import User
+from src.services.async_user_service import AsyncUserService
+
+class AsyncUserController:
+    """
+    Capa de Controladores asíncrona para User (modo ASGI con Quart).
+    Mismo contrato HTTP que UserController.
+    """
+    
+    @staticmethod
+    async def create_user():
+        """
+        POST /api/users - Crear usuario
+        
+        Returns:
+            Response: JSON con usuario creado (201) o error (400/500)
+        """
+        try:
+            data = await request.get_json()
+            
+            if not data:
+                return jsonify({
+                    'error': 'No se proporcionaron datos'
+                }), 400
+            
+            name = data.get('name')
+            email = data.get('email')
+            
+            if not name or not email:
+                return jsonify({
+                    'error': 'Los campos name y email son obligatorios'
+                }), 400
+            
+            user = await AsyncUserService.create_user(name, email)
+            
+            return jsonify({
+                'message': 'Usuario creado exitosamente',
+                'user': user.to_dict()
+            }), 201
+            
+        except ValueError as e:
+            # Error de validación de negocio (email duplicado)
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+    
+    @staticmethod
+    async def get_user(user_id):
+        """
+        GET /api/users/:id - Consultar usuario por ID
+        
+        Query params:
+            fields (str, opcional): Campos a devolver, p. ej. id,name; el
+                SELECT lee solo las columnas de esos campos
+        
+        Args:
+            user_id (int): ID del usuario
+        
+        Returns:
+            Response: JSON con usuario (200) o error (400/404/500)
+        """
+        try:
+            requested = parse_fields_arg(request.args)
+            fields = User.validate_fields(requested)
+            
+            # Con fields solo se seleccionan las columnas de esos campos
+            if requested is None:
+                user = await AsyncUserService.get_user_by_id(user_id)
+            else:
+                user = await AsyncUserService.get_user_fields(user_id, fields)
+            
+            if not user:
+                return jsonify({
+                    'error': f'Usuario con ID {user_id} no encontrado'
+                }), 404
+            
+            return jsonify({
+                'user': User.row_to_dict(user, fields)
+            }), 200
+            
+        except ValueError as e:
+            # Campos pedidos inválidos
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+    
+    @staticmethod
+    async def get_user_summary(user_id):
+        """
+        GET /api/users/:id/summary - Resumen de tareas de un usuario
+        
+        Args:
+            user_id (int): ID del usuario
+        
+        Returns:
+            Response: JSON con total, completadas y pendientes (200) o error (404/500)
+        """
+        try:
+            user = await AsyncUserService.get_user_by_id(user_id)
+            
+            if not user:
+                return jsonify({
+                    'error': f'Usuario con ID {user_id} no encontrado'
+                }), 404
+            
+            return jsonify({
+                'user_id': user_id,
+                **user.task_counts()
+            }), 200
+            
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
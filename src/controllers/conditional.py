@@ -0,0 +1,47 @@
+import hashlib
+from flask import Response, request
+
+
+def build_etag(resource, user_id, version):
+    """
+    Genera un ETag fuerte a partir de la versión de tareas del usuario.
+    
+    Incluye el query string para que cada combinación de filtros, página o
+    campos tenga su propio ETag.
+    
+    Args:
+        resource (str): Nombre del recurso ('user', 'tasks', ...)
+        user_id (int): ID del usuario
+        version (int): Versión de tareas del usuario (User.task_version)
+    
+    Returns:
+        str: ETag sin comillas
+    """
+    query = request.query_string
+    digest = hashlib.sha256(query).hexdigest()[:16] if query else 'all'
+    return f'{resource}-{user_id}-v{version}-{digest}'
+
+
+def not_modified(etag):
+    """
+    Comprueba If-None-Match contra el ETag actual.
+    
+    Returns:
+        Response: Respuesta 304 vacía si el cliente ya tiene esta versión,
+        o None si hay que generar la respuesta completa
+    """
+    if request.if_none_match.contains(etag):
+        return with_etag(Response(status=304), etag)
+    return None
+
+
+def with_etag(response, etag):
+    """
+    Añade el ETag a la respuesta y obliga al cliente a revalidar.
+    
+    Returns:
+        Response: La misma respuesta con las cabeceras de validación
+    """
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
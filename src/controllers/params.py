@@ -0,0 +1,82 @@
+from datetime import datetime
+
+# Funciones de lectura de parámetros compartidas por los controladores
+# síncronos (Flask) y asíncronos (Quart): reciben request.args
+
+
+def parse_bool_arg(args, name):
+    """
+    Lee un query param booleano ('true'/'false', '1'/'0').
+    
+    Raises:
+        ValueError: Si el valor no es un booleano válido
+    """
+    value = args.get(name)
+    if value is None:
+        return None
+    value = value.strip().lower()
+    if value in ('true', '1'):
+        return True
+    if value in ('false', '0'):
+        return False
+    raise ValueError(f"El parámetro {name} debe ser 'true' o 'false'")
+
+
+def parse_datetime(value, name):
+    """
+    Convierte un valor en formato ISO 8601 a datetime.
+    
+    Raises:
+        ValueError: Si el valor no es una fecha ISO 8601 válida
+    """
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"El parámetro {name} debe ser una fecha ISO 8601")
+
+
+def parse_datetime_arg(args, name):
+    """
+    Lee un query param de fecha en formato ISO 8601.
+    
+    Raises:
+        ValueError: Si el valor no es una fecha ISO 8601 válida
+    """
+    return parse_datetime(args.get(name), name)
+
+
+def parse_int_arg(args, name):
+    """
+    Lee un query param entero.
+    
+    Raises:
+        ValueError: Si el valor no es un número entero
+    """
+    value = args.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"El parámetro {name} debe ser un número entero")
+
+
+def parse_fields_arg(args, name='fields'):
+    """
+    Lee un query param de selección de campos (sparse fieldset), p. ej.
+    ?fields=id,title,is_completed
+    
+    Returns:
+        list[str]: Campos pedidos sin duplicados, en orden; None si no se envió
+    """
+    value = args.get(name)
+    if value is None:
+        return None
+    fields = []
+    for field in value.split(','):
+        field = field.strip()
+        if field and field not in fields:
+            fields.append(field)
+    return fields
@@ -0,0 +1,66 @@
+from flask import Response, current_app, jsonify
+from src.config.database import db
+from src.config.metrics import PROMETHEUS_CONTENT_TYPE
+from src.config.pool import pool_status
+from src.services.user_service import UserService
+
+class StatsController:
+    """
+    Capa de Controladores para estadísticas internas.
+    Expone contadores operativos de la aplicación.
+    """
+    
+    @staticmethod
+    def get_cache_stats():
+        """
+        GET /api/stats/cache - Contadores de la caché de usuarios
+        
+        Returns:
+            Response: JSON con aciertos, fallos y expulsiones (200) o error (500)
+        """
+        try:
+            return jsonify({
+                'user_cache': UserService.cache_stats()
+            }), 200
+            
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+    
+    @staticmethod
+    def get_pool_stats():
+        """
+        GET /api/stats/pool - Estado de los pools de conexiones
+        
+        Returns:
+            Response: JSON con conexiones en uso, overflow y tiempos de
+            espera por engine (200) o error (500)
+        """
+        try:
+            return jsonify({
+                'pools': {
+                    bind_key or 'default': pool_status(engine)
+                    for bind_key, engine in db.engines.items()
+                }
+            }), 200
+            
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+    
+    @staticmethod
+    def get_metrics():
+        """
+        GET /metrics - Métricas de peticiones y SQL en formato Prometheus
+        
+        Returns:
+            Response: Texto de exposición de Prometheus (200), 404 si las
+            métricas están desactivadas o error (500)
+        """
+        try:
+            metrics = current_app.extensions.get('metrics')
+            if metrics is None:
+                return jsonify({'error': 'Las métricas están desactivadas'}), 404
+            
+            return Response(metrics.render(), status=200, content_type=PROMETHEUS_CONTENT_TYPE)
+            
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
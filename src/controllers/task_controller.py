@@ -1,13 +1,59 @@
-from flask import jsonify, request
+import csv
+import io
+from flask import Response, current_app, jsonify, request, stream_with_context
+from src.controllers.conditional import build_etag, not_modified, with_etag
+from src.controllers.params import (
+    parse_bool_arg, parse_datetime, parse_datetime_arg, parse_fields_arg, parse_int_arg
+)
+from src.models.task import Task
 from src.services.task_service import TaskService
 from src.services.user_service import UserService
 
+def _ndjson_lines(rows, rows_per_chunk=500):
+    """
+    Genera el cuerpo NDJSON (un objeto JSON por línea) agrupando varias
+    filas por fragmento para reducir la sobrecarga de escritura.
+    """
+    chunk = []
+    for row in rows:
+        chunk.append(current_app.json.dumps(Task.row_to_dict(row)))
+        if len(chunk) >= rows_per_chunk:
+            yield '\n'.join(chunk) + '\n'
+            chunk = []
+    if chunk:
+        yield '\n'.join(chunk) + '\n'
+
+
+def _csv_lines(rows, rows_per_chunk=500):
+    """
+    Genera el cuerpo CSV (con encabezado) agrupando varias filas por fragmento.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(column.name for column in Task.__table__.columns)
+    written = 0
+    for row in rows:
+        writer.writerow(Task.row_to_dict(row).values())
+        written += 1
+        if written % rows_per_chunk == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
 class TaskController:
     """
     Capa de Controladores para Task.
     Maneja las peticiones HTTP y respuestas para operaciones de tareas.
     """
     
+    # Formatos de exportación soportados y su tipo MIME
+    EXPORT_FORMATS = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv'
+    }
+    
     @staticmethod
     def create_task():
         """
@@ -57,18 +103,166 @@ class TaskController:
             # Error interno del servidor
             return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
     
+    @staticmethod
+    def create_tasks_bulk():
+        """
+        POST /api/tasks/bulk - Crear varias tareas en una sola transacción
+        
+        Body esperado:
+        {
+            "tasks": [
+                {"title": "Comprar leche", "user_id": 1},
+                {"title": "Pagar luz", "description": "Antes del viernes", "user_id": 2}
+            ],
+            "atomic": true
+        }
+        
+        Con atomic=true (por defecto) cualquier error cancela todo el lote.
+        Con atomic=false se crean las tareas válidas y se reportan las demás.
+        
+        Returns:
+            Response: JSON con tareas creadas (201), éxito parcial (207)
+            o error (400/500)
+        """
+        try:
+            data = request.get_json(silent=True)
+            
+            if not data or 'tasks' not in data:
+                return jsonify({
+                    'error': 'El campo tasks es obligatorio'
+                }), 400
+            
+            atomic = data.get('atomic', True)
+            if not isinstance(atomic, bool):
+                return jsonify({
+                    'error': 'El campo atomic debe ser un booleano'
+                }), 400
+            
+            created, errors = TaskService.create_tasks(data['tasks'], atomic=atomic)
+            
+            if not created:
+                return jsonify({
+                    'error': 'No se creó ninguna tarea',
+                    'errors': errors
+                }), 400
+            
+            return jsonify({
+                'message': f'{len(created)} tareas creadas exitosamente',
+                'tasks': [
+                    {'index': index, 'task': Task.row_to_dict(row)}
+                    for index, row in created
+                ],
+                'errors': errors
+            }), 207 if errors else 201
+            
+        except ValueError as e:
+            # Lote vacío o demasiado grande
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+    
     @staticmethod
     def get_user_tasks(user_id):
         """
-        GET /api/users/:id/tasks - Listar todas las tareas de un usuario
+        GET /api/users/:id/tasks - Listar las tareas de un usuario (paginado)
+        
+        Query params:
+            limit (int, opcional): Tamaño de la página
+            cursor (str, opcional): Cursor devuelto en next_cursor
+            is_completed (bool, opcional): Filtrar por estado
+            created_after / created_before (ISO 8601, opcional): Rango de creación
+            sort (str, opcional): 'id' (por defecto) o 'created_at'
+            order (str, opcional): 'asc' (por defecto) o 'desc'
+            fields (str, opcional): Campos a devolver, p. ej. id,title,is_completed
+        
+        Soporta peticiones condicionales: con If-None-Match igual al ETag
+        actual responde 304 sin leer ni serializar las tareas (solo se consulta
+        la versión de tareas del usuario).
+        
+        Args:
+            user_id (int): ID del usuario
+        
+        Returns:
+            Response: JSON con página de tareas (200), 304 o error (400/404/500)
+        """
+        try:
+            limit = parse_int_arg(request.args, 'limit')
+            is_completed = parse_bool_arg(request.args, 'is_completed')
+            created_after = parse_datetime_arg(request.args, 'created_after')
+            created_before = parse_datetime_arg(request.args, 'created_before')
+            cursor = request.args.get('cursor')
+            sort = request.args.get('sort', 'id')
+            order = request.args.get('order', 'asc')
+            fields = Task.validate_fields(parse_fields_arg(request.args))
+            
+            # Revalidación: la versión de tareas (que cambia con cada escritura)
+            # se comprueba con un SELECT de una columna, sin leer las tareas
+            if request.if_none_match:
+                task_version = UserService.get_task_version(user_id)
+                if task_version is not None:
+                    cached = not_modified(build_etag('tasks', user_id, task_version))
+                    if cached is not None:
+                        return cached
+            
+            # Existencia del usuario y página de tareas en una sola consulta
+            task_version, tasks, next_cursor = TaskService.get_user_tasks_page(
+                user_id,
+                limit=limit,
+                cursor=cursor,
+                is_completed=is_completed,
+                created_after=created_after,
+                created_before=created_before,
+                sort=sort,
+                order=order,
+                fields=fields
+            )
+            if task_version is None:
+                return jsonify({
+                    'error': f'Usuario con ID {user_id} no encontrado'
+                }), 404
+            
+            etag = build_etag('tasks', user_id, task_version)
+            cached = not_modified(etag)
+            if cached is not None:
+                return cached
+            
+            return with_etag(jsonify({
+                'user_id': user_id,
+                'tasks': tasks,
+                'count': len(tasks),
+                'next_cursor': next_cursor
+            }), etag), 200
+            
+        except ValueError as e:
+            # Parámetros de paginación, filtro u orden inválidos
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+    
+    @staticmethod
+    def search_user_tasks(user_id):
+        """
+        GET /api/users/:id/tasks/search - Buscar tareas de un usuario por texto
+        
+        Query params:
+            q (str): Texto a buscar en título y descripción
+            limit (int, opcional): Tamaño de la página
+            cursor (str, opcional): Cursor devuelto en next_cursor
+        
+        Los resultados se ordenan por relevancia. Soporta peticiones
+        condicionales igual que el listado de tareas.
         
         Args:
             user_id (int): ID del usuario
         
         Returns:
-            Response: JSON con lista de tareas (200) o error (404/500)
+            Response: JSON con página de resultados (200), 304 o error (400/404/500)
         """
         try:
+            q = request.args.get('q')
+            limit = parse_int_arg(request.args, 'limit')
+            cursor = request.args.get('cursor')
+            
             # Verificar que el usuario existe
             user = UserService.get_user_by_id(user_id)
             if not user:
@@ -76,14 +270,72 @@ class TaskController:
                     'error': f'Usuario con ID {user_id} no encontrado'
                 }), 404
             
-            # Obtener tareas del usuario
-            tasks = TaskService.get_tasks_by_user(user_id)
+            etag = build_etag('search', user_id, user.task_version)
+            cached = not_modified(etag)
+            if cached is not None:
+                return cached
             
-            return jsonify({
+            tasks, next_cursor = TaskService.search_tasks(user_id, q, limit=limit, cursor=cursor)
+            
+            return with_etag(jsonify({
                 'user_id': user_id,
-                'tasks': [task.to_dict() for task in tasks],
-                'total': len(tasks)
-            }), 200
+                'q': q,
+                'tasks': tasks,
+                'count': len(tasks),
+                'next_cursor': next_cursor
+            }), etag), 200
+            
+        except ValueError as e:
+            # Búsqueda, límite o cursor inválidos
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+    
+    @staticmethod
+    def export_user_tasks(user_id):
+        """
+        GET /api/users/:id/tasks/export - Exportar todas las tareas de un usuario
+        
+        La respuesta se genera en streaming (NDJSON o CSV) a partir de un
+        cursor del servidor, por lo que la memoria del worker no crece con
+        el número de tareas.
+        
+        Query params:
+            format (str, opcional): 'ndjson' (por defecto) o 'csv'
+        
+        Args:
+            user_id (int): ID del usuario
+        
+        Returns:
+            Response: Stream NDJSON/CSV (200) o error JSON (400/404/500)
+        """
+        try:
+            export_format = request.args.get('format', 'ndjson')
+            if export_format not in TaskController.EXPORT_FORMATS:
+                return jsonify({
+                    'error': "El parámetro format debe ser 'ndjson' o 'csv'"
+                }), 400
+            
+            # Verificar que el usuario existe (basta el perfil en caché)
+            if not UserService.user_exists(user_id):
+                return jsonify({
+                    'error': f'Usuario con ID {user_id} no encontrado'
+                }), 404
+            
+            rows = TaskService.iter_tasks_by_user(user_id)
+            if export_format == 'csv':
+                body = _csv_lines(rows)
+            else:
+                body = _ndjson_lines(rows)
+            
+            return Response(
+                stream_with_context(body),
+                mimetype=TaskController.EXPORT_FORMATS[export_format],
+                headers={
+                    'Content-Disposition':
+                        f'attachment; filename=tasks_user_{user_id}.{export_format}'
+                }
+            )
             
         except Exception as e:
             return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
@@ -126,7 +378,7 @@ class TaskController:
             
             return jsonify({
                 'message': 'Tarea actualizada exitosamente',
-                'task': task.to_dict()
+                'task': Task.row_to_dict(task)
             }), 200
             
         except ValueError as e:
@@ -135,6 +387,63 @@ class TaskController:
         except Exception as e:
             return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
     
+    @staticmethod
+    def update_tasks_bulk():
+        """
+        PATCH /api/tasks/bulk - Completar o reabrir varias tareas a la vez
+        
+        Body esperado (por IDs o por predicado):
+        {
+            "is_completed": true,
+            "task_ids": [1, 2, 3]
+        }
+        {
+            "is_completed": true,
+            "user_id": 1,
+            "created_before": "2025-11-21T00:00:00Z"
+        }
+        
+        Returns:
+            Response: JSON con las tareas modificadas (200) o error (400/500)
+        """
+        try:
+            data = request.get_json(silent=True)
+            
+            if not data or 'is_completed' not in data:
+                return jsonify({
+                    'error': 'El campo is_completed es obligatorio'
+                }), 400
+            
+            is_completed = data.get('is_completed')
+            if not isinstance(is_completed, bool):
+                return jsonify({
+                    'error': 'El campo is_completed debe ser un booleano'
+                }), 400
+            
+            user_id = data.get('user_id')
+            if user_id is not None and (not isinstance(user_id, int) or isinstance(user_id, bool)):
+                return jsonify({
+                    'error': 'El campo user_id debe ser un número entero'
+                }), 400
+            
+            updated_ids = TaskService.set_tasks_completion(
+                is_completed,
+                task_ids=data.get('task_ids'),
+                user_id=user_id,
+                created_before=parse_datetime(data.get('created_before'), 'created_before')
+            )
+            
+            return jsonify({
+                'message': 'Tareas actualizadas exitosamente',
+                'updated': len(updated_ids),
+                'task_ids': updated_ids
+            }), 200
+            
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+    
     @staticmethod
     def mark_task_completed(task_id):
         """
@@ -152,7 +461,7 @@ class TaskController:
             
             return jsonify({
                 'message': 'Tarea marcada como completada',
-                'task': task.to_dict()
+                'task': Task.row_to_dict(task)
             }), 200
             
         except ValueError as e:
@@ -185,3 +494,60 @@ class TaskController:
             return jsonify({'error': str(e)}), 404
         except Exception as e:
             return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+    
+    @staticmethod
+    def delete_tasks_bulk():
+        """
+        DELETE /api/tasks/bulk - Eliminar varias tareas
+        
+        Body esperado (por IDs o por predicado):
+        {
+            "task_ids": [1, 2, 3]
+        }
+        {
+            "user_id": 1,
+            "is_completed": true,
+            "created_before": "2025-11-21T00:00:00Z",
+            "chunk_size": 1000
+        }
+        
+        Returns:
+            Response: JSON con el número de tareas eliminadas (200) o error (400/500)
+        """
+        try:
+            data = request.get_json(silent=True)
+            
+            if not data:
+                return jsonify({
+                    'error': 'No se proporcionaron datos'
+                }), 400
+            
+            user_id = data.get('user_id')
+            if user_id is not None and (not isinstance(user_id, int) or isinstance(user_id, bool)):
+                return jsonify({
+                    'error': 'El campo user_id debe ser un número entero'
+                }), 400
+            
+            is_completed = data.get('is_completed')
+            if is_completed is not None and not isinstance(is_completed, bool):
+                return jsonify({
+                    'error': 'El campo is_completed debe ser un booleano'
+                }), 400
+            
+            deleted = TaskService.delete_tasks(
+                task_ids=data.get('task_ids'),
+                user_id=user_id,
+                is_completed=is_completed,
+                created_before=parse_datetime(data.get('created_before'), 'created_before'),
+                chunk_size=data.get('chunk_size')
+            )
+            
+            return jsonify({
+                'message': f'{deleted} tareas eliminadas exitosamente',
+                'deleted': deleted
+            }), 200
+            
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
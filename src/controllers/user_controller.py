@@ -1,4 +1,7 @@
 from flask import jsonify, request
+from src.controllers.conditional import build_etag, not_modified, with_etag
+from src.controllers.params import parse_fields_arg
+from src.models.user import User
 from src.services.user_service import UserService
 
 class UserController:
@@ -59,11 +62,64 @@ class UserController:
         """
         GET /api/users/:id - Consultar usuario por ID
         
+        Soporta peticiones condicionales: con If-None-Match igual al ETag
+        actual responde 304 sin cuerpo.
+        
+        Query params:
+            fields (str, opcional): Campos a devolver, p. ej. id,name; el
+                SELECT lee solo las columnas de esos campos
+        
         Args:
             user_id (int): ID del usuario
         
         Returns:
-            Response: JSON con usuario (200) o error (404/500)
+            Response: JSON con usuario (200), 304 o error (400/404/500)
+        """
+        try:
+            requested = parse_fields_arg(request.args)
+            fields = User.validate_fields(requested)
+            
+            # Con fields solo se seleccionan las columnas de esos campos
+            if requested is None:
+                user = UserService.get_user_by_id(user_id)
+            else:
+                user = UserService.get_user_fields(user_id, fields)
+            
+            if not user:
+                return jsonify({
+                    'error': f'Usuario con ID {user_id} no encontrado'
+                }), 404
+            
+            etag = build_etag('user', user_id, user.task_version)
+            cached = not_modified(etag)
+            if cached is not None:
+                return cached
+            
+            return with_etag(jsonify({
+                'user': User.row_to_dict(user, fields)
+            }), etag), 200
+            
+        except ValueError as e:
+            # Campos pedidos inválidos
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+    
+    @staticmethod
+    def get_user_summary(user_id):
+        """
+        GET /api/users/:id/summary - Resumen de tareas de un usuario
+        
+        Los conteos salen de los contadores mantenidos en la tabla users
+        (no se recorre la tabla tasks). Soporta peticiones condicionales
+        igual que GET /api/users/:id.
+        
+        Args:
+            user_id (int): ID del usuario
+        
+        Returns:
+            Response: JSON con total, completadas y pendientes (200), 304
+            o error (404/500)
         """
         try:
             user = UserService.get_user_by_id(user_id)
@@ -73,9 +129,15 @@ class UserController:
                     'error': f'Usuario con ID {user_id} no encontrado'
                 }), 404
             
-            return jsonify({
-                'user': user.to_dict()
-            }), 200
+            etag = build_etag('summary', user_id, user.task_version)
+            cached = not_modified(etag)
+            if cached is not None:
+                return cached
+            
+            return with_etag(jsonify({
+                'user_id': user_id,
+                **user.task_counts()
+            }), etag), 200
             
         except Exception as e:
             return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
@@ -1,4 +1,5 @@
 from datetime import datetime, timezone
+from sqlalchemy import DDL, event, false
 from src.config.database import db
 
 class Task(db.Model):
@@ -16,6 +17,20 @@ class Task(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     
+    # Índices para paginación por cursor (keyset), filtros y ordenamiento por usuario
+    __table_args__ = (
+        db.Index('ix_tasks_user_id_id', 'user_id', 'id'),
+        db.Index('ix_tasks_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        db.Index('ix_tasks_user_id_is_completed_id', 'user_id', 'is_completed', 'id'),
+        # Índice parcial: tareas pendientes por usuario (la vista más consultada)
+        db.Index(
+            'ix_tasks_user_id_pending_created_at',
+            'user_id', 'created_at', 'id',
+            postgresql_where=(is_completed == false()),
+            sqlite_where=(is_completed == false())
+        ),
+    )
+    
     def __repr__(self):
         return f'<Task {self.id}: {self.title} (User: {self.user_id})>'
     
@@ -31,3 +46,99 @@ class Task(db.Model):
             'user_id': self.user_id,
             'created_at': self.created_at.isoformat()
         }
+    
+    @staticmethod
+    def row_to_dict(row, fields=None):
+        """
+        Convierte una fila de resultados (Row) con columnas de Task a
+        diccionario para serialización JSON, sin hidratar la entidad ORM.
+        
+        Args:
+            row (Row): Fila con columnas de la tabla tasks
+            fields (Iterable[str], optional): Columnas a incluir (por defecto todas)
+        """
+        data = dict(row._mapping)
+        if fields is not None:
+            data = {name: data[name] for name in fields}
+        if data.get('created_at') is not None:
+            data['created_at'] = data['created_at'].isoformat()
+        return data
+    
+    @classmethod
+    def validate_fields(cls, fields):
+        """
+        Valida una selección de campos (sparse fieldset) contra las columnas.
+        
+        Args:
+            fields (Iterable[str], optional): Campos pedidos; None equivale a todos
+        
+        Returns:
+            list[str]: Campos validados, en el orden pedido
+        
+        Raises:
+            ValueError: Si se pide algún campo inexistente
+        """
+        columns = [column.name for column in cls.__table__.columns]
+        if fields is None:
+            return columns
+        unknown = [name for name in fields if name not in columns]
+        if unknown or not fields:
+            raise ValueError(
+                f"Campos no válidos: {', '.join(unknown) or '(vacío)'}. "
+                f"Campos disponibles: {', '.join(columns)}"
+            )
+        return list(fields)
+
+
+# ==================== BÚSQUEDA DE TEXTO COMPLETO ====================
+# El índice de búsqueda no forma parte del modelo ORM: se crea con DDL
+# propio de cada dialecto junto con la tabla tasks.
+
+# Configuración de texto de PostgreSQL (stemming en español)
+TASK_SEARCH_CONFIG = 'spanish'
+
+# Tabla virtual FTS5 de SQLite
+TASK_SEARCH_FTS_TABLE = 'tasks_fts'
+
+# PostgreSQL: columna tsvector generada (el título pesa más que la
+# descripción en el ranking) e índice GIN
+_POSTGRESQL_SEARCH_DDL = (
+    f"""ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{TASK_SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{TASK_SEARCH_CONFIG}', coalesce(description, '')), 'B')
+    ) STORED""",
+    'CREATE INDEX ix_tasks_search_vector ON tasks USING GIN (search_vector)',
+)
+
+# SQLite: índice FTS5 de contenido externo (sin duplicar el texto),
+# sincronizado con tasks por triggers
+_SQLITE_SEARCH_DDL = (
+    """CREATE VIRTUAL TABLE tasks_fts USING fts5(
+        title, description, content='tasks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER tasks_fts_after_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER tasks_fts_after_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER tasks_fts_after_update AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+)
+
+for _statement in _POSTGRESQL_SEARCH_DDL:
+    event.listen(Task.__table__, 'after_create', DDL(_statement).execute_if(dialect='postgresql'))
+for _statement in _SQLITE_SEARCH_DDL:
+    event.listen(Task.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(
+    Task.__table__,
+    'after_drop',
+    DDL('DROP TABLE IF EXISTS tasks_fts').execute_if(dialect='sqlite')
+)
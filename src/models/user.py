@@ -1,6 +1,20 @@
 from datetime import datetime, timezone
 from src.config.database import db
 
+def task_counts(task_count, completed_task_count):
+    """
+    Resumen de tareas a partir de los contadores de un usuario.
+    
+    Returns:
+        dict: Tareas totales, completadas y pendientes
+    """
+    return {
+        'total': task_count,
+        'completed': completed_task_count,
+        'pending': task_count - completed_task_count
+    }
+
+
 class User(db.Model):
     """
     Modelo User - Representa a un usuario en el sistema.
@@ -8,25 +22,111 @@ class User(db.Model):
     """
     __tablename__ = 'users'
     
+    # Campos expuestos en la API (task_version es interno)
+    PUBLIC_FIELDS = ('id', 'name', 'email', 'created_at', 'task_counts')
+    
+    # Columnas de la tabla que necesita cada campo público
+    FIELD_COLUMNS = {
+        'id': ('id',),
+        'name': ('name',),
+        'email': ('email',),
+        'created_at': ('created_at',),
+        'task_counts': ('task_count', 'completed_task_count')
+    }
+    
     # Columnas
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     
+    # Versión de las tareas del usuario: se incrementa en cada escritura de
+    # tareas y sirve para generar ETags sin consultar la tabla tasks
+    task_version = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
+    # Contadores de tareas mantenidos en la misma transacción que cada
+    # escritura de tareas (evitan COUNT(*) sobre la tabla tasks)
+    task_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    completed_task_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
     # Relación con Task (un usuario tiene muchas tareas)
     tasks = db.relationship('Task', backref='user', lazy=True, cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<User {self.id}: {self.email}>'
     
-    def to_dict(self):
+    def to_dict(self, fields=None):
         """
         Convierte el objeto User a diccionario para serialización JSON.
+        
+        Args:
+            fields (Iterable[str], optional): Campos a incluir (por defecto todos)
+        """
+        return User.row_to_dict(self, self.PUBLIC_FIELDS if fields is None else fields)
+    
+    @staticmethod
+    def row_to_dict(row, fields):
+        """
+        Convierte un User o una fila con las columnas de columns_for(fields)
+        a diccionario para serialización JSON.
+        
+        Args:
+            row: User o fila de un SELECT con columnas sueltas
+            fields (Iterable[str]): Campos públicos a incluir
+        """
+        data = {}
+        for name in fields:
+            if name == 'task_counts':
+                data[name] = task_counts(row.task_count, row.completed_task_count)
+            elif name == 'created_at':
+                data[name] = row.created_at.isoformat()
+            else:
+                data[name] = getattr(row, name)
+        return data
+    
+    def task_counts(self):
+        """
+        Resumen de tareas del usuario a partir de los contadores mantenidos.
+        
+        Returns:
+            dict: Tareas totales, completadas y pendientes
+        """
+        return task_counts(self.task_count, self.completed_task_count)
+    
+    @classmethod
+    def columns_for(cls, fields):
+        """
+        Columnas que hay que seleccionar para servir los campos pedidos.
+        
+        Args:
+            fields (Iterable[str]): Campos públicos validados
+        
+        Returns:
+            list[Column]: Columnas sin repetir, en el orden de los campos
+        """
+        names = dict.fromkeys(column for name in fields for column in cls.FIELD_COLUMNS[name])
+        return [getattr(cls, name) for name in names]
+    
+    @classmethod
+    def validate_fields(cls, fields):
+        """
+        Valida una selección de campos (sparse fieldset) contra PUBLIC_FIELDS.
+        
+        Args:
+            fields (Iterable[str], optional): Campos pedidos; None equivale a todos
+        
+        Returns:
+            list[str]: Campos validados, en el orden pedido
+        
+        Raises:
+            ValueError: Si se pide algún campo inexistente
         """
-        return {
-            'id': self.id,
-            'name': self.name,
-            'email': self.email,
-            'created_at': self.created_at.isoformat()
-        }
+        if fields is None:
+            return list(cls.PUBLIC_FIELDS)
+        unknown = [name for name in fields if name not in cls.PUBLIC_FIELDS]
+        if unknown or not fields:
+            raise ValueError(
+                f"Campos no válidos: {', '.join(unknown) or '(vacío)'}. "
+                f"Campos disponibles: {', '.join(cls.PUBLIC_FIELDS)}"
+            )
+        return list(fields)
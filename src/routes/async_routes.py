@@ -0,0 +1,50 @@
+from quart import Blueprint
+from src.controllers.async_user_controller import AsyncUserController
+from src.controllers.async_task_controller import AsyncTaskController
+
+# Blueprint para las rutas de la API en modo ASGI (app_async.py)
+async_api_bp = Blueprint('api', __name__, url_prefix='/api')
+
+# ==================== RUTAS DE USUARIOS ====================
+
+@async_api_bp.route('/users', methods=['POST'])
+async def create_user():
+    """POST /api/users - Crear usuario"""
+    return await AsyncUserController.create_user()
+
+@async_api_bp.route('/users/<int:user_id>', methods=['GET'])
+async def get_user(user_id):
+    """GET /api/users/:id - Consultar usuario por ID"""
+    return await AsyncUserController.get_user(user_id)
+
+@async_api_bp.route('/users/<int:user_id>/summary', methods=['GET'])
+async def get_user_summary(user_id):
+    """GET /api/users/:id/summary - Resumen de tareas de un usuario"""
+    return await AsyncUserController.get_user_summary(user_id)
+
+# ==================== RUTAS DE TAREAS ====================
+
+@async_api_bp.route('/tasks', methods=['POST'])
+async def create_task():
+    """POST /api/tasks - Crear tarea asociada a usuario"""
+    return await AsyncTaskController.create_task()
+
+@async_api_bp.route('/users/<int:user_id>/tasks', methods=['GET'])
+async def get_user_tasks(user_id):
+    """GET /api/users/:id/tasks - Listar tareas de un usuario (paginado por cursor)"""
+    return await AsyncTaskController.get_user_tasks(user_id)
+
+@async_api_bp.route('/tasks/<int:task_id>', methods=['PUT'])
+async def update_task(task_id):
+    """PUT /api/tasks/:id - Actualizar estado de tarea"""
+    return await AsyncTaskController.update_task(task_id)
+
+@async_api_bp.route('/tasks/<int:task_id>/complete', methods=['PATCH'])
+async def mark_task_completed(task_id):
+    """PATCH /api/tasks/:id/complete - Marcar tarea como completada"""
+    return await AsyncTaskController.mark_task_completed(task_id)
+
+@async_api_bp.route('/tasks/<int:task_id>', methods=['DELETE'])
+async def delete_task(task_id):
+    """DELETE /api/tasks/:id - Eliminar tarea"""
+    return await AsyncTaskController.delete_task(task_id)
@@ -1,10 +1,18 @@
 from flask import Blueprint
 from src.controllers.user_controller import UserController
 from src.controllers.task_controller import TaskController
+from src.controllers.stats_controller import StatsController
+from src.config.metrics import finish_request_metrics, record_request_metrics, start_request_metrics
 
 # Blueprint para las rutas de la API
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
+# Métricas por ruta: latencia, códigos de estado, peticiones en curso y SQL
+# (no hacen nada si la aplicación no las activó con init_metrics)
+api_bp.before_request(start_request_metrics)
+api_bp.after_request(record_request_metrics)
+api_bp.teardown_request(finish_request_metrics)
+
 # ==================== RUTAS DE USUARIOS ====================
 
 @api_bp.route('/users', methods=['POST'])
@@ -17,6 +25,11 @@ def get_user(user_id):
     """GET /api/users/:id - Consultar usuario por ID"""
     return UserController.get_user(user_id)
 
+@api_bp.route('/users/<int:user_id>/summary', methods=['GET'])
+def get_user_summary(user_id):
+    """GET /api/users/:id/summary - Resumen de tareas de un usuario"""
+    return UserController.get_user_summary(user_id)
+
 # ==================== RUTAS DE TAREAS ====================
 
 @api_bp.route('/tasks', methods=['POST'])
@@ -24,22 +37,59 @@ def create_task():
     """POST /api/tasks - Crear tarea asociada a usuario"""
     return TaskController.create_task()
 
+@api_bp.route('/tasks/bulk', methods=['POST'])
+def create_tasks_bulk():
+    """POST /api/tasks/bulk - Crear varias tareas en una sola transacción"""
+    return TaskController.create_tasks_bulk()
+
 @api_bp.route('/users/<int:user_id>/tasks', methods=['GET'])
 def get_user_tasks(user_id):
-    """GET /api/users/:id/tasks - Listar todas las tareas de un usuario"""
+    """GET /api/users/:id/tasks - Listar tareas de un usuario (paginado por cursor)"""
     return TaskController.get_user_tasks(user_id)
 
+@api_bp.route('/users/<int:user_id>/tasks/search', methods=['GET'])
+def search_user_tasks(user_id):
+    """GET /api/users/:id/tasks/search - Buscar tareas de un usuario por texto"""
+    return TaskController.search_user_tasks(user_id)
+
+@api_bp.route('/users/<int:user_id>/tasks/export', methods=['GET'])
+def export_user_tasks(user_id):
+    """GET /api/users/:id/tasks/export - Exportar tareas de un usuario (NDJSON/CSV)"""
+    return TaskController.export_user_tasks(user_id)
+
 @api_bp.route('/tasks/<int:task_id>', methods=['PUT'])
 def update_task(task_id):
     """PUT /api/tasks/:id - Actualizar estado de tarea"""
     return TaskController.update_task(task_id)
 
+@api_bp.route('/tasks/bulk', methods=['PATCH'])
+def update_tasks_bulk():
+    """PATCH /api/tasks/bulk - Completar o reabrir varias tareas a la vez"""
+    return TaskController.update_tasks_bulk()
+
 @api_bp.route('/tasks/<int:task_id>/complete', methods=['PATCH'])
 def mark_task_completed(task_id):
     """PATCH /api/tasks/:id/complete - Marcar tarea como completada"""
     return TaskController.mark_task_completed(task_id)
 
+@api_bp.route('/tasks/bulk', methods=['DELETE'])
+def delete_tasks_bulk():
+    """DELETE /api/tasks/bulk - Eliminar varias tareas"""
+    return TaskController.delete_tasks_bulk()
+
 @api_bp.route('/tasks/<int:task_id>', methods=['DELETE'])
 def delete_task(task_id):
     """DELETE /api/tasks/:id - Eliminar tarea"""
     return TaskController.delete_task(task_id)
+
+# ==================== RUTAS DE ESTADÍSTICAS ====================
+
+@api_bp.route('/stats/cache', methods=['GET'])
+def get_cache_stats():
+    """GET /api/stats/cache - Contadores de la caché de usuarios"""
+    return StatsController.get_cache_stats()
+
+@api_bp.route('/stats/pool', methods=['GET'])
+def get_pool_stats():
+    """GET /api/stats/pool - Estado de los pools de conexiones"""
+    return StatsController.get_pool_stats()
@@ -0,0 +1,186 @@
+from sqlalchemy.exc import IntegrityError
+from src.models.task import Task
+from src.config.async_database import async_db
+from src.config.database import is_foreign_key_violation
+from src.services.async_user_service import AsyncUserService
+from src.services.task_service import TaskService, deleted_task_changes
+
+class AsyncTaskService:
+    """
+    Capa de Servicios asíncrona para Task (modo ASGI).
+    Reutiliza la construcción de consultas y las validaciones de TaskService;
+    solo cambia la ejecución, que se hace con await sobre la AsyncSession.
+    """
+    
+    @staticmethod
+    async def _commit_task_changes(changes):
+        """
+        Incrementa la versión de tareas y ajusta los contadores de los
+        usuarios afectados en la misma transacción que la escritura, hace
+        commit e invalida su caché (ver TaskService._commit_task_changes).
+        """
+        await AsyncUserService.apply_task_changes(changes)
+        await async_db.session.commit()
+        await AsyncUserService.invalidate_users(changes)
+    
+    @staticmethod
+    async def create_task(title, user_id, description=None):
+        """
+        Crea una nueva tarea asociada a un usuario con un único INSERT ...
+        RETURNING (ver TaskService.create_task).
+        
+        Validación 2: No crear tarea sin user_id válido
+        Validación 3: Verificar que user_id exista antes de crear tarea
+        
+        Args:
+            title (str): Título de la tarea
+            user_id (int): ID del usuario propietario
+            description (str, optional): Descripción de la tarea
+        
+        Returns:
+            Task: Tarea creada
+        
+        Raises:
+            ValueError: Si user_id es inválido o no existe
+        """
+        statement = TaskService.create_task_statement(title, user_id, description)
+        try:
+            new_task = await async_db.session.scalar(statement)
+            await AsyncTaskService._commit_task_changes({user_id: (1, 0)})
+        except IntegrityError as e:
+            await async_db.session.rollback()
+            # Validación 3: Usuario existente (clave foránea tasks.user_id)
+            if is_foreign_key_violation(e):
+                raise ValueError(f"El usuario con ID {user_id} no existe")
+            raise
+        return new_task
+    
+    @staticmethod
+    async def get_task_by_id(task_id):
+        """
+        Obtiene una tarea por su ID.
+        
+        Args:
+            task_id (int): ID de la tarea
+        
+        Returns:
+            Task: Tarea encontrada o None
+        """
+        return await async_db.session.get(Task, task_id)
+    
+    @staticmethod
+    async def get_tasks_by_user(user_id, limit=None, cursor=None, is_completed=None,
+                                created_after=None, created_before=None,
+                                sort='id', order='asc', fields=None):
+        """
+        Obtiene una página de tareas de un usuario específico. Mismos
+        parámetros y resultado que TaskService.get_tasks_by_user.
+        
+        Returns:
+            tuple[list[dict], str]: Tareas de la página serializadas y cursor
+            de la siguiente página (None si no hay más)
+        
+        Raises:
+            ValueError: Si algún parámetro o el cursor son inválidos
+        """
+        statement, limit, fields = TaskService.tasks_page_statement(
+            user_id, limit, cursor, is_completed, created_after, created_before,
+            sort, order, fields
+        )
+        rows = (await async_db.session.execute(statement)).all()
+        return TaskService.tasks_page_result(rows, limit, fields, sort, order)
+    
+    @staticmethod
+    async def get_user_tasks_page(user_id, limit=None, cursor=None, is_completed=None,
+                                  created_after=None, created_before=None,
+                                  sort='id', order='asc', fields=None):
+        """
+        Obtiene en una sola consulta la versión de tareas del usuario (None
+        si no existe) y una página de sus tareas. Mismos parámetros y
+        resultado que TaskService.get_user_tasks_page.
+        
+        Returns:
+            tuple[int, list[dict], str]: Versión, tareas de la página y cursor
+        
+        Raises:
+            ValueError: Si algún parámetro o el cursor son inválidos
+        """
+        statement, limit, fields = TaskService.user_tasks_page_statement(
+            user_id, limit, cursor, is_completed, created_after, created_before,
+            sort, order, fields
+        )
+        rows = (await async_db.session.execute(statement)).all()
+        return TaskService.user_tasks_page_result(rows, limit, fields, sort, order)
+    
+    @staticmethod
+    async def update_task_completion(task_id, is_completed):
+        """
+        Actualiza el estado de completado de una tarea con un único
+        UPDATE ... RETURNING (ver TaskService.update_task_completion).
+        
+        Validación 4: Actualización controlada - Solo permitir actualizar is_completed
+        
+        Args:
+            task_id (int): ID de la tarea
+            is_completed (bool): Nuevo estado de completado
+        
+        Returns:
+            Row: Fila con las columnas de la tarea actualizada
+        
+        Raises:
+            ValueError: Si la tarea no existe
+        """
+        # Validación 4: Actualización controlada
+        session = async_db.session
+        task = (await session.execute(
+            TaskService.task_completion_statement(task_id, is_completed)
+        )).one_or_none()
+        if task is not None:
+            await AsyncTaskService._commit_task_changes(
+                {task.user_id: (0, 1 if is_completed else -1)}
+            )
+            return task
+        
+        task = (await session.execute(TaskService.task_row_statement(task_id))).one_or_none()
+        if task is None:
+            raise ValueError(f"La tarea con ID {task_id} no existe")
+        return task
+    
+    @staticmethod
+    async def mark_task_as_completed(task_id):
+        """
+        Marca una tarea como completada.
+        
+        Args:
+            task_id (int): ID de la tarea
+        
+        Returns:
+            Row: Fila con las columnas de la tarea actualizada
+        
+        Raises:
+            ValueError: Si la tarea no existe
+        """
+        return await AsyncTaskService.update_task_completion(task_id, True)
+    
+    @staticmethod
+    async def delete_task(task_id):
+        """
+        Elimina una tarea con un único DELETE ... RETURNING.
+        
+        Args:
+            task_id (int): ID de la tarea a eliminar
+        
+        Returns:
+            bool: True si se eliminó correctamente
+        
+        Raises:
+            ValueError: Si la tarea no existe
+        """
+        task = (await async_db.session.execute(
+            TaskService.task_delete_statement(task_id)
+        )).one_or_none()
+        if task is None:
+            raise ValueError(f"La tarea con ID {task_id} no existe")
+        
+        await AsyncTaskService._commit_task_changes(deleted_task_changes([task]))
+        return True
@@ -0,0 +1,127 @@
+import asyncio
+from quart import current_app
+from sqlalchemy.exc import IntegrityError
+from src.models.user import User
+from src.config.async_database import async_db
+from src.services.user_service import UserService, invalidate_cached_users
+
+class AsyncUserService:
+    """
+    Capa de Servicios asíncrona para User (modo ASGI).
+    Mismas validaciones que UserService, ejecutadas con la AsyncSession de
+    la petición para no bloquear el event loop durante la consulta.
+    """
+    
+    @staticmethod
+    async def create_user(name, email):
+        """
+        Crea un nuevo usuario con un único INSERT ... ON CONFLICT (email)
+        DO NOTHING RETURNING (ver UserService.create_user).
+        
+        Validación 1: Email único - No permitir usuarios con email duplicado
+        
+        Args:
+            name (str): Nombre del usuario
+            email (str): Email del usuario (debe ser único)
+        
+        Returns:
+            User: Usuario creado
+        
+        Raises:
+            ValueError: Si el email ya existe en la base de datos
+        """
+        session = async_db.session
+        statement = UserService.create_user_statement(
+            name, email, async_db.engine.dialect.name
+        )
+        try:
+            new_user = await session.scalar(statement)
+        except IntegrityError:
+            # Solo en dialectos sin ON CONFLICT
+            await session.rollback()
+            new_user = None
+        
+        # Validación 1: Email único
+        if new_user is None:
+            await session.rollback()
+            raise ValueError(f"El email '{email}' ya está registrado")
+        
+        await session.commit()
+        await AsyncUserService.invalidate_users([new_user.id])
+        return new_user
+    
+    @staticmethod
+    async def get_user_by_id(user_id):
+        """
+        Obtiene un usuario por su ID.
+        
+        Args:
+            user_id (int): ID del usuario
+        
+        Returns:
+            User: Usuario encontrado o None
+        """
+        return await async_db.session.get(User, user_id)
+    
+    @staticmethod
+    async def get_user_fields(user_id, fields):
+        """
+        Obtiene solo las columnas de un usuario que necesitan los campos
+        pedidos (ver UserService.get_user_fields).
+        
+        Args:
+            user_id (int): ID del usuario
+            fields (list[str]): Campos públicos validados
+        
+        Returns:
+            Row: Fila con las columnas pedidas o None
+        """
+        result = await async_db.session.execute(
+            UserService.user_fields_statement(user_id, fields)
+        )
+        return result.first()
+    
+    @staticmethod
+    async def user_exists(user_id):
+        """
+        Verifica si un usuario existe.
+        
+        Validación 3: Usuario existente - Verificar que user_id exista
+        
+        Args:
+            user_id (int): ID del usuario a verificar
+        
+        Returns:
+            bool: True si existe, False en caso contrario
+        """
+        return await AsyncUserService.get_user_by_id(user_id) is not None
+    
+    @staticmethod
+    async def apply_task_changes(changes):
+        """
+        Incrementa la versión de tareas y ajusta los contadores de los
+        usuarios afectados (mismo UPDATE que UserService.apply_task_changes).
+        No hace commit.
+        
+        Args:
+            changes (dict[int, tuple[int, int]]): Por user_id, variación de
+                tareas totales y de tareas completadas
+        """
+        statement = UserService.task_changes_statement(changes)
+        if statement is not None:
+            await async_db.session.execute(statement)
+    
+    @staticmethod
+    async def invalidate_users(user_ids):
+        """
+        Invalida la entrada en caché de varios usuarios tras una escritura
+        (ver UserService.invalidate_user). Con una caché compartida (Redis)
+        la invalidación llega también a los workers síncronos.
+        
+        Args:
+            user_ids (Iterable[int]): IDs de los usuarios
+        """
+        cache = current_app.extensions.get('user_cache')
+        if cache is not None:
+            # El cliente de Redis es síncrono: se llama fuera del event loop
+            await asyncio.to_thread(invalidate_cached_users, cache, list(user_ids))
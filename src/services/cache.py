@@ -0,0 +1,260 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# Centinela para distinguir "no está en caché" de un valor almacenado
+MISSING = object()
+
+
+class LRUCache:
+    """
+    Caché en proceso con expulsión LRU acotada y expiración por TTL.
+    Es segura para hilos y lleva contadores de aciertos, fallos y expulsiones.
+
+    Es por proceso: invalidar una clave no afecta a las copias de otros workers.
+    """
+
+    shared = False
+
+    def __init__(self, max_size=10000, ttl=60, clock=time.monotonic):
+        """
+        Args:
+            max_size (int): Número máximo de entradas antes de expulsar la menos usada
+            ttl (float): Segundos de vida por defecto de cada entrada
+            clock (callable): Reloj monotónico (inyectable en pruebas)
+        """
+        if max_size < 1:
+            raise ValueError("El tamaño máximo de la caché debe ser mayor que 0")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """
+        Obtiene un valor de la caché.
+
+        Returns:
+            El valor almacenado o MISSING si no existe o expiró
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Guarda un valor, expulsando la entrada menos usada si se supera max_size.
+
+        Args:
+            key (str): Clave
+            value: Valor a guardar
+            ttl (float, optional): Segundos de vida (por defecto self.ttl)
+        """
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        """Invalida una clave (no falla si no existe)."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Vacía la caché sin reiniciar los contadores."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Contadores y tamaño actual de la caché
+        """
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
+class LocalSharedStore:
+    """
+    Sustituto local de un almacén compartido tipo Redis (get/set con ex/delete).
+    Permite ejecutar SharedStoreCache en pruebas y en despliegues de un solo nodo.
+
+    Vive dentro del proceso: no lo comparten varios workers.
+    """
+
+    def __init__(self, max_size=10000):
+        # El TTL real lo indica cada set(); el valor por defecto no se usa
+        self._cache = LRUCache(max_size=max_size, ttl=0)
+
+    @property
+    def evictions(self):
+        return self._cache.evictions
+
+    def get(self, key):
+        value = self._cache.get(key)
+        return None if value is MISSING else value
+
+    def set(self, key, value, ex=None):
+        self._cache.set(key, value, ttl=ex if ex is not None else float('inf'))
+        return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self._cache.delete(key)
+        return len(keys)
+
+    def flushdb(self):
+        self._cache.clear()
+        return True
+
+
+class SharedStoreCache:
+    """
+    Caché respaldada por un almacén compartido entre procesos (p. ej. Redis).
+
+    Los valores se serializan como JSON y expiran por TTL en el almacén; el
+    límite de memoria y la política LRU los aplica el propio almacén. Si el
+    almacén falla, la operación se trata como un fallo de caché y la petición
+    sigue contra la base de datos.
+
+    Con un almacén real todos los workers ven la misma entrada, así que una
+    invalidación llega a todos ellos (shared=True). Sobre LocalSharedStore
+    cada proceso tiene su propio almacén y la caché se trata como en proceso.
+    """
+
+    def __init__(self, client, ttl=60, prefix='todo-api:', shared=None):
+        """
+        Args:
+            client: Cliente con la interfaz de Redis (get, set(ex=), delete)
+            ttl (int): Segundos de vida de cada entrada
+            prefix (str): Prefijo de las claves en el almacén compartido
+            shared (bool, optional): Si el almacén lo comparten todos los
+                workers (por defecto, salvo que sea un LocalSharedStore)
+        """
+        self.client = client
+        self.shared = not isinstance(client, LocalSharedStore) if shared is None else shared
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key):
+        try:
+            raw = self.client.get(self.prefix + key)
+        except Exception:
+            self._count('errors')
+            raw = None
+        if raw is None:
+            self._count('misses')
+            return MISSING
+        self._count('hits')
+        return json.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        try:
+            self.client.set(self.prefix + key, json.dumps(value), ex=ttl or self.ttl)
+        except Exception:
+            self._count('errors')
+
+    def delete(self, key):
+        try:
+            self.client.delete(self.prefix + key)
+        except Exception:
+            self._count('errors')
+
+    def clear(self):
+        # Solo se vacía por completo el sustituto local; en un almacén real
+        # compartido no se borran claves de otros procesos o aplicaciones
+        if isinstance(self.client, LocalSharedStore):
+            self.client.flushdb()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Contadores de la caché (las expulsiones las reporta el almacén)
+        """
+        with self._lock:
+            return {
+                'backend': 'shared',
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': getattr(self.client, 'evictions', 0),
+                'errors': self.errors
+            }
+
+
+def create_cache(config):
+    """
+    Crea el backend de caché de usuarios según la configuración.
+
+    USER_CACHE_BACKEND:
+        'memory' - LRUCache en proceso (por defecto)
+        'shared' - SharedStoreCache sobre Redis (USER_CACHE_URL) o, si no se
+                   indica URL, sobre el sustituto local LocalSharedStore (que
+                   no se comparte entre workers)
+        'none'   - Sin caché
+
+    Returns:
+        LRUCache | SharedStoreCache | None
+    """
+    backend = config.get('USER_CACHE_BACKEND', 'memory')
+    max_size = int(config.get('USER_CACHE_MAX_SIZE', 10000))
+    ttl = int(config.get('USER_CACHE_TTL', 60))
+
+    if backend == 'none':
+        return None
+    if backend == 'memory':
+        return LRUCache(max_size=max_size, ttl=ttl)
+    if backend == 'shared':
+        url = config.get('USER_CACHE_URL')
+        if url:
+            # Dependencia opcional: solo se requiere si se usa Redis
+            import redis
+            client = redis.Redis.from_url(url)
+        else:
+            client = LocalSharedStore(max_size=max_size)
+        return SharedStoreCache(client, ttl=ttl)
+    raise ValueError(f"Backend de caché desconocido: {backend}")
+
+
+def init_user_cache(app):
+    """
+    Registra la caché de usuarios de la aplicación en app.extensions.
+    """
+    app.extensions['user_cache'] = create_cache(app.config)
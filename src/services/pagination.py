@@ -0,0 +1,64 @@
+import base64
+import binascii
+import json
+
+# Tamaño de página por defecto y máximo permitido para listados paginados
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def validate_limit(limit):
+    """
+    Valida el tamaño de página solicitado.
+    
+    Args:
+        limit (int): Número máximo de elementos por página
+    
+    Returns:
+        int: Tamaño de página validado
+    
+    Raises:
+        ValueError: Si el límite está fuera del rango permitido
+    """
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    if not isinstance(limit, int) or isinstance(limit, bool) or not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"El parámetro limit debe estar entre 1 y {MAX_PAGE_SIZE}")
+    return limit
+
+
+def encode_cursor(payload):
+    """
+    Codifica la posición de la última fila de una página como cursor opaco.
+    
+    Args:
+        payload (dict): Valores de la clave de ordenamiento de la última fila
+    
+    Returns:
+        str: Cursor opaco (base64 url-safe)
+    """
+    raw = json.dumps(payload, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decodifica un cursor opaco generado por encode_cursor.
+    
+    Args:
+        cursor (str): Cursor recibido del cliente
+    
+    Returns:
+        dict: Valores de la clave de ordenamiento
+    
+    Raises:
+        ValueError: Si el cursor está mal formado
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("El cursor proporcionado no es válido")
+    if not isinstance(payload, dict):
+        raise ValueError("El cursor proporcionado no es válido")
+    return payload
@@ -1,6 +1,58 @@
-from src.models.task import Task
+import re
+from datetime import datetime, timezone
+from sqlalchemy import (
+    tuple_, literal, literal_column, select, insert, update, delete, true,
+    cast, column, func, table
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from sqlalchemy.exc import IntegrityError
+from src.models.task import Task, TASK_SEARCH_CONFIG, TASK_SEARCH_FTS_TABLE
+from src.models.user import User
 from src.services.user_service import UserService
-from src.config.database import db
+from src.services.pagination import validate_limit, encode_cursor, decode_cursor
+from src.config.database import db, is_foreign_key_violation, replica_reads
+
+def _to_naive_utc(value):
+    """
+    Normaliza una fecha a UTC sin zona horaria, que es como se guarda
+    created_at en la base de datos.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def task_changes(user_ids, total=0, completed=0):
+    """
+    Acumula por usuario la variación de sus contadores de tareas
+    (ver UserService.apply_task_changes).
+    
+    Args:
+        user_ids (Iterable[int]): user_id de cada tarea escrita (con repetición)
+        total (int): Variación de tareas totales por cada tarea
+        completed (int): Variación de tareas completadas por cada tarea
+    
+    Returns:
+        dict[int, tuple[int, int]]: Por user_id, variación de totales y completadas
+    """
+    changes = {}
+    for user_id in user_ids:
+        user_total, user_completed = changes.get(user_id, (0, 0))
+        changes[user_id] = (user_total + total, user_completed + completed)
+    return changes
+
+
+def deleted_task_changes(rows):
+    """
+    Variación de contadores por usuario tras borrar las filas devueltas por
+    un DELETE ... RETURNING user_id, is_completed.
+    """
+    changes = {}
+    for row in rows:
+        user_total, user_completed = changes.get(row.user_id, (0, 0))
+        changes[row.user_id] = (user_total - 1, user_completed - int(row.is_completed))
+    return changes
+
 
 class TaskService:
     """
@@ -8,6 +60,34 @@ class TaskService:
     Contiene la lógica de negocio relacionada con tareas.
     """
     
+    # Campos por los que se puede ordenar el listado de tareas
+    SORT_FIELDS = ('id', 'created_at')
+    
+    # Máximo de tareas por petición de creación masiva
+    MAX_BULK_TASKS = 1000
+    
+    # Tamaño máximo de cada lote en el borrado masivo por lotes
+    MAX_DELETE_CHUNK_SIZE = 10000
+    
+    # Longitud máxima del texto de búsqueda
+    MAX_SEARCH_LENGTH = 200
+    
+    @staticmethod
+    def _commit_task_changes(changes):
+        """
+        Confirma una escritura de tareas: en la misma transacción incrementa
+        la versión de tareas de los usuarios afectados y ajusta sus
+        contadores, hace commit e invalida su entrada en la caché de usuarios.
+        
+        Args:
+            changes (dict[int, tuple[int, int]]): Por user_id, variación de
+                tareas totales y de tareas completadas
+        """
+        UserService.apply_task_changes(changes)
+        db.session.commit()
+        for user_id in changes:
+            UserService.invalidate_user(user_id)
+    
     @staticmethod
     def create_task(title, user_id, description=None):
         """
@@ -16,6 +96,10 @@ class TaskService:
         Validación 2: No crear tarea sin user_id válido
         Validación 3: Verificar que user_id exista antes de crear tarea
         
+        La existencia del usuario la garantiza la clave foránea tasks.user_id:
+        se ejecuta un único INSERT ... RETURNING, sin un SELECT previo, y la
+        violación de la clave foránea se traduce al mismo ValueError.
+        
         Args:
             title (str): Título de la tarea
             user_id (int): ID del usuario propietario
@@ -27,24 +111,144 @@ class TaskService:
         Raises:
             ValueError: Si user_id es inválido o no existe
         """
+        statement = TaskService.create_task_statement(title, user_id, description)
+        try:
+            new_task = db.session.scalar(statement)
+            # Fuera de la sesión el commit no la expira: los valores devueltos
+            # por RETURNING se usan sin volver a leer la fila
+            db.session.expunge(new_task)
+            TaskService._commit_task_changes({user_id: (1, 0)})
+        except IntegrityError as e:
+            db.session.rollback()
+            # Validación 3: Usuario existente
+            if is_foreign_key_violation(e):
+                raise ValueError(f"El usuario con ID {user_id} no existe")
+            raise
+        return new_task
+    
+    @staticmethod
+    def create_task_statement(title, user_id, description=None):
+        """
+        Construye (sin ejecutar) el INSERT ... RETURNING de una tarea. Se
+        comparte entre TaskService y AsyncTaskService.
+        
+        Returns:
+            Insert: Sentencia que devuelve la entidad Task creada
+        
+        Raises:
+            ValueError: Si user_id no se indicó
+        """
         # Validación 2: No crear tarea sin user_id
         if not user_id:
             raise ValueError("El user_id es obligatorio para crear una tarea")
         
-        # Validación 3: Usuario existente
-        if not UserService.user_exists(user_id):
-            raise ValueError(f"El usuario con ID {user_id} no existe")
-        
-        # Crear nueva tarea
-        new_task = Task(
+        return insert(Task).values(
             title=title,
             description=description,
             user_id=user_id,
             is_completed=False
-        )
-        db.session.add(new_task)
-        db.session.commit()
-        return new_task
+        ).returning(Task)
+    
+    @staticmethod
+    def create_tasks(items, atomic=True):
+        """
+        Crea varias tareas en una sola transacción.
+        
+        Cada user_id distinto se valida una sola vez (un único SELECT ... IN)
+        y las tareas válidas se insertan con un INSERT multi-fila con RETURNING
+        (en SQLite, una sentencia por tarea para conservar el orden).
+        
+        Args:
+            items (list[dict]): Tareas a crear, con title, user_id y description opcional
+            atomic (bool): Si es True, cualquier error cancela todo el lote;
+                si es False, se crean las tareas válidas y se reportan las demás
+        
+        Returns:
+            tuple[list[tuple[int, Row]], list[dict]]: Pares (índice, fila creada)
+            y errores por elemento ({'index': i, 'error': mensaje})
+        
+        Raises:
+            ValueError: Si el lote está vacío o supera MAX_BULK_TASKS, o si la
+                clave foránea rechaza el INSERT (se deshace la transacción)
+        """
+        if not isinstance(items, list) or not items:
+            raise ValueError("Se requiere una lista de tareas no vacía")
+        if len(items) > TaskService.MAX_BULK_TASKS:
+            raise ValueError(
+                f"No se pueden crear más de {TaskService.MAX_BULK_TASKS} tareas por petición"
+            )
+        
+        errors = []
+        candidates = []
+        max_title_length = Task.title.type.length
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors.append({'index': index, 'error': 'Cada tarea debe ser un objeto JSON'})
+                continue
+            title = item.get('title')
+            user_id = item.get('user_id')
+            description = item.get('description')
+            if not title or not user_id:
+                errors.append({'index': index, 'error': 'Los campos title y user_id son obligatorios'})
+            elif not isinstance(title, str) or len(title) > max_title_length:
+                errors.append({
+                    'index': index,
+                    'error': f'El title debe ser un texto de máximo {max_title_length} caracteres'
+                })
+            elif not isinstance(user_id, int) or isinstance(user_id, bool):
+                errors.append({'index': index, 'error': 'El user_id debe ser un número entero'})
+            elif description is not None and not isinstance(description, str):
+                errors.append({'index': index, 'error': 'La description debe ser un texto'})
+            else:
+                candidates.append((index, {
+                    'title': title,
+                    'description': description,
+                    'user_id': user_id,
+                    'is_completed': False
+                }))
+        
+        # Validación 3: Usuario existente (un solo SELECT para todos los user_id)
+        user_ids = {row['user_id'] for _, row in candidates}
+        existing_ids = set()
+        if user_ids:
+            existing_ids = set(db.session.scalars(
+                select(User.id).where(User.id.in_(user_ids))
+            ))
+        
+        valid = []
+        for index, row in candidates:
+            if row['user_id'] in existing_ids:
+                valid.append((index, row))
+            else:
+                errors.append({
+                    'index': index,
+                    'error': f"El usuario con ID {row['user_id']} no existe"
+                })
+        errors.sort(key=lambda error: error['index'])
+        
+        if not valid or (atomic and errors):
+            return [], errors
+        
+        # INSERT multi-fila con RETURNING. Se devuelven filas (no entidades ORM)
+        # para no recargarlas tras el commit. Ni SQLite ni PostgreSQL garantizan
+        # el orden de RETURNING: sort_by_parameter_order devuelve las filas en
+        # el orden de los parámetros, alineadas con valid (en PostgreSQL sigue
+        # siendo un INSERT por lote; en SQLite, que no lo admite, uno por fila).
+        try:
+            created = db.session.execute(
+                insert(Task.__table__).returning(*Task.__table__.columns, sort_by_parameter_order=True),
+                [row for _, row in valid]
+            ).all()
+            TaskService._commit_task_changes(
+                task_changes((row.user_id for row in created), total=1)
+            )
+        except IntegrityError as e:
+            db.session.rollback()
+            # Validación 3: un usuario validado dejó de existir antes del INSERT
+            if is_foreign_key_violation(e):
+                raise ValueError("Alguno de los usuarios del lote no existe; no se creó ninguna tarea")
+            raise
+        return list(zip([index for index, _ in valid], created)), errors
     
     @staticmethod
     def get_task_by_id(task_id):
@@ -57,20 +261,356 @@ class TaskService:
         Returns:
             Task: Tarea encontrada o None
         """
-        return db.session.get(Task, task_id)
+        with replica_reads():
+            return db.session.get(Task, task_id)
     
     @staticmethod
-    def get_tasks_by_user(user_id):
+    def get_tasks_by_user(user_id, limit=None, cursor=None, is_completed=None,
+                          created_after=None, created_before=None,
+                          sort='id', order='asc', fields=None):
         """
-        Obtiene todas las tareas de un usuario específico.
+        Obtiene una página de tareas de un usuario específico.
+        
+        Los filtros y el ordenamiento se resuelven en SQL y la paginación es
+        por cursor (keyset) sobre los índices compuestos de Task: cada página
+        cuesta lo mismo sin importar su profundidad. Solo se seleccionan las
+        columnas pedidas (más la clave de ordenamiento), sin hidratar
+        entidades ORM.
         
         Args:
             user_id (int): ID del usuario
+            limit (int, optional): Tamaño de la página
+            cursor (str, optional): Cursor opaco devuelto por la página anterior
+            is_completed (bool, optional): Filtrar por estado de completado
+            created_after (datetime, optional): Solo tareas creadas después de esta fecha
+            created_before (datetime, optional): Solo tareas creadas antes de esta fecha
+            sort (str): Campo de ordenamiento ('id' o 'created_at')
+            order (str): Dirección del ordenamiento ('asc' o 'desc')
+            fields (list[str], optional): Columnas a devolver (por defecto todas)
+        
+        Returns:
+            tuple[list[dict], str]: Tareas de la página serializadas y cursor
+            de la siguiente página (None si no hay más)
+        
+        Raises:
+            ValueError: Si algún parámetro o el cursor son inválidos
+        """
+        statement, limit, fields = TaskService.tasks_page_statement(
+            user_id, limit, cursor, is_completed, created_after, created_before,
+            sort, order, fields
+        )
+        with replica_reads():
+            rows = db.session.execute(statement).all()
+        return TaskService.tasks_page_result(rows, limit, fields, sort, order)
+    
+    @staticmethod
+    def get_user_tasks_page(user_id, limit=None, cursor=None, is_completed=None,
+                            created_after=None, created_before=None,
+                            sort='id', order='asc', fields=None):
+        """
+        Obtiene en una sola consulta la existencia del usuario, su versión de
+        tareas y una página de sus tareas (mismos parámetros que
+        get_tasks_by_user).
+        
+        La página se une con LEFT JOIN a la fila del usuario: si el usuario no
+        existe no hay filas; si existe pero no tiene tareas (o ninguna cumple
+        los filtros) hay una única fila con las columnas de la tarea en NULL.
         
         Returns:
-            list[Task]: Lista de tareas del usuario
+            tuple[int, list[dict], str]: Versión de tareas del usuario (None
+            si el usuario no existe), tareas de la página y cursor de la
+            página siguiente
+        
+        Raises:
+            ValueError: Si algún parámetro o el cursor son inválidos
         """
-        return Task.query.filter_by(user_id=user_id).all()
+        statement, limit, fields = TaskService.user_tasks_page_statement(
+            user_id, limit, cursor, is_completed, created_after, created_before,
+            sort, order, fields
+        )
+        with replica_reads():
+            rows = db.session.execute(statement).all()
+        return TaskService.user_tasks_page_result(rows, limit, fields, sort, order)
+    
+    @staticmethod
+    def user_tasks_page_statement(user_id, limit=None, cursor=None, is_completed=None,
+                                  created_after=None, created_before=None,
+                                  sort='id', order='asc', fields=None):
+        """
+        Construye (sin ejecutar) el SELECT de get_user_tasks_page: la fila
+        del usuario con LEFT JOIN a la página de tasks_page_statement. Se
+        comparte entre TaskService y AsyncTaskService.
+        
+        Returns:
+            tuple[Select, int, list[str]]: Sentencia, límite y campos validados
+        
+        Raises:
+            ValueError: Si algún parámetro o el cursor son inválidos
+        """
+        page_statement, limit, fields = TaskService.tasks_page_statement(
+            user_id, limit, cursor, is_completed, created_after, created_before,
+            sort, order, fields
+        )
+        page = page_statement.subquery('page')
+        
+        # El orden de la subconsulta no se conserva: se repite fuera
+        key_columns = [page.c.created_at, page.c.id] if sort == 'created_at' else [page.c.id]
+        if order == 'asc':
+            ordering = [column.asc() for column in key_columns]
+        else:
+            ordering = [column.desc() for column in key_columns]
+        
+        statement = (
+            select(
+                User.id.label('owner_id'),
+                User.task_version.label('owner_task_version'),
+                *page.c
+            )
+            .select_from(User)
+            .outerjoin(page, true())
+            .where(User.id == user_id)
+            .order_by(*ordering)
+        )
+        return statement, limit, fields
+    
+    @staticmethod
+    def user_tasks_page_result(rows, limit, fields, sort, order):
+        """
+        Convierte las filas de user_tasks_page_statement en la versión de
+        tareas del usuario, la página serializada y el cursor siguiente.
+        
+        Returns:
+            tuple[int, list[dict], str]: Versión (None si el usuario no
+            existe), tareas de la página y cursor (o None)
+        """
+        if not rows:
+            return None, [], None
+        task_version = rows[0].owner_task_version
+        # La fila del LEFT JOIN sin tareas trae la clave de ordenamiento en NULL
+        rows = [row for row in rows if row.id is not None]
+        tasks, next_cursor = TaskService.tasks_page_result(rows, limit, fields, sort, order)
+        return task_version, tasks, next_cursor
+    
+    @staticmethod
+    def tasks_page_statement(user_id, limit=None, cursor=None, is_completed=None,
+                             created_after=None, created_before=None,
+                             sort='id', order='asc', fields=None):
+        """
+        Construye (sin ejecutar) el SELECT de una página de tareas. Se
+        comparte entre TaskService y AsyncTaskService.
+        
+        Returns:
+            tuple[Select, int, list[str]]: Sentencia, límite y campos validados
+        
+        Raises:
+            ValueError: Si algún parámetro o el cursor son inválidos
+        """
+        limit = validate_limit(limit)
+        if sort not in TaskService.SORT_FIELDS:
+            raise ValueError("El parámetro sort debe ser 'id' o 'created_at'")
+        if order not in ('asc', 'desc'):
+            raise ValueError("El parámetro order debe ser 'asc' o 'desc'")
+        fields = Task.validate_fields(fields)
+        
+        # Clave de ordenamiento: siempre termina en id para que sea única
+        key_columns = [Task.created_at, Task.id] if sort == 'created_at' else [Task.id]
+        
+        # Proyección: columnas pedidas + clave de ordenamiento (para el cursor)
+        table = Task.__table__
+        selected = list(fields) + [
+            column.key for column in key_columns if column.key not in fields
+        ]
+        query = select(*[table.c[name] for name in selected]).where(Task.user_id == user_id)
+        
+        # Filtros
+        if is_completed is not None:
+            query = query.where(Task.is_completed == is_completed)
+        if created_after is not None:
+            query = query.where(Task.created_at > _to_naive_utc(created_after))
+        if created_before is not None:
+            query = query.where(Task.created_at < _to_naive_utc(created_before))
+        
+        if cursor:
+            key_values = TaskService._decode_task_cursor(cursor, sort, order)
+            key_values = [
+                literal(value, column.type) for column, value in zip(key_columns, key_values)
+            ]
+            if order == 'asc':
+                query = query.where(tuple_(*key_columns) > tuple_(*key_values))
+            else:
+                query = query.where(tuple_(*key_columns) < tuple_(*key_values))
+        
+        if order == 'asc':
+            query = query.order_by(*[column.asc() for column in key_columns])
+        else:
+            query = query.order_by(*[column.desc() for column in key_columns])
+        
+        # Se pide una fila extra para saber si existe una página siguiente
+        return query.limit(limit + 1), limit, fields
+    
+    @staticmethod
+    def tasks_page_result(rows, limit, fields, sort, order):
+        """
+        Convierte las filas de tasks_page_statement en la página serializada
+        y el cursor de la página siguiente.
+        
+        Returns:
+            tuple[list[dict], str]: Tareas de la página y cursor (o None)
+        """
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = TaskService._encode_task_cursor(rows[-1], sort, order)
+        return [Task.row_to_dict(row, fields) for row in rows], next_cursor
+    
+    @staticmethod
+    def search_tasks(user_id, q, limit=None, cursor=None):
+        """
+        Busca tareas de un usuario por texto en el título y la descripción.
+        
+        Usa el índice de texto completo del dialecto (tsvector con índice GIN
+        en PostgreSQL, FTS5 en SQLite). Se exigen todos los términos y los
+        resultados se ordenan por relevancia (el título pesa más que la
+        descripción) y después por id. La paginación es por desplazamiento:
+        el cursor queda ligado a la búsqueda que lo generó.
+        
+        Args:
+            user_id (int): ID del usuario
+            q (str): Texto a buscar
+            limit (int, optional): Tamaño de la página
+            cursor (str, optional): Cursor opaco devuelto por la página anterior
+        
+        Returns:
+            tuple[list[dict], str]: Tareas de la página serializadas y cursor
+            de la siguiente página (None si no hay más)
+        
+        Raises:
+            ValueError: Si la búsqueda, el límite o el cursor son inválidos
+        """
+        statement, limit, offset = TaskService.search_tasks_statement(
+            user_id, q, limit, cursor, db.engine.dialect.name
+        )
+        with replica_reads():
+            rows = db.session.execute(statement).all()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor({'q': q, 'offset': offset + limit})
+        return [Task.row_to_dict(row) for row in rows], next_cursor
+    
+    @staticmethod
+    def search_tasks_statement(user_id, q, limit, cursor, dialect_name):
+        """
+        Construye (sin ejecutar) el SELECT de una página de search_tasks
+        para el dialecto indicado ('postgresql' o 'sqlite').
+        
+        Returns:
+            tuple[Select, int, int]: Sentencia, límite y desplazamiento
+        
+        Raises:
+            ValueError: Si la búsqueda, el límite o el cursor son inválidos
+        """
+        if not isinstance(q, str) or len(q) > TaskService.MAX_SEARCH_LENGTH:
+            raise ValueError(
+                f"El parámetro q es obligatorio (máximo {TaskService.MAX_SEARCH_LENGTH} caracteres)"
+            )
+        # Solo palabras: la sintaxis de consulta de cada motor no se expone
+        terms = re.findall(r'\w+', q)
+        if not terms:
+            raise ValueError("El parámetro q debe contener al menos una palabra")
+        limit = validate_limit(limit)
+        
+        offset = 0
+        if cursor:
+            payload = decode_cursor(cursor)
+            offset = payload.get('offset')
+            if payload.get('q') != q:
+                raise ValueError("El cursor no corresponde a la búsqueda solicitada")
+            if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+                raise ValueError("El cursor proporcionado no es válido")
+        
+        query = select(*Task.__table__.columns).where(Task.user_id == user_id)
+        if dialect_name == 'postgresql':
+            vector = literal_column('tasks.search_vector', TSVECTOR)
+            ts_query = func.plainto_tsquery(
+                cast(literal(TASK_SEARCH_CONFIG), REGCONFIG), ' '.join(terms)
+            )
+            query = query.where(vector.bool_op('@@')(ts_query)).order_by(
+                func.ts_rank(vector, ts_query).desc(), Task.id
+            )
+        elif dialect_name == 'sqlite':
+            fts = table(TASK_SEARCH_FTS_TABLE, column('rowid'), column(TASK_SEARCH_FTS_TABLE))
+            match = ' '.join(f'"{term}"' for term in terms)
+            query = (
+                query.join(fts, fts.c.rowid == Task.id)
+                .where(fts.c[TASK_SEARCH_FTS_TABLE].bool_op('MATCH')(match))
+                # bm25: menor es más relevante; pesos de title y description
+                .order_by(func.bm25(literal_column(TASK_SEARCH_FTS_TABLE), 10.0, 1.0), Task.id)
+            )
+        else:
+            raise RuntimeError(f"La búsqueda de texto no está disponible para {dialect_name}")
+        
+        # Se pide una fila extra para saber si existe una página siguiente
+        return query.limit(limit + 1).offset(offset), limit, offset
+    
+    @staticmethod
+    def iter_tasks_by_user(user_id, batch_size=1000):
+        """
+        Recorre todas las tareas de un usuario sin materializarlas en memoria.
+        
+        Usa yield_per, que en PostgreSQL abre un cursor del lado del servidor:
+        la memoria se mantiene constante sin importar cuántas tareas haya.
+        Devuelve filas (Row) con las columnas de Task, no entidades ORM.
+        
+        Args:
+            user_id (int): ID del usuario
+            batch_size (int): Filas obtenidas de la base de datos por lote
+        
+        Yields:
+            Row: Fila con las columnas de la tarea, ordenadas por id
+        """
+        with replica_reads():
+            result = db.session.execute(
+                select(*Task.__table__.columns)
+                .where(Task.user_id == user_id)
+                .order_by(Task.id)
+                .execution_options(yield_per=batch_size)
+            )
+        try:
+            yield from result
+        finally:
+            result.close()
+    
+    @staticmethod
+    def _encode_task_cursor(task, sort, order):
+        """Genera el cursor que apunta a la posición posterior a task."""
+        payload = {'sort': sort, 'order': order, 'id': task.id}
+        if sort == 'created_at':
+            payload['created_at'] = _to_naive_utc(task.created_at).isoformat()
+        return encode_cursor(payload)
+    
+    @staticmethod
+    def _decode_task_cursor(cursor, sort, order):
+        """
+        Decodifica un cursor de tareas y devuelve los valores de la clave
+        de ordenamiento. El cursor debe corresponder al mismo sort/order.
+        """
+        payload = decode_cursor(cursor)
+        if payload.get('sort') != sort or payload.get('order') != order:
+            raise ValueError("El cursor no corresponde al ordenamiento solicitado")
+        
+        last_id = payload.get('id')
+        if not isinstance(last_id, int) or isinstance(last_id, bool):
+            raise ValueError("El cursor proporcionado no es válido")
+        if sort == 'id':
+            return [last_id]
+        
+        try:
+            last_created_at = datetime.fromisoformat(payload.get('created_at'))
+        except (TypeError, ValueError):
+            raise ValueError("El cursor proporcionado no es válido")
+        return [last_created_at, last_id]
     
     @staticmethod
     def update_task_completion(task_id, is_completed):
@@ -79,25 +619,118 @@ class TaskService:
         
         Validación 4: Actualización controlada - Solo permitir actualizar is_completed
         
+        Se ejecuta un único UPDATE ... RETURNING que solo modifica la fila si
+        su estado cambia. Si no devuelve nada, una lectura distingue entre
+        tarea inexistente y tarea que ya tenía ese estado (sin escribir).
+        
         Args:
             task_id (int): ID de la tarea
             is_completed (bool): Nuevo estado de completado
         
         Returns:
-            Task: Tarea actualizada
+            Row: Fila con las columnas de la tarea actualizada
         
         Raises:
             ValueError: Si la tarea no existe
         """
-        task = db.session.get(Task, task_id)
-        if not task:
-            raise ValueError(f"La tarea con ID {task_id} no existe")
-        
         # Validación 4: Actualización controlada
-        task.is_completed = is_completed
-        db.session.commit()
+        task = db.session.execute(
+            TaskService.task_completion_statement(task_id, is_completed)
+        ).one_or_none()
+        if task is not None:
+            TaskService._commit_task_changes(
+                {task.user_id: (0, 1 if is_completed else -1)}
+            )
+            return task
+        
+        task = db.session.execute(TaskService.task_row_statement(task_id)).one_or_none()
+        if task is None:
+            raise ValueError(f"La tarea con ID {task_id} no existe")
         return task
     
+    @staticmethod
+    def task_row_statement(task_id):
+        """Construye el SELECT de las columnas de una tarea por su ID."""
+        return select(*Task.__table__.columns).where(Task.id == task_id)
+    
+    @staticmethod
+    def task_completion_statement(task_id, is_completed):
+        """
+        Construye (sin ejecutar) el UPDATE ... RETURNING que cambia el estado
+        de una tarea solo si es distinto del actual. Se comparte entre
+        TaskService y AsyncTaskService.
+        """
+        return (
+            update(Task)
+            .where(Task.id == task_id, Task.is_completed != is_completed)
+            .values(is_completed=is_completed)
+            .returning(*Task.__table__.columns)
+        )
+    
+    @staticmethod
+    def set_tasks_completion(is_completed, task_ids=None, user_id=None, created_before=None):
+        """
+        Marca varias tareas como completadas o pendientes con un único
+        UPDATE ... RETURNING, sin cargar las entidades.
+        
+        Las tareas se seleccionan por lista de IDs, por predicado (user_id y,
+        opcionalmente, created_before) o por ambos. Solo se modifican las filas
+        cuyo estado cambia realmente.
+        
+        Args:
+            is_completed (bool): Nuevo estado de completado
+            task_ids (list[int], optional): IDs de las tareas a actualizar
+            user_id (int, optional): Limitar a las tareas de este usuario
+            created_before (datetime, optional): Solo tareas creadas antes de esta fecha
+        
+        Returns:
+            list[int]: IDs de las tareas que cambiaron de estado
+        
+        Raises:
+            ValueError: Si no se indica task_ids ni user_id, o los IDs son inválidos
+        """
+        conditions = TaskService._bulk_conditions(task_ids, user_id, created_before=created_before)
+        
+        statement = (
+            update(Task)
+            .where(*conditions, Task.is_completed != is_completed)
+            .values(is_completed=is_completed)
+            .returning(Task.id, Task.user_id)
+        )
+        updated = db.session.execute(statement).all()
+        TaskService._commit_task_changes(
+            task_changes((row.user_id for row in updated), completed=1 if is_completed else -1)
+        )
+        return sorted(row.id for row in updated)
+    
+    @staticmethod
+    def _bulk_conditions(task_ids, user_id, is_completed=None, created_before=None):
+        """
+        Construye el predicado WHERE de las operaciones masivas. Exige
+        task_ids o user_id para no afectar nunca a toda la tabla.
+        """
+        if task_ids is None and user_id is None:
+            raise ValueError("Se requiere task_ids o user_id")
+        
+        conditions = []
+        if task_ids is not None:
+            if (not isinstance(task_ids, list) or not task_ids
+                    or any(not isinstance(task_id, int) or isinstance(task_id, bool)
+                           for task_id in task_ids)):
+                raise ValueError("El campo task_ids debe ser una lista no vacía de enteros")
+            if len(task_ids) > TaskService.MAX_BULK_TASKS:
+                raise ValueError(
+                    f"No se pueden modificar más de {TaskService.MAX_BULK_TASKS} tareas por ID en una petición"
+                )
+            conditions.append(Task.id.in_(task_ids))
+        if user_id is not None:
+            conditions.append(Task.user_id == user_id)
+        if is_completed is not None:
+            conditions.append(Task.is_completed == is_completed)
+        if created_before is not None:
+            conditions.append(Task.created_at < _to_naive_utc(created_before))
+        return conditions
+    
     @staticmethod
     def mark_task_as_completed(task_id):
         """
@@ -107,7 +740,7 @@ class TaskService:
             task_id (int): ID de la tarea
         
         Returns:
-            Task: Tarea actualizada
+            Row: Fila con las columnas de la tarea actualizada
         
         Raises:
             ValueError: Si la tarea no existe
@@ -117,7 +750,7 @@ class TaskService:
     @staticmethod
     def delete_task(task_id):
         """
-        Elimina una tarea.
+        Elimina una tarea con un único DELETE ... RETURNING, sin cargarla.
         
         Args:
             task_id (int): ID de la tarea a eliminar
@@ -128,10 +761,87 @@ class TaskService:
         Raises:
             ValueError: Si la tarea no existe
         """
-        task = db.session.get(Task, task_id)
-        if not task:
+        task = db.session.execute(TaskService.task_delete_statement(task_id)).one_or_none()
+        if task is None:
             raise ValueError(f"La tarea con ID {task_id} no existe")
         
-        db.session.delete(task)
-        db.session.commit()
+        TaskService._commit_task_changes(deleted_task_changes([task]))
         return True
+    
+    @staticmethod
+    def task_delete_statement(task_id):
+        """
+        Construye (sin ejecutar) el DELETE ... RETURNING user_id, is_completed
+        de una tarea. Se comparte entre TaskService y AsyncTaskService.
+        """
+        return (
+            delete(Task)
+            .where(Task.id == task_id)
+            .returning(Task.user_id, Task.is_completed)
+            .execution_options(synchronize_session='fetch')
+        )
+    
+    @staticmethod
+    def delete_tasks(task_ids=None, user_id=None, is_completed=None,
+                     created_before=None, chunk_size=None):
+        """
+        Elimina varias tareas con sentencias DELETE, sin cargar las entidades.
+        
+        Sin chunk_size se ejecuta un único DELETE en una transacción. Con
+        chunk_size se borra en lotes acotados (cada uno con su propio commit)
+        para no mantener bloqueos largos en borrados muy grandes; en ese caso
+        la operación no es atómica en conjunto.
+        
+        Args:
+            task_ids (list[int], optional): IDs de las tareas a eliminar
+            user_id (int, optional): Limitar a las tareas de este usuario
+            is_completed (bool, optional): Limitar por estado de completado
+            created_before (datetime, optional): Solo tareas creadas antes de esta fecha
+            chunk_size (int, optional): Máximo de filas por sentencia DELETE
+        
+        Returns:
+            int: Número de tareas eliminadas
+        
+        Raises:
+            ValueError: Si no se indica task_ids ni user_id, o algún parámetro es inválido
+        """
+        conditions = TaskService._bulk_conditions(
+            task_ids, user_id, is_completed=is_completed, created_before=created_before
+        )
+        
+        if chunk_size is None:
+            deleted = db.session.execute(
+                delete(Task)
+                .where(*conditions)
+                .returning(Task.user_id, Task.is_completed)
+                .execution_options(synchronize_session='fetch')
+            ).all()
+            TaskService._commit_task_changes(deleted_task_changes(deleted))
+            return len(deleted)
+        
+        if (not isinstance(chunk_size, int) or isinstance(chunk_size, bool)
+                or not 1 <= chunk_size <= TaskService.MAX_DELETE_CHUNK_SIZE):
+            raise ValueError(
+                f"El parámetro chunk_size debe estar entre 1 y {TaskService.MAX_DELETE_CHUNK_SIZE}"
+            )
+        
+        deleted = 0
+        while True:
+            # DELETE ... WHERE id IN (SELECT id ... LIMIT n): una sentencia por lote
+            chunk = (
+                select(Task.id)
+                .where(*conditions)
+                .order_by(Task.id)
+                .limit(chunk_size)
+                .scalar_subquery()
+            )
+            rows = db.session.execute(
+                delete(Task)
+                .where(Task.id.in_(chunk))
+                .returning(Task.user_id, Task.is_completed)
+                .execution_options(synchronize_session='fetch')
+            ).all()
+            TaskService._commit_task_changes(deleted_task_changes(rows))
+            deleted += len(rows)
+            if len(rows) < chunk_size:
+                return deleted
@@ -1,7 +1,74 @@
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import case, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import make_transient_to_detached
 from src.models.user import User
-from src.config.database import db
+from src.config.database import db, primary_pinned, replica_configured, replica_reads
+from src.services.cache import MISSING
 from sqlalchemy.exc import IntegrityError
 
+
+def _user_cache():
+    """Devuelve la caché de usuarios de la aplicación actual (o None)."""
+    return current_app.extensions.get('user_cache')
+
+
+def _user_cache_key(user_id):
+    return f'user:{user_id}'
+
+
+def _user_profile_key(user_id):
+    return f'user-profile:{user_id}'
+
+
+# Columnas de User que no cambian nunca (no se editan ni eliminan usuarios)
+_USER_PROFILE_COLUMNS = ('id', 'name', 'email', 'created_at')
+
+# Columnas de User que cambian con cada escritura de tareas
+_USER_TASK_COLUMNS = ('task_version', 'task_count', 'completed_task_count')
+
+# Columnas de User guardadas en la entrada completa (solo caché compartida)
+_USER_CACHE_COLUMNS = _USER_PROFILE_COLUMNS + _USER_TASK_COLUMNS
+
+
+def _cached_user_data(cache, key, columns):
+    """
+    Lee una entrada de usuario de la caché. Las entradas con otro formato
+    (p. ej. de una versión anterior en un almacén compartido) son un fallo.
+    """
+    data = cache.get(key)
+    if data is not MISSING and set(data) != set(columns):
+        return MISSING
+    return data
+
+
+def _user_cache_entry(user, columns):
+    """Valor serializable en JSON con el que se cachean columnas de un User."""
+    entry = {column: getattr(user, column) for column in columns}
+    entry['created_at'] = user.created_at.isoformat()
+    return entry
+
+
+def invalidate_cached_users(cache, user_ids):
+    """
+    Invalida la entrada completa en caché de varios usuarios. Se comparte
+    con AsyncUserService, que usa la caché de la aplicación ASGI.
+    
+    Args:
+        cache: Caché de usuarios (LRUCache o SharedStoreCache)
+        user_ids (Iterable[int]): IDs de los usuarios
+    """
+    for user_id in user_ids:
+        cache.delete(_user_cache_key(user_id))
+
+
+# INSERT con soporte de ON CONFLICT DO NOTHING por dialecto
+_UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert
+}
+
 class UserService:
     """
     Capa de Servicios para User.
@@ -15,6 +82,10 @@ class UserService:
         
         Validación 1: Email único - No permitir usuarios con email duplicado
         
+        Se ejecuta un único INSERT ... ON CONFLICT (email) DO NOTHING
+        RETURNING: si el email ya existe no se devuelve ninguna fila, sin
+        SELECT previo ni rollback aunque haya registros concurrentes.
+        
         Args:
             name (str): Nombre del usuario
             email (str): Email del usuario (debe ser único)
@@ -25,33 +96,229 @@ class UserService:
         Raises:
             ValueError: Si el email ya existe en la base de datos
         """
-        # Validación 1: Email único
-        existing_user = User.query.filter_by(email=email).first()
-        if existing_user:
-            raise ValueError(f"El email '{email}' ya está registrado")
-        
+        statement = UserService.create_user_statement(name, email, db.engine.dialect.name)
         try:
-            # Crear nuevo usuario
-            new_user = User(name=name, email=email)
-            db.session.add(new_user)
-            db.session.commit()
-            return new_user
+            new_user = db.session.scalar(statement)
         except IntegrityError:
+            # Solo en dialectos sin ON CONFLICT
+            db.session.rollback()
+            new_user = None
+        
+        # Validación 1: Email único
+        if new_user is None:
             db.session.rollback()
             raise ValueError(f"El email '{email}' ya está registrado")
+        
+        # Fuera de la sesión el commit no lo expira (no se vuelve a leer)
+        db.session.expunge(new_user)
+        db.session.commit()
+        UserService.invalidate_user(new_user.id)
+        return new_user
+    
+    @staticmethod
+    def create_user_statement(name, email, dialect_name):
+        """
+        Construye (sin ejecutar) el INSERT de un usuario que ignora los
+        emails duplicados. Se comparte con AsyncUserService.
+        
+        Args:
+            name (str): Nombre del usuario
+            email (str): Email del usuario
+            dialect_name (str): Dialecto del engine ('postgresql', 'sqlite', ...)
+        
+        Returns:
+            Insert: Sentencia que devuelve el User creado, o ninguna fila si
+            el email ya existe (en otros dialectos falla con IntegrityError)
+        """
+        dialect_insert = _UPSERT_INSERTS.get(dialect_name)
+        if dialect_insert is None:
+            return insert(User).values(name=name, email=email).returning(User)
+        return (
+            dialect_insert(User)
+            .values(name=name, email=email)
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User)
+        )
     
     @staticmethod
     def get_user_by_id(user_id):
         """
         Obtiene un usuario por su ID.
         
+        El usuario incluye task_version y los contadores de tareas, que
+        cambian con cada escritura de tareas. Solo una caché compartida entre
+        workers (Redis) guarda el usuario completo: la caché en proceso solo
+        se invalida en el worker que escribió. Con ella se cachea únicamente
+        el perfil (id, name, email, created_at), que no cambia, y la versión
+        y los contadores se leen siempre con un SELECT de esas tres columnas.
+        
+        Los usuarios inexistentes no se cachean. Sin acierto se lee de la
+        réplica (si existe); esa lectura solo llena el perfil, no la entrada
+        completa, porque la réplica puede ir retrasada.
+        
         Args:
             user_id (int): ID del usuario
         
         Returns:
             User: Usuario encontrado o None
         """
-        return db.session.get(User, user_id)
+        cache = _user_cache()
+        if cache is None:
+            with replica_reads():
+                return db.session.get(User, user_id)
+        
+        # Read-your-writes: dentro de la ventana del cliente (g.pin_primary)
+        # no se usa la entrada completa, que otro cliente pudo llenar antes
+        # de la escritura
+        if cache.shared and not primary_pinned():
+            data = _cached_user_data(cache, _user_cache_key(user_id), _USER_CACHE_COLUMNS)
+            if data is not MISSING:
+                return UserService._user_from_cache(data)
+        
+        if not cache.shared:
+            profile = _cached_user_data(cache, _user_profile_key(user_id), _USER_PROFILE_COLUMNS)
+            if profile is not MISSING:
+                columns = [getattr(User, column) for column in _USER_TASK_COLUMNS]
+                with replica_reads():
+                    task_state = db.session.execute(
+                        select(*columns).where(User.id == user_id)
+                    ).mappings().first()
+                if task_state is None:
+                    return None
+                return UserService._user_from_cache({**profile, **task_state})
+        
+        reads_replica = replica_configured()
+        with replica_reads():
+            user = db.session.get(User, user_id)
+        if user is not None:
+            cache.set(_user_profile_key(user_id), _user_cache_entry(user, _USER_PROFILE_COLUMNS))
+            if cache.shared and not reads_replica and not primary_pinned():
+                cache.set(_user_cache_key(user_id), _user_cache_entry(user, _USER_CACHE_COLUMNS))
+        return user
+    
+    @staticmethod
+    def get_user_fields(user_id, fields):
+        """
+        Obtiene solo las columnas de un usuario que necesitan los campos
+        pedidos (sparse fieldset), más task_version para el ETag. No pasa
+        por la caché: la proyección llega al SELECT.
+        
+        Args:
+            user_id (int): ID del usuario
+            fields (list[str]): Campos públicos validados (User.validate_fields)
+        
+        Returns:
+            Row: Fila con las columnas pedidas (ver User.row_to_dict) o None
+        """
+        with replica_reads():
+            return db.session.execute(UserService.user_fields_statement(user_id, fields)).first()
+    
+    @staticmethod
+    def user_fields_statement(user_id, fields):
+        """
+        Construye (sin ejecutar) el SELECT de get_user_fields. Se comparte
+        con AsyncUserService.
+        
+        Returns:
+            Select: SELECT de task_version y las columnas de los campos pedidos
+        """
+        columns = [User.task_version, *User.columns_for(fields)]
+        return select(*columns).where(User.id == user_id)
+    
+    @staticmethod
+    def get_task_version(user_id):
+        """
+        Obtiene la versión de tareas de un usuario con un SELECT de una sola
+        columna, sin pasar por la caché. Basta para validar un ETag sin
+        cargar al usuario ni sus tareas.
+        
+        Args:
+            user_id (int): ID del usuario
+        
+        Returns:
+            int: Versión de tareas (User.task_version) o None si no existe
+        """
+        with replica_reads():
+            return db.session.scalar(select(User.task_version).where(User.id == user_id))
+    
+    @staticmethod
+    def _user_from_cache(data):
+        """
+        Reconstruye un User persistente a partir de su entrada en caché,
+        adjuntándolo a la sesión sin emitir ninguna consulta.
+        """
+        user = User(**{**data, 'created_at': datetime.fromisoformat(data['created_at'])})
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+    
+    @staticmethod
+    def invalidate_user(user_id):
+        """
+        Invalida la entrada en caché de un usuario. Debe llamarse tras
+        cualquier escritura que modifique al usuario. El perfil no cambia y
+        no se invalida.
+        
+        Args:
+            user_id (int): ID del usuario
+        """
+        cache = _user_cache()
+        if cache is not None:
+            invalidate_cached_users(cache, [user_id])
+    
+    @staticmethod
+    def apply_task_changes(changes):
+        """
+        Registra una escritura de tareas en los usuarios afectados con un
+        único UPDATE: incrementa su versión de tareas y ajusta los contadores
+        de tareas totales y completadas. No hace commit: debe ejecutarse en
+        la misma transacción que la escritura de tareas, y tras el commit hay
+        que invalidar la caché de esos usuarios con invalidate_user.
+        
+        Args:
+            changes (dict[int, tuple[int, int]]): Por user_id, variación de
+                tareas totales y de tareas completadas
+        """
+        statement = UserService.task_changes_statement(changes)
+        if statement is not None:
+            db.session.execute(statement)
+    
+    @staticmethod
+    def task_changes_statement(changes):
+        """
+        Construye (sin ejecutar) el UPDATE de apply_task_changes. Se
+        comparte con AsyncUserService.
+        
+        Returns:
+            Update: Sentencia UPDATE, o None si no hay usuarios afectados
+        """
+        if not changes:
+            return None
+        values = {'task_version': User.task_version + 1}
+        total = {user_id: delta[0] for user_id, delta in changes.items() if delta[0]}
+        completed = {user_id: delta[1] for user_id, delta in changes.items() if delta[1]}
+        if total:
+            values['task_count'] = User.task_count + case(total, value=User.id, else_=0)
+        if completed:
+            values['completed_task_count'] = (
+                User.completed_task_count + case(completed, value=User.id, else_=0)
+            )
+        return (
+            update(User)
+            .where(User.id.in_(list(changes)))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+    
+    @staticmethod
+    def cache_stats():
+        """
+        Obtiene los contadores de la caché de usuarios.
+        
+        Returns:
+            dict: Aciertos, fallos, expulsiones, etc. (None si no hay caché)
+        """
+        cache = _user_cache()
+        return cache.stats() if cache is not None else None
     
     @staticmethod
     def get_all_users():
@@ -61,7 +328,8 @@ class UserService:
         Returns:
             list[User]: Lista de todos los usuarios
         """
-        return User.query.all()
+        with replica_reads():
+            return User.query.all()
     
     @staticmethod
     def user_exists(user_id):
@@ -70,10 +338,24 @@ class UserService:
         
         Validación 3: Usuario existente - Verificar que user_id exista
         
+        La existencia de un usuario no cambia (no se eliminan usuarios), así
+        que basta con el perfil en caché, de cualquier backend. En un fallo
+        se consulta el primario (la réplica podría no tener aún al usuario) y
+        se cachea el perfil.
+        
         Args:
             user_id (int): ID del usuario a verificar
         
         Returns:
             bool: True si existe, False en caso contrario
         """
-        return db.session.get(User, user_id) is not None
+        cache = _user_cache()
+        if cache is not None:
+            if _cached_user_data(cache, _user_profile_key(user_id), _USER_PROFILE_COLUMNS) is not MISSING:
+                return True
+        
+        columns = [getattr(User, column) for column in _USER_PROFILE_COLUMNS]
+        profile = db.session.execute(select(*columns).where(User.id == user_id)).first()
+        if profile is not None and cache is not None:
+            cache.set(_user_profile_key(user_id), _user_cache_entry(profile, _USER_PROFILE_COLUMNS))
+        return profile is not None
@@ -121,7 +121,7 @@ if user_id:
         print(f"Status: {response.status_code}")
         tasks_response = response.json()
         print(json.dumps(tasks_response, indent=2))
-        print(f"\nTotal de tareas restantes: {tasks_response.get('total')}")
+        print(f"\nTareas restantes: {tasks_response.get('count')}")
     except Exception as e:
         print(f"Error: {e}")
 
@@ -67,9 +67,9 @@ class TestE2EFlow:
         tasks_response = client.get(f'/api/users/{user_id}/tasks')
         assert tasks_response.status_code == 200
         tasks_data = json.loads(tasks_response.data)
-        assert tasks_data['total'] == 2
+        assert tasks_data['count'] == 2
         assert len(tasks_data['tasks']) == 2
-        print(f"Paso 3: Usuario tiene {tasks_data['total']} tareas")
+        print(f"Paso 3: Usuario tiene {tasks_data['count']} tareas")
         
         # Verificar que ambas tareas están sin completar
         for task in tasks_data['tasks']:
@@ -99,7 +99,7 @@ class TestE2EFlow:
         final_tasks_data = json.loads(final_tasks_response.data)
         
         # Verificaciones finales
-        assert final_tasks_data['total'] == 1, "Debe quedar exactamente 1 tarea"
+        assert final_tasks_data['count'] == 1, "Debe quedar exactamente 1 tarea"
         assert len(final_tasks_data['tasks']) == 1
         
         # La tarea restante debe ser la primera (task1)
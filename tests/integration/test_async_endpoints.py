@@ -0,0 +1,141 @@
+"""
+Pruebas de Integración - Modo ASGI (app_async.py)
+Ejecutan los endpoints asíncronos sobre SQLite en memoria con aiosqlite
+"""
+import asyncio
+import pytest
+from sqlalchemy.pool import StaticPool
+
+pytest.importorskip('quart')
+pytest.importorskip('aiosqlite')
+
+from app import create_app
+from app_async import create_async_app
+from src.config.async_database import async_db
+from src.config.config import AsyncConfig
+from src.config.database import db
+from src.services.cache import LocalSharedStore, SharedStoreCache
+from tests.conftest import InMemoryTestConfig
+
+
+class AsyncTestConfig(AsyncConfig):
+    """Configuración de pruebas del modo ASGI con base de datos en memoria"""
+    TESTING = True
+    ASYNC_DATABASE_URI = 'sqlite+aiosqlite://'
+    # Una única conexión compartida para que todas las sesiones vean la misma base
+    ASYNC_ENGINE_OPTIONS = {'poolclass': StaticPool}
+
+
+class TestAsyncEndpoints:
+    """Pruebas de integración del flujo principal en modo ASGI"""
+    
+    def test_user_and_task_flow(self):
+        """
+        Recorre crear usuario, crear tareas, listar (paginado), completar y
+        eliminar sobre el engine asíncrono
+        """
+        async def scenario():
+            app = create_async_app(AsyncTestConfig)
+            async with app.test_app() as test_app:
+                async with app.app_context():
+                    await async_db.create_all()
+                client = test_app.test_client()
+                
+                response = await client.post(
+                    '/api/users', json={'name': 'Ana', 'email': 'ana@example.com'}
+                )
+                assert response.status_code == 201
+                user_id = (await response.get_json())['user']['id']
+                
+                response = await client.post(
+                    '/api/users', json={'name': 'Otra', 'email': 'ana@example.com'}
+                )
+                assert response.status_code == 400
+                
+                response = await client.get(f'/api/users/{user_id}?fields=id,name')
+                assert (await response.get_json())['user'] == {'id': user_id, 'name': 'Ana'}
+                
+                task_ids = []
+                for title in ('Uno', 'Dos', 'Tres'):
+                    response = await client.post(
+                        '/api/tasks', json={'title': title, 'user_id': user_id}
+                    )
+                    assert response.status_code == 201
+                    task_ids.append((await response.get_json())['task']['id'])
+                
+                response = await client.post('/api/tasks', json={'title': 'X', 'user_id': 999})
+                assert response.status_code == 400
+                
+                response = await client.get(f'/api/users/{user_id}/tasks?limit=2')
+                page = await response.get_json()
+                assert [task['id'] for task in page['tasks']] == task_ids[:2]
+                response = await client.get(
+                    f"/api/users/{user_id}/tasks?limit=2&cursor={page['next_cursor']}"
+                )
+                page = await response.get_json()
+                assert [task['id'] for task in page['tasks']] == task_ids[2:]
+                assert page['next_cursor'] is None
+                
+                response = await client.patch(f'/api/tasks/{task_ids[0]}/complete')
+                assert (await response.get_json())['task']['is_completed'] is True
+                response = await client.put(f'/api/tasks/{task_ids[1]}', json={'is_completed': 'si'})
+                assert response.status_code == 400
+                
+                response = await client.delete(f'/api/tasks/{task_ids[2]}')
+                assert response.status_code == 200
+                response = await client.delete(f'/api/tasks/{task_ids[2]}')
+                assert response.status_code == 404
+                
+                response = await client.get(f'/api/users/{user_id}/tasks?is_completed=true')
+                assert [task['id'] for task in (await response.get_json())['tasks']] == task_ids[:1]
+                
+                response = await client.get(f'/api/users/{user_id}/summary')
+                assert await response.get_json() == {
+                    'user_id': user_id, 'total': 2, 'completed': 1, 'pending': 1
+                }
+                
+                response = await client.get('/api/users/999/tasks')
+                assert response.status_code == 404
+        
+        asyncio.run(scenario())
+    
+    def test_async_writes_invalidate_the_shared_user_cache(self, tmp_path):
+        """
+        Una escritura en la aplicación ASGI invalida la entrada de la caché
+        compartida que leen los workers síncronos sobre la misma base
+        """
+        database = tmp_path / 'shared.db'
+        
+        class SyncConfig(InMemoryTestConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{database}'
+        
+        class SharedAsyncConfig(AsyncTestConfig):
+            ASYNC_DATABASE_URI = f'sqlite+aiosqlite:///{database}'
+            ASYNC_ENGINE_OPTIONS = {}
+        
+        # Un solo almacén para las dos aplicaciones, como lo sería Redis
+        shared_cache = SharedStoreCache(LocalSharedStore(), shared=True)
+        sync_app = create_app(SyncConfig)
+        sync_app.extensions['user_cache'] = shared_cache
+        with sync_app.app_context():
+            db.create_all()
+        sync_client = sync_app.test_client()
+        
+        response = sync_client.post('/api/users', json={'name': 'Ana', 'email': 'ana@example.com'})
+        user_id = response.get_json()['user']['id']
+        assert sync_client.get(f'/api/users/{user_id}/summary').get_json()['total'] == 0
+        
+        async def create_task():
+            app = create_async_app(SharedAsyncConfig)
+            app.extensions['user_cache'] = shared_cache
+            async with app.test_app() as test_app:
+                response = await test_app.test_client().post(
+                    '/api/tasks', json={'title': 'Desde ASGI', 'user_id': user_id}
+                )
+                assert response.status_code == 201
+        
+        asyncio.run(create_task())
+        
+        assert sync_client.get(f'/api/users/{user_id}/summary').get_json()['total'] == 1
+        with sync_app.app_context():
+            db.engine.dispose()
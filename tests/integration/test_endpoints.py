@@ -2,7 +2,17 @@
 Pruebas de Integración - Endpoints HTTP
 Prueban la interacción completa entre controladores, servicios y modelos
 """
+import csv
+import io
 import json
+import pstats
+import pytest
+from app import create_app
+from src.config.database import PRIMARY_PIN_COOKIE, db
+from src.models.user import User
+from src.services.cache import LocalSharedStore, MISSING, SharedStoreCache
+from tests.conftest import InMemoryTestConfig
+from tests.query_budget import QUERY_BUDGETS, QueryBudgetClient, QueryBudgetExceeded
 
 
 class TestUserEndpoints:
@@ -116,9 +126,844 @@ class TestTaskEndpoints:
         assert response.status_code == 200
         data = json.loads(response.data)
         assert 'tasks' in data
-        assert data['total'] == 3
+        assert data['count'] == 3
         assert len(data['tasks']) == 3
         
         # Verificar que todas las tareas pertenecen al usuario
         for task in data['tasks']:
             assert task['user_id'] == user_id
+    
+    def test_get_user_tasks_paginates_with_cursor(self, client):
+        """
+        Prueba de Integración 4: GET /api/users/:id/tasks pagina por cursor
+        Verifica que las páginas no se solapan y que next_cursor termina en None
+        """
+        user_response = client.post(
+            '/api/users',
+            data=json.dumps({'name': 'Pablo Díaz', 'email': 'pablo@example.com'}),
+            content_type='application/json'
+        )
+        user_id = json.loads(user_response.data)['user']['id']
+        
+        for i in range(5):
+            client.post(
+                '/api/tasks',
+                data=json.dumps({'title': f'Tarea {i}', 'user_id': user_id}),
+                content_type='application/json'
+            )
+        
+        # Recorrer todas las páginas de tamaño 2
+        seen_ids = []
+        cursor = None
+        pages = 0
+        while True:
+            url = f'/api/users/{user_id}/tasks?limit=2'
+            if cursor:
+                url += f'&cursor={cursor}'
+            response = client.get(url)
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            assert len(data['tasks']) <= 2
+            seen_ids.extend(task['id'] for task in data['tasks'])
+            pages += 1
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        
+        assert pages == 3
+        assert seen_ids == sorted(seen_ids)
+        assert len(set(seen_ids)) == 5
+        
+        # Cursor y limit inválidos devuelven 400
+        assert client.get(f'/api/users/{user_id}/tasks?cursor=basura').status_code == 400
+        assert client.get(f'/api/users/{user_id}/tasks?limit=0').status_code == 400
+    
+    def test_get_user_tasks_filters_and_sorts(self, client):
+        """
+        Prueba de Integración 5: GET /api/users/:id/tasks filtra y ordena en SQL
+        Verifica is_completed, sort/order y la paginación en orden descendente
+        """
+        user_response = client.post(
+            '/api/users',
+            data=json.dumps({'name': 'Elena Vargas', 'email': 'elena@example.com'}),
+            content_type='application/json'
+        )
+        user_id = json.loads(user_response.data)['user']['id']
+        
+        task_ids = []
+        for i in range(4):
+            response = client.post(
+                '/api/tasks',
+                data=json.dumps({'title': f'Tarea {i}', 'user_id': user_id}),
+                content_type='application/json'
+            )
+            task_ids.append(json.loads(response.data)['task']['id'])
+        client.patch(f'/api/tasks/{task_ids[0]}/complete')
+        
+        # Filtro por estado
+        response = client.get(f'/api/users/{user_id}/tasks?is_completed=false')
+        data = json.loads(response.data)
+        assert [t['id'] for t in data['tasks']] == task_ids[1:]
+        
+        response = client.get(f'/api/users/{user_id}/tasks?is_completed=true')
+        data = json.loads(response.data)
+        assert [t['id'] for t in data['tasks']] == task_ids[:1]
+        
+        # Orden descendente por fecha de creación, paginado
+        url = f'/api/users/{user_id}/tasks?sort=created_at&order=desc&limit=3'
+        first_page = json.loads(client.get(url).data)
+        second_page = json.loads(
+            client.get(f"{url}&cursor={first_page['next_cursor']}").data
+        )
+        ids = [t['id'] for t in first_page['tasks'] + second_page['tasks']]
+        assert ids == list(reversed(task_ids))
+        assert second_page['next_cursor'] is None
+        
+        # Un cursor de otro ordenamiento es rechazado
+        response = client.get(
+            f"/api/users/{user_id}/tasks?cursor={first_page['next_cursor']}"
+        )
+        assert response.status_code == 400
+        
+        # Rango de fechas: nada creado antes del año 2000
+        response = client.get(
+            f'/api/users/{user_id}/tasks?created_before=2000-01-01T00:00:00Z'
+        )
+        assert json.loads(response.data)['tasks'] == []
+        
+        # Parámetros inválidos
+        assert client.get(f'/api/users/{user_id}/tasks?sort=title').status_code == 400
+        assert client.get(f'/api/users/{user_id}/tasks?is_completed=quizas').status_code == 400
+    
+    def test_post_tasks_bulk(self, client):
+        """
+        Prueba de Integración 6: POST /api/tasks/bulk crea tareas en lote
+        Verifica 201 cuando todo es válido y 207 con errores por elemento
+        """
+        user_response = client.post(
+            '/api/users',
+            data=json.dumps({'name': 'Diego Castro', 'email': 'diego@example.com'}),
+            content_type='application/json'
+        )
+        user_id = json.loads(user_response.data)['user']['id']
+        
+        # Todo válido
+        response = client.post(
+            '/api/tasks/bulk',
+            data=json.dumps({'tasks': [
+                {'title': f'Importada {i}', 'user_id': user_id} for i in range(3)
+            ]}),
+            content_type='application/json'
+        )
+        assert response.status_code == 201
+        data = json.loads(response.data)
+        assert [item['index'] for item in data['tasks']] == [0, 1, 2]
+        assert data['tasks'][0]['task']['user_id'] == user_id
+        assert data['errors'] == []
+        
+        # Éxito parcial
+        response = client.post(
+            '/api/tasks/bulk',
+            data=json.dumps({
+                'tasks': [{'title': 'Válida', 'user_id': user_id}, {'title': 'Sin usuario'}],
+                'atomic': False
+            }),
+            content_type='application/json'
+        )
+        assert response.status_code == 207
+        data = json.loads(response.data)
+        assert len(data['tasks']) == 1
+        assert data['errors'][0]['index'] == 1
+        
+        # Atómico con errores: no se crea nada
+        response = client.post(
+            '/api/tasks/bulk',
+            data=json.dumps({'tasks': [{'title': 'Válida', 'user_id': user_id}, {'title': 'X'}]}),
+            content_type='application/json'
+        )
+        assert response.status_code == 400
+        
+        listing = json.loads(client.get(f'/api/users/{user_id}/tasks').data)
+        assert listing['count'] == 4
+    
+    def test_patch_tasks_bulk_completion(self, client):
+        """
+        Prueba de Integración 7: PATCH /api/tasks/bulk completa y reabre en lote
+        Verifica la selección por IDs y por predicado (user_id)
+        """
+        user_response = client.post(
+            '/api/users',
+            data=json.dumps({'name': 'Marta Ríos', 'email': 'marta@example.com'}),
+            content_type='application/json'
+        )
+        user_id = json.loads(user_response.data)['user']['id']
+        bulk_response = client.post(
+            '/api/tasks/bulk',
+            data=json.dumps({'tasks': [
+                {'title': f'Tarea {i}', 'user_id': user_id} for i in range(4)
+            ]}),
+            content_type='application/json'
+        )
+        task_ids = [item['task']['id'] for item in json.loads(bulk_response.data)['tasks']]
+        
+        # Completar por lista de IDs
+        response = client.patch(
+            '/api/tasks/bulk',
+            data=json.dumps({'is_completed': True, 'task_ids': task_ids[:2]}),
+            content_type='application/json'
+        )
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['updated'] == 2
+        assert data['task_ids'] == task_ids[:2]
+        
+        # Completar todo lo del usuario: solo cambian las 2 pendientes
+        response = client.patch(
+            '/api/tasks/bulk',
+            data=json.dumps({'is_completed': True, 'user_id': user_id}),
+            content_type='application/json'
+        )
+        assert json.loads(response.data)['task_ids'] == task_ids[2:]
+        
+        listing = json.loads(client.get(f'/api/users/{user_id}/tasks?is_completed=false').data)
+        assert listing['tasks'] == []
+        
+        # Sin task_ids ni user_id no se permite actualizar toda la tabla
+        response = client.patch(
+            '/api/tasks/bulk',
+            data=json.dumps({'is_completed': False}),
+            content_type='application/json'
+        )
+        assert response.status_code == 400
+        
+        # Borrado por lotes: un DELETE y un UPDATE de contadores por lote
+        response = client.delete(
+            '/api/tasks/bulk',
+            data=json.dumps({'user_id': user_id, 'chunk_size': 3}),
+            content_type='application/json'
+        )
+        assert json.loads(response.data)['deleted'] == 4
+    
+    def test_export_user_tasks_streams_ndjson_and_csv(self, client):
+        """
+        Prueba de Integración 8: GET /api/users/:id/tasks/export en streaming
+        Verifica los formatos NDJSON y CSV y el 404 de usuario inexistente
+        """
+        user_response = client.post(
+            '/api/users',
+            data=json.dumps({'name': 'Raúl Pinto', 'email': 'raul@example.com'}),
+            content_type='application/json'
+        )
+        user_id = json.loads(user_response.data)['user']['id']
+        client.post(
+            '/api/tasks/bulk',
+            data=json.dumps({'tasks': [
+                {'title': f'Tarea {i}', 'description': 'a, "b"', 'user_id': user_id}
+                for i in range(3)
+            ]}),
+            content_type='application/json'
+        )
+        
+        response = client.get(f'/api/users/{user_id}/tasks/export')
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == 'application/x-ndjson'
+        lines = response.get_data(as_text=True).splitlines()
+        tasks = [json.loads(line) for line in lines]
+        assert [task['title'] for task in tasks] == ['Tarea 0', 'Tarea 1', 'Tarea 2']
+        
+        response = client.get(f'/api/users/{user_id}/tasks/export?format=csv')
+        assert response.mimetype == 'text/csv'
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+        assert rows[0] == ['id', 'title', 'description', 'is_completed', 'user_id', 'created_at']
+        assert len(rows) == 4
+        assert rows[1][2] == 'a, "b"'
+        
+        assert client.get('/api/users/999/tasks/export').status_code == 404
+        assert client.get(f'/api/users/{user_id}/tasks/export?format=xml').status_code == 400
+    
+    def test_get_user_tasks_conditional_get(self, client):
+        """
+        Prueba de Integración 9: ETag / If-None-Match en usuario y tareas
+        Verifica 304 sin cambios y un ETag nuevo tras cada escritura de tareas
+        """
+        user_response = client.post(
+            '/api/users',
+            data=json.dumps({'name': 'Irene Soto', 'email': 'irene@example.com'}),
+            content_type='application/json'
+        )
+        user_id = json.loads(user_response.data)['user']['id']
+        
+        response = client.get(f'/api/users/{user_id}/tasks')
+        etag = response.headers['ETag']
+        assert etag
+        
+        # Sin cambios: 304 sin cuerpo
+        response = client.get(f'/api/users/{user_id}/tasks', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        
+        # Cada combinación de query params tiene su propio ETag
+        response = client.get(
+            f'/api/users/{user_id}/tasks?is_completed=true', headers={'If-None-Match': etag}
+        )
+        assert response.status_code == 200
+        
+        # Una escritura de tareas invalida el ETag
+        task_response = client.post(
+            '/api/tasks',
+            data=json.dumps({'title': 'Nueva', 'user_id': user_id}),
+            content_type='application/json'
+        )
+        task_id = json.loads(task_response.data)['task']['id']
+        response = client.get(f'/api/users/{user_id}/tasks', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert json.loads(response.data)['count'] == 1
+        
+        # Lo mismo para GET /api/users/:id
+        user_etag = client.get(f'/api/users/{user_id}').headers['ETag']
+        response = client.get(f'/api/users/{user_id}', headers={'If-None-Match': user_etag})
+        assert response.status_code == 304
+        client.patch(f'/api/tasks/{task_id}/complete')
+        response = client.get(f'/api/users/{user_id}', headers={'If-None-Match': user_etag})
+        assert response.status_code == 200
+    
+    def test_sparse_fieldsets(self, client, query_recorder):
+        """
+        Prueba de Integración 10: ?fields= en tareas y usuarios
+        Verifica que solo se devuelven y se seleccionan los campos pedidos
+        """
+        user_response = client.post(
+            '/api/users',
+            data=json.dumps({'name': 'Hugo León', 'email': 'hugo@example.com'}),
+            content_type='application/json'
+        )
+        user_id = json.loads(user_response.data)['user']['id']
+        client.post(
+            '/api/tasks/bulk',
+            data=json.dumps({'tasks': [
+                {'title': f'Tarea {i}', 'description': 'x' * 1000, 'user_id': user_id}
+                for i in range(3)
+            ]}),
+            content_type='application/json'
+        )
+        
+        # La paginación sigue funcionando aunque el cursor use columnas no pedidas
+        url = f'/api/users/{user_id}/tasks?fields=title,is_completed&sort=created_at&limit=2'
+        data = json.loads(client.get(url).data)
+        assert data['tasks'] == [
+            {'title': 'Tarea 0', 'is_completed': False},
+            {'title': 'Tarea 1', 'is_completed': False}
+        ]
+        data = json.loads(client.get(f"{url}&cursor={data['next_cursor']}").data)
+        assert data['tasks'] == [{'title': 'Tarea 2', 'is_completed': False}]
+        
+        with query_recorder.recording() as statements:
+            response = client.get(f'/api/users/{user_id}?fields=id,name')
+        assert json.loads(response.data)['user'] == {'id': user_id, 'name': 'Hugo León'}
+        assert len(statements) == 1
+        assert 'users.name' in statements[0] and 'users.email' not in statements[0]
+        
+        # Campos desconocidos
+        assert client.get(f'/api/users/{user_id}/tasks?fields=secret').status_code == 400
+        assert client.get(f'/api/users/{user_id}?fields=task_version').status_code == 400
+    
+    def test_get_user_tasks_is_a_single_query(self, client, query_recorder):
+        """
+        Prueba de Integración 11: Listado de tareas en una sola consulta
+        Verifica que existencia del usuario y página salen de un único SELECT
+        """
+        user_response = client.post(
+            '/api/users',
+            data=json.dumps({'name': 'Nora Díaz', 'email': 'nora@example.com'}),
+            content_type='application/json'
+        )
+        user_id = json.loads(user_response.data)['user']['id']
+        
+        with query_recorder.recording() as statements:
+            # Usuario sin tareas: 200 con lista vacía
+            response = client.get(f'/api/users/{user_id}/tasks')
+            assert response.status_code == 200
+            assert json.loads(response.data)['tasks'] == []
+            assert len(statements) == 1
+            
+            # Usuario inexistente: 404 con la misma única consulta
+            assert client.get('/api/users/999/tasks').status_code == 404
+            assert len(statements) == 2
+        
+        client.post(
+            '/api/tasks/bulk',
+            data=json.dumps({'tasks': [
+                {'title': f'Tarea {i}', 'user_id': user_id} for i in range(3)
+            ]}),
+            content_type='application/json'
+        )
+        data = json.loads(client.get(f'/api/users/{user_id}/tasks?order=desc&limit=2').data)
+        assert [task['title'] for task in data['tasks']] == ['Tarea 2', 'Tarea 1']
+        data = json.loads(
+            client.get(f"/api/users/{user_id}/tasks?order=desc&limit=2&cursor={data['next_cursor']}").data
+        )
+        assert [task['title'] for task in data['tasks']] == ['Tarea 0']
+        assert data['next_cursor'] is None
+        
+        # Ninguna tarea cumple el filtro: 200 con lista vacía (no 404)
+        response = client.get(f'/api/users/{user_id}/tasks?is_completed=true')
+        assert response.status_code == 200
+        assert json.loads(response.data)['tasks'] == []
+    
+    def test_user_summary_follows_task_writes(self, client):
+        """
+        Prueba de Integración 12: Contadores de tareas y GET /api/users/:id/summary
+        Verifica los conteos tras crear, completar, reabrir y eliminar tareas
+        """
+        user_response = client.post(
+            '/api/users',
+            data=json.dumps({'name': 'Olga Paz', 'email': 'olga@example.com'}),
+            content_type='application/json'
+        )
+        user_id = json.loads(user_response.data)['user']['id']
+        
+        def summary():
+            data = json.loads(client.get(f'/api/users/{user_id}/summary').data)
+            return data['total'], data['completed'], data['pending']
+        
+        assert summary() == (0, 0, 0)
+        
+        task_ids = []
+        for title in ('A', 'B'):
+            response = client.post(
+                '/api/tasks',
+                data=json.dumps({'title': title, 'user_id': user_id}),
+                content_type='application/json'
+            )
+            task_ids.append(json.loads(response.data)['task']['id'])
+        bulk = client.post(
+            '/api/tasks/bulk',
+            data=json.dumps({'tasks': [{'title': f'L{i}', 'user_id': user_id} for i in range(3)]}),
+            content_type='application/json'
+        )
+        task_ids += [item['task']['id'] for item in json.loads(bulk.data)['tasks']]
+        assert summary() == (5, 0, 5)
+        
+        client.patch(f'/api/tasks/{task_ids[0]}/complete')
+        client.patch(f'/api/tasks/{task_ids[0]}/complete')
+        client.patch(
+            '/api/tasks/bulk',
+            data=json.dumps({'is_completed': True, 'task_ids': task_ids[1:3]}),
+            content_type='application/json'
+        )
+        assert summary() == (5, 3, 2)
+        
+        client.put(
+            f'/api/tasks/{task_ids[1]}',
+            data=json.dumps({'is_completed': False}),
+            content_type='application/json'
+        )
+        client.delete(f'/api/tasks/{task_ids[0]}')
+        client.delete(
+            '/api/tasks/bulk',
+            data=json.dumps({'task_ids': task_ids[2:4]}),
+            content_type='application/json'
+        )
+        assert summary() == (2, 0, 2)
+        
+        # Los conteos también se incluyen en GET /api/users/:id
+        user = json.loads(client.get(f'/api/users/{user_id}').data)['user']
+        assert user['task_counts'] == {'total': 2, 'completed': 0, 'pending': 2}
+        response = client.get(f'/api/users/{user_id}?fields=id,task_counts')
+        assert json.loads(response.data)['user'] == {
+            'id': user_id, 'task_counts': {'total': 2, 'completed': 0, 'pending': 2}
+        }
+        
+        assert client.get('/api/users/999/summary').status_code == 404
+    
+    def test_search_user_tasks(self, client):
+        """
+        Prueba de Integración 13: Búsqueda de texto completo (FTS5 en SQLite)
+        Verifica ranking, paginación, aislamiento por usuario y borrados
+        """
+        user_ids = []
+        for name, email in (('Pilar Vega', 'pilar@example.com'), ('Raúl Gómez', 'raul@example.com')):
+            response = client.post(
+                '/api/users',
+                data=json.dumps({'name': name, 'email': email}),
+                content_type='application/json'
+            )
+            user_ids.append(json.loads(response.data)['user']['id'])
+        user_id, other_id = user_ids
+        
+        response = client.post(
+            '/api/tasks/bulk',
+            data=json.dumps({'tasks': [
+                {'title': 'Llamar al banco', 'description': 'Preguntar por la leche de la oficina', 'user_id': user_id},
+                {'title': 'Comprar leche', 'description': 'En el supermercado', 'user_id': user_id},
+                {'title': 'Leche y pan', 'user_id': user_id},
+                {'title': 'Pagar la luz', 'user_id': user_id},
+                {'title': 'Comprar leche', 'user_id': other_id}
+            ]}),
+            content_type='application/json'
+        )
+        task_ids = [item['task']['id'] for item in json.loads(response.data)['tasks']]
+        
+        # Las coincidencias en el título van antes que las de la descripción
+        data = json.loads(client.get(f'/api/users/{user_id}/tasks/search?q=leche').data)
+        assert [task['id'] for task in data['tasks']][-1] == task_ids[0]
+        assert sorted(task['id'] for task in data['tasks']) == task_ids[:3]
+        
+        # Se exigen todos los términos; sin distinguir acentos ni mayúsculas
+        data = json.loads(client.get(f'/api/users/{user_id}/tasks/search?q=COMPRAR+léche').data)
+        assert [task['id'] for task in data['tasks']] == [task_ids[1]]
+        
+        # Paginación por cursor: mismas tareas y mismo orden que sin paginar
+        ranked = json.loads(client.get(f'/api/users/{user_id}/tasks/search?q=leche').data)['tasks']
+        url = f'/api/users/{user_id}/tasks/search?q=leche&limit=2'
+        first = json.loads(client.get(url).data)
+        second = json.loads(client.get(f"{url}&cursor={first['next_cursor']}").data)
+        assert first['tasks'] + second['tasks'] == ranked
+        assert second['next_cursor'] is None
+        
+        # Un cursor de otra búsqueda no es válido
+        response = client.get(
+            f"/api/users/{user_id}/tasks/search?q=pan&cursor={first['next_cursor']}"
+        )
+        assert response.status_code == 400
+        
+        # Las tareas eliminadas dejan de aparecer
+        client.delete(f'/api/tasks/{task_ids[2]}')
+        data = json.loads(client.get(f'/api/users/{user_id}/tasks/search?q=pan').data)
+        assert data['tasks'] == []
+        
+        assert client.get(f'/api/users/{user_id}/tasks/search').status_code == 400
+        assert client.get(f'/api/users/{user_id}/tasks/search?q=%22%2A').status_code == 400
+        assert client.get('/api/users/999/tasks/search?q=leche').status_code == 404
+
+
+class TestReadReplicaRouting:
+    """Pruebas de integración para el enrutamiento de lecturas a la réplica"""
+    
+    def test_reads_go_to_replica_except_after_own_writes(self):
+        """
+        Prueba de Integración 14: Lecturas a la réplica y ventana read-your-writes
+        La "réplica" es una base en memoria separada y vacía: si una lectura
+        llega a ella, el usuario no se encuentra
+        """
+        class ReplicaConfig(InMemoryTestConfig):
+            SQLALCHEMY_BINDS = {'replica': 'sqlite:///:memory:'}
+            USER_CACHE_BACKEND = 'none'
+        
+        app = create_app(ReplicaConfig)
+        try:
+            self._check_routing(app)
+        finally:
+            # Flask-SQLAlchemy registra la metadata del bind de forma global;
+            # se retira para no afectar a las aplicaciones de otras pruebas
+            db.metadatas.pop('replica', None)
+    
+    def _check_routing(self, app):
+        with app.app_context():
+            db.create_all(bind_key=None)
+            db.metadata.create_all(db.engines['replica'])
+        
+        writer = app.test_client()
+        response = writer.post(
+            '/api/users',
+            data=json.dumps({'name': 'Nora Vega', 'email': 'nora@example.com'}),
+            content_type='application/json'
+        )
+        user_id = json.loads(response.data)['user']['id']
+        assert 'primary_until' in response.headers['Set-Cookie']
+        
+        # El cliente que escribió lee del primario durante la ventana
+        assert writer.get(f'/api/users/{user_id}').status_code == 200
+        
+        # Otro cliente lee de la réplica (que aún no tiene el usuario)
+        reader = app.test_client()
+        assert reader.get(f'/api/users/{user_id}').status_code == 404
+        
+        # Una cookie que no firmó el servidor no abre la ventana
+        forger = app.test_client()
+        forger.set_cookie(PRIMARY_PIN_COOKIE, '9999999999.000')
+        assert forger.get(f'/api/users/{user_id}').status_code == 404
+        forger.set_cookie(PRIMARY_PIN_COOKIE, writer.get_cookie(PRIMARY_PIN_COOKIE).value + 'x')
+        assert forger.get(f'/api/users/{user_id}').status_code == 404
+        
+        # Las escrituras siempre van al primario, aunque las haga un lector
+        response = reader.post(
+            '/api/tasks',
+            data=json.dumps({'title': 'Tarea', 'user_id': user_id}),
+            content_type='application/json'
+        )
+        assert response.status_code == 201
+        assert reader.get(f'/api/users/{user_id}/tasks').status_code == 200
+
+
+    def test_replica_reads_do_not_leak_into_read_your_writes(self):
+        """
+        Prueba de Integración 21: Caché compartida con réplica retrasada
+        Una lectura de otro cliente desde la réplica no se cachea, y el
+        cliente que escribió no usa la caché durante su ventana
+        """
+        class LaggingReplicaConfig(InMemoryTestConfig):
+            SQLALCHEMY_BINDS = {'replica': 'sqlite:///:memory:'}
+            USER_CACHE_BACKEND = 'shared'
+        
+        app = create_app(LaggingReplicaConfig)
+        # Almacén compartido entre workers, como lo sería Redis
+        app.extensions['user_cache'] = SharedStoreCache(LocalSharedStore(), shared=True)
+        try:
+            self._check_lagging_replica(app)
+        finally:
+            db.metadatas.pop('replica', None)
+    
+    def _check_lagging_replica(self, app):
+        with app.app_context():
+            db.create_all(bind_key=None)
+            db.metadata.create_all(db.engines['replica'])
+        
+        writer = app.test_client()
+        response = writer.post(
+            '/api/users',
+            data=json.dumps({'name': 'Eva Ruiz', 'email': 'eva@example.com'}),
+            content_type='application/json'
+        )
+        user_id = json.loads(response.data)['user']['id']
+        
+        # La réplica tiene al usuario en su versión 0 y no recibe nada más
+        with app.app_context():
+            row = db.session.execute(User.__table__.select()).mappings().one()
+            with db.engines['replica'].begin() as connection:
+                connection.execute(User.__table__.insert(), dict(row))
+        
+        response = writer.post(
+            '/api/tasks',
+            data=json.dumps({'title': 'Recién creada', 'user_id': user_id}),
+            content_type='application/json'
+        )
+        assert response.status_code == 201
+        
+        # Otro cliente lee de la réplica (datos antiguos) sin llenar la caché
+        reader = app.test_client()
+        response = reader.get(f'/api/users/{user_id}/summary')
+        assert json.loads(response.data)['total'] == 0
+        with app.app_context():
+            assert app.extensions['user_cache'].get(f'user:{user_id}') is MISSING
+        
+        # El cliente que escribió ve su escritura y no recibe un 304 falso
+        response = writer.get(f'/api/users/{user_id}/summary')
+        assert json.loads(response.data)['total'] == 1
+        stale_etag = f'"tasks-{user_id}-v0-all"'
+        response = writer.get(f'/api/users/{user_id}/tasks', headers={'If-None-Match': stale_etag})
+        assert response.status_code == 200
+        assert json.loads(response.data)['count'] == 1
+
+
+class TestMetricsEndpoint:
+    """Pruebas de integración para GET /metrics"""
+    
+    def test_metrics_exposes_requests_latency_and_queries(self):
+        """
+        Prueba de Integración 15: GET /metrics en formato de texto de Prometheus
+        Verifica contadores por ruta y estado, latencia, peticiones en curso
+        y sentencias SQL por petición
+        
+        Usa una aplicación propia: en la compartida cada prueba corre dentro
+        de una transacción y sus SAVEPOINT también contarían como sentencias
+        """
+        app = create_app(InMemoryTestConfig)
+        with app.app_context():
+            db.create_all()
+        client = app.test_client()
+        
+        response = client.post(
+            '/api/users',
+            data=json.dumps({'name': 'Olga Paz', 'email': 'olga@example.com'}),
+            content_type='application/json'
+        )
+        user_id = json.loads(response.data)['user']['id']
+        assert client.get(f'/api/users/{user_id}').status_code == 200
+        assert client.get('/api/users/999').status_code == 404
+        
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain; version=0.0.4')
+        lines = response.get_data(as_text=True).splitlines()
+        
+        # Una serie por regla de URL, no por URL concreta
+        user_route = 'method="GET",route="/api/users/<int:user_id>"'
+        assert f'todo_api_http_requests_total{{{user_route},status="200"}} 1' in lines
+        assert f'todo_api_http_requests_total{{{user_route},status="404"}} 1' in lines
+        assert f'todo_api_http_request_duration_seconds_count{{{user_route}}} 2' in lines
+        assert f'todo_api_http_request_duration_seconds_bucket{{{user_route},le="+Inf"}} 2' in lines
+        assert f'todo_api_http_requests_in_progress{{{user_route}}} 0' in lines
+        
+        # El alta de usuario es un único INSERT ... ON CONFLICT
+        signup_route = 'method="POST",route="/api/users"'
+        assert f'todo_api_db_queries_per_request_sum{{{signup_route}}} 1.0' in lines
+        assert f'todo_api_db_queries_per_request_count{{{signup_route}}} 1' in lines
+        assert f'todo_api_db_duration_seconds_count{{{signup_route}}} 1' in lines
+        
+        # /metrics no pertenece a la API y no se mide a sí mismo
+        assert not any('route="/metrics"' in line for line in lines)
+
+
+class TestProfiling:
+    """Pruebas de integración para el perfilado opcional por petición"""
+    
+    def test_profiles_requests_with_header_or_sampling(self, tmp_path):
+        """
+        Prueba de Integración 19: Perfil cProfile y desglose SQL por petición
+        Solo se perfilan las peticiones con la cabecera X-Profile y el token
+        configurado (o las elegidas por muestreo)
+        """
+        class ProfilingConfig(InMemoryTestConfig):
+            PROFILING_ENABLED = True
+            PROFILING_TOKEN = 'secreto'
+            PROFILING_SAMPLE_RATE = 0.0
+            PROFILING_DIR = str(tmp_path / 'profiles')
+        
+        app = create_app(ProfilingConfig)
+        with app.app_context():
+            db.create_all()
+        client = app.test_client()
+        
+        response = client.post(
+            '/api/users',
+            data=json.dumps({'name': 'Iris Mora', 'email': 'iris@example.com'}),
+            content_type='application/json'
+        )
+        user_id = json.loads(response.data)['user']['id']
+        
+        # Sin cabecera o con un token incorrecto no se perfila
+        assert client.get(f'/api/users/{user_id}/tasks', headers={'X-Profile': 'otro'}).status_code == 200
+        assert list((tmp_path / 'profiles').iterdir()) == []
+        
+        response = client.get(f'/api/users/{user_id}/tasks', headers={'X-Profile': 'secreto'})
+        assert response.status_code == 200
+        [summary_path] = (tmp_path / 'profiles').glob('*.json')
+        summary = json.loads(summary_path.read_text(encoding='utf-8'))
+        assert summary['method'] == 'GET'
+        assert summary['route'] == '/api/users/<int:user_id>/tasks'
+        assert summary['status'] == 200
+        assert summary['sql']['queries'] == 1
+        assert summary['sql']['statements'][0]['count'] == 1
+        assert 'FROM users' in summary['sql']['statements'][0]['statement']
+        assert summary['sql']['total_ms'] <= summary['duration_ms']
+        
+        # El perfil en formato pstats incluye la llamada al controlador
+        stats = pstats.Stats(str(tmp_path / 'profiles' / summary['profile']))
+        assert any(
+            filename.endswith('task_controller.py') and function == 'get_user_tasks'
+            for filename, _, function in stats.stats
+        )
+        
+        # Con muestreo total se perfilan también las peticiones sin cabecera
+        app.config['PROFILING_SAMPLE_RATE'] = 1.0
+        assert client.get(f'/api/users/{user_id}').status_code == 200
+        assert len(list((tmp_path / 'profiles').glob('*.prof'))) == 2
+
+
+class TestConditionalRequestsAcrossWorkers:
+    """Pruebas de integración de los ETag con varios workers"""
+    
+    @pytest.mark.parametrize('cache_backend', ['memory', 'shared'])
+    def test_writes_on_one_worker_invalidate_etags_on_the_others(self, tmp_path, cache_backend):
+        """
+        Prueba de Integración 20: Dos workers con caché en proceso sobre la
+        misma base de datos (también 'shared' sin USER_CACHE_URL, que usa el
+        sustituto local). Tras una escritura en uno, el otro no responde 304
+        ni devuelve contadores antiguos
+        """
+        class SharedFileConfig(InMemoryTestConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'workers.db'}"
+            USER_CACHE_BACKEND = cache_backend
+        
+        reader_app = create_app(SharedFileConfig)
+        writer_app = create_app(SharedFileConfig)
+        with reader_app.app_context():
+            db.create_all()
+        reader = reader_app.test_client()
+        writer = writer_app.test_client()
+        
+        response = writer.post(
+            '/api/users',
+            data=json.dumps({'name': 'Nora Gil', 'email': 'nora@example.com'}),
+            content_type='application/json'
+        )
+        user_id = json.loads(response.data)['user']['id']
+        
+        # El lector carga al usuario y obtiene los ETag de la versión 0
+        user_etag = reader.get(f'/api/users/{user_id}').headers['ETag']
+        summary_etag = reader.get(f'/api/users/{user_id}/summary').headers['ETag']
+        tasks_etag = reader.get(f'/api/users/{user_id}/tasks').headers['ETag']
+        
+        # La escritura solo invalida la caché del proceso que la atiende
+        response = writer.post(
+            '/api/tasks',
+            data=json.dumps({'title': 'Desde otro worker', 'user_id': user_id}),
+            content_type='application/json'
+        )
+        assert response.status_code == 201
+        
+        response = reader.get(f'/api/users/{user_id}/summary', headers={'If-None-Match': summary_etag})
+        assert response.status_code == 200
+        assert json.loads(response.data)['total'] == 1
+        
+        response = reader.get(f'/api/users/{user_id}', headers={'If-None-Match': user_etag})
+        assert response.status_code == 200
+        assert json.loads(response.data)['user']['task_counts']['total'] == 1
+        
+        response = reader.get(f'/api/users/{user_id}/tasks', headers={'If-None-Match': tasks_etag})
+        assert response.status_code == 200
+        assert json.loads(response.data)['count'] == 1
+        
+        for app in (reader_app, writer_app):
+            with app.app_context():
+                db.engine.dispose()
+
+
+class TestQueryBudgets:
+    """Pruebas de integración para el presupuesto de consultas por endpoint"""
+    
+    def test_client_enforces_query_budget_per_endpoint(self, app, query_recorder):
+        """
+        Prueba de Integración 16: El cliente de pruebas falla si un endpoint
+        ejecuta más sentencias SQL de las declaradas en QUERY_BUDGETS
+        """
+        tasks_rule = ('GET', '/api/users/<int:user_id>/tasks')
+        complete_rule = ('PATCH', '/api/tasks/<int:task_id>/complete')
+        assert QUERY_BUDGETS[complete_rule] == 2
+        assert QUERY_BUDGETS[('PATCH', '/api/tasks/bulk')] == 2
+        assert ('DELETE', '/api/tasks/bulk') in QUERY_BUDGETS
+        
+        app.test_client_class = QueryBudgetClient
+        strict = app.test_client(
+            query_recorder=query_recorder,
+            query_budgets={tasks_rule: 0, complete_rule: 1}
+        )
+        user_id = self._create_user(strict)
+        response = strict.post(
+            '/api/tasks',
+            data=json.dumps({'title': 'Revisar', 'user_id': user_id}),
+            content_type='application/json'
+        )
+        task_id = json.loads(response.data)['task']['id']
+        
+        # El listado es una consulta; con presupuesto 0 el cliente falla
+        with pytest.raises(QueryBudgetExceeded) as exc_info:
+            strict.get(f'/api/users/{user_id}/tasks')
+        assert 'GET /api/users/<int:user_id>/tasks ejecutó 1 sentencias SQL' in str(exc_info.value)
+        assert 'FROM users LEFT OUTER JOIN' in str(exc_info.value)
+        
+        # Completar es el UPDATE ... RETURNING más el de los contadores
+        with pytest.raises(QueryBudgetExceeded) as exc_info:
+            strict.patch(f'/api/tasks/{task_id}/complete')
+        assert 'ejecutó 2 sentencias SQL (presupuesto: 1)' in str(exc_info.value)
+    
+    def _create_user(self, client):
+        response = client.post(
+            '/api/users',
+            data=json.dumps({'name': 'Pía Lara', 'email': 'pia@example.com'}),
+            content_type='application/json'
+        )
+        return json.loads(response.data)['user']['id']
@@ -0,0 +1,111 @@
+"""
+Pruebas de Integración - Migraciones del esquema
+Aplican las migraciones de migrations/ sobre una base vacía y verifican que
+el resultado coincide con los modelos y que la búsqueda funciona
+"""
+from alembic import command
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import inspect, text
+from app import create_app
+from src.config.database import db
+from src.config.migrations import init_migrations
+from src.services.task_service import TaskService
+from src.services.user_service import UserService
+from tests.conftest import InMemoryTestConfig
+
+
+class TestMigrations:
+    """Pruebas de integración de las migraciones versionadas"""
+    
+    def test_create_app_does_not_touch_the_schema(self):
+        """
+        Prueba de Integración 17: create_app no crea tablas
+        """
+        app = create_app(InMemoryTestConfig)
+        with app.app_context():
+            assert inspect(db.engine).get_table_names() == []
+    
+    def test_upgrade_matches_models_and_downgrade_drops_everything(self):
+        """
+        Prueba de Integración 18: upgrade crea el esquema de los modelos
+        Verifica con alembic check que no quedan diferencias, que la búsqueda
+        FTS5 funciona sobre el esquema migrado y que downgrade lo elimina
+        """
+        app = init_migrations(create_app(InMemoryTestConfig))
+        with app.app_context():
+            upgrade()
+            
+            tables = set(inspect(db.engine).get_table_names())
+            assert {'users', 'tasks', 'tasks_fts', 'alembic_version'} <= tables
+            indexes = {index['name'] for index in inspect(db.engine).get_indexes('tasks')}
+            assert 'ix_tasks_user_id_pending_created_at' in indexes
+            
+            # Lanza AutogenerateDiffsDetected si los modelos y la migración difieren
+            command.check(app.extensions['migrate'].migrate.get_config())
+            
+            user = UserService.create_user('Rita Paz', 'rita@example.com')
+            TaskService.create_task('Pagar factura', user.id, 'Luz y agua')
+            tasks, _ = TaskService.search_tasks(user.id, 'factura')
+            assert [task['title'] for task in tasks] == ['Pagar factura']
+            db.session.remove()
+            
+            downgrade(revision='base')
+            assert inspect(db.engine).get_table_names() == ['alembic_version']
+    
+    def test_task_counters_are_backfilled_from_existing_tasks(self):
+        """
+        Prueba de Integración 22: La migración de los contadores los
+        inicializa con las tareas que ya existían en la base
+        """
+        app = init_migrations(create_app(InMemoryTestConfig))
+        with app.app_context():
+            upgrade(revision='0001')
+            db.session.execute(text(
+                "INSERT INTO users (id, name, email, created_at) VALUES "
+                "(1, 'Ana', 'ana@example.com', CURRENT_TIMESTAMP), "
+                "(2, 'Luis', 'luis@example.com', CURRENT_TIMESTAMP)"
+            ))
+            db.session.execute(text(
+                "INSERT INTO tasks (title, is_completed, user_id, created_at) VALUES "
+                "('A', 1, 1, CURRENT_TIMESTAMP), ('B', 0, 1, CURRENT_TIMESTAMP), "
+                "('C', 0, 1, CURRENT_TIMESTAMP)"
+            ))
+            db.session.commit()
+            
+            upgrade()
+            
+            assert UserService.get_user_by_id(1).task_counts() == {'total': 3, 'completed': 1, 'pending': 2}
+            assert UserService.get_user_by_id(2).task_counts() == {'total': 0, 'completed': 0, 'pending': 0}
+            db.session.remove()
+    
+    def test_baseline_database_upgrades_to_head(self):
+        """
+        Prueba de Integración 23: Una base con el esquema original (revisión
+        0001, el db.create_all() de la versión inicial) y datos se actualiza
+        con upgrade: versión de tareas, índices y búsqueda sobre lo existente
+        """
+        app = init_migrations(create_app(InMemoryTestConfig))
+        with app.app_context():
+            upgrade(revision='0001')
+            columns = {column['name'] for column in inspect(db.engine).get_columns('users')}
+            assert columns == {'id', 'name', 'email', 'created_at'}
+            assert [index['name'] for index in inspect(db.engine).get_indexes('tasks')] == []
+            
+            db.session.execute(text(
+                "INSERT INTO users (id, name, email, created_at) VALUES "
+                "(1, 'Ana', 'ana@example.com', CURRENT_TIMESTAMP)"
+            ))
+            db.session.execute(text(
+                "INSERT INTO tasks (title, description, is_completed, user_id, created_at) VALUES "
+                "('Pagar factura', 'Luz y agua', 0, 1, CURRENT_TIMESTAMP)"
+            ))
+            db.session.commit()
+            
+            upgrade()
+            
+            assert UserService.get_user_by_id(1).task_version == 0
+            indexes = {index['name'] for index in inspect(db.engine).get_indexes('tasks')}
+            assert 'ix_tasks_user_id_pending_created_at' in indexes
+            tasks, _ = TaskService.search_tasks(1, 'factura')
+            assert [task['title'] for task in tasks] == ['Pagar factura']
+            db.session.remove()
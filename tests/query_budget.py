@@ -0,0 +1,204 @@
+"""
+Plugin de pytest - Presupuesto de consultas SQL por endpoint
+Cuenta las sentencias SQL de cada petición hecha con el cliente de pruebas
+y falla si un endpoint supera las declaradas en QUERY_BUDGETS. Así un N+1
+(p. ej. recorrer User.tasks, que es lazy) o una ida y vuelta extra a la
+base de datos rompen las pruebas en lugar de pasar desapercibidos.
+
+Se activa desde conftest.py con pytest_plugins = ['tests.query_budget'].
+"""
+from contextlib import contextmanager
+import json
+import pytest
+from flask.testing import FlaskClient
+from sqlalchemy import event
+from src.config.database import db
+
+def _bulk_create_budget(response):
+    """
+    Creación en lote: un SELECT ... IN que valida todos los usuarios, el
+    INSERT y el UPDATE de los contadores. SQLite no garantiza el orden de
+    RETURNING en un INSERT multi-fila, así que ahí es un INSERT por tarea.
+    """
+    created = len((response.get_json(silent=True) or {}).get('tasks', []))
+    return 2 + max(created, 1)
+
+
+def _task_list_budget(response):
+    """
+    Listado de tareas: una consulta (usuario y página juntos). Con
+    If-None-Match se comprueba antes la versión de tareas con un SELECT de
+    una columna, que basta para responder 304.
+    """
+    return 2 if response.request.headers.get('If-None-Match') else 1
+
+
+def _bulk_delete_budget(response):
+    """
+    Borrado en lote: el DELETE ... RETURNING y el UPDATE de los contadores.
+    Con chunk_size ese par se repite por lote, hasta el primer lote que
+    devuelve menos de chunk_size filas.
+    """
+    chunk_size = _request_json(response).get('chunk_size')
+    if not isinstance(chunk_size, int) or chunk_size < 1:
+        return 2
+    deleted = (response.get_json(silent=True) or {}).get('deleted', 0)
+    return 2 * (deleted // chunk_size + 1)
+
+
+def _request_json(response):
+    """Cuerpo JSON de la petición de una respuesta del cliente de pruebas."""
+    body = response.request.environ['wsgi.input'].getvalue()
+    try:
+        return json.loads(body) if body else {}
+    except ValueError:
+        return {}
+
+
+# Máximo de sentencias SQL por petición, por método y regla de URL (o una
+# función de la respuesta que lo calcula). Las escrituras de tareas incluyen
+# el UPDATE de los contadores del usuario en la misma transacción. Los
+# endpoints sin entrada no se limitan.
+QUERY_BUDGETS = {
+    ('POST', '/api/users'): 1,
+    ('GET', '/api/users/<int:user_id>'): 1,
+    ('GET', '/api/users/<int:user_id>/summary'): 1,
+    ('POST', '/api/tasks'): 2,
+    ('POST', '/api/tasks/bulk'): _bulk_create_budget,
+    ('PATCH', '/api/tasks/bulk'): 2,
+    ('DELETE', '/api/tasks/bulk'): _bulk_delete_budget,
+    ('GET', '/api/users/<int:user_id>/tasks'): _task_list_budget,
+    ('GET', '/api/users/<int:user_id>/tasks/search'): 2,
+    ('GET', '/api/users/<int:user_id>/tasks/export'): 2,
+    ('PUT', '/api/tasks/<int:task_id>'): 2,
+    ('PATCH', '/api/tasks/<int:task_id>/complete'): 2,
+    ('DELETE', '/api/tasks/<int:task_id>'): 2
+}
+
+# Sentencias de control de transacción que no cuentan como consultas
+TRANSACTION_CONTROL = ('BEGIN', 'SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Una petición o un bloque ejecutó más sentencias SQL de las permitidas."""
+
+
+def _budget_error(label, budget, statements):
+    listing = '\n'.join(f'  {index}. {statement}' for index, statement in enumerate(statements, 1))
+    return QueryBudgetExceeded(
+        f'{label} ejecutó {len(statements)} sentencias SQL (presupuesto: {budget}):\n{listing}'
+    )
+
+
+class QueryRecorder:
+    """
+    Registra las sentencias SQL ejecutadas en todos los engines de una
+    aplicación mientras está grabando.
+    """
+    
+    def __init__(self, app):
+        with app.app_context():
+            self.engines = list(db.engines.values())
+        self.statements = None
+    
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        # Los SAVEPOINT los emite la transacción de las pruebas, no la aplicación
+        if self.statements is not None and not statement.startswith(TRANSACTION_CONTROL):
+            self.statements.append(' '.join(statement.split()))
+    
+    def start(self):
+        for engine in self.engines:
+            event.listen(engine, 'before_cursor_execute', self._record)
+    
+    def stop(self):
+        for engine in self.engines:
+            event.remove(engine, 'before_cursor_execute', self._record)
+    
+    @contextmanager
+    def recording(self):
+        """
+        Graba las sentencias ejecutadas dentro del bloque.
+        
+        Yields:
+            list: Sentencias SQL en orden de ejecución (se completa al avanzar el bloque)
+        """
+        previous, self.statements = self.statements, []
+        statements = self.statements
+        try:
+            yield statements
+        finally:
+            self.statements = previous
+            if previous is not None:
+                previous.extend(statements)
+
+
+class QueryBudgetClient(FlaskClient):
+    """
+    Cliente de pruebas que comprueba el presupuesto de consultas de cada
+    petición. El endpoint se identifica por la regla de URL de la petición.
+    De las respuestas en streaming solo se cuenta lo ejecutado antes de
+    empezar a enviar el cuerpo.
+    """
+    
+    def __init__(self, *args, query_recorder=None, query_budgets=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.query_recorder = query_recorder
+        self.query_budgets = QUERY_BUDGETS if query_budgets is None else query_budgets
+    
+    def open(self, *args, **kwargs):
+        if self.query_recorder is None:
+            return super().open(*args, **kwargs)
+        
+        with self.query_recorder.recording() as statements:
+            response = super().open(*args, **kwargs)
+            if not response.is_streamed:
+                response.get_data()
+        
+        method, rule = self._endpoint(response)
+        budget = self.query_budgets.get((method, rule))
+        if callable(budget):
+            budget = budget(response)
+        if budget is not None and len(statements) > budget:
+            raise _budget_error(f'{method} {rule}', budget, statements)
+        return response
+    
+    def _endpoint(self, response):
+        environ = response.request.environ
+        adapter = self.application.url_map.bind_to_environ(environ)
+        try:
+            rule, _ = adapter.match(return_rule=True)
+        except Exception:
+            return environ['REQUEST_METHOD'], None
+        return environ['REQUEST_METHOD'], rule.rule
+
+
+@pytest.fixture(scope='function')
+def query_recorder(app):
+    """
+    Fixture que escucha las sentencias SQL de todos los engines de la app.
+    """
+    recorder = QueryRecorder(app)
+    recorder.start()
+    yield recorder
+    recorder.stop()
+
+
+@pytest.fixture(scope='function')
+def query_budget(query_recorder):
+    """
+    Fixture para limitar las sentencias SQL de un bloque arbitrario
+    (servicios, varias peticiones, etc.).
+    
+    Uso:
+        with query_budget(1) as statements:
+            TaskService.get_user_tasks_page(user_id)
+    """
+    @contextmanager
+    def limit(budget, label='El bloque'):
+        with query_recorder.recording() as statements:
+            yield statements
+        if len(statements) > budget:
+            raise _budget_error(label, budget, statements)
+    
+    return limit
+
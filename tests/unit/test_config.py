@@ -0,0 +1,132 @@
+"""
+Pruebas Unitarias - Capa de Configuración
+Prueban los componentes de configuración de la aplicación
+"""
+import json
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import NullPool
+from src.config import json_provider
+from src.config.config import build_engine_options
+from src.config.pool import InstrumentedQueuePool, pool_status
+from src.config.profiling import PROFILING_HEADER, _should_profile, sql_breakdown
+from src.config.json_provider import FastJSONProvider
+
+
+class TestJSONProvider:
+    """Pruebas unitarias para FastJSONProvider"""
+    
+    def test_fast_provider_is_installed_and_serializes_datetimes(self, app):
+        """
+        Prueba Unitaria: El proveedor rápido serializa fechas en ISO 8601
+        """
+        assert isinstance(app.json, FastJSONProvider)
+        moment = datetime(2025, 11, 21, 10, 30, 0, 123456)
+        
+        with app.app_context():
+            response = app.json.response({'created_at': moment, 'b': 1, 'a': 'ñ'})
+        
+        assert response.mimetype == 'application/json'
+        assert json.loads(response.data) == {
+            'a': 'ñ', 'b': 1, 'created_at': '2025-11-21T10:30:00.123456'
+        }
+        assert app.json.loads(app.json.dumps({'x': [1, 2]})) == {'x': [1, 2]}
+    
+    def test_fast_provider_falls_back_to_stdlib(self, app, monkeypatch):
+        """
+        Prueba Unitaria: Sin orjson se usa el json estándar con el mismo formato
+        """
+        monkeypatch.setattr(json_provider, 'orjson', None)
+        moment = datetime(2025, 11, 21, 10, 30)
+        
+        with app.app_context():
+            response = app.json.response({'created_at': moment})
+        
+        assert app.json.backend == 'json'
+        assert json.loads(response.data) == {'created_at': '2025-11-21T10:30:00'}
+
+
+class TestConnectionPool:
+    """Pruebas unitarias para la configuración y métricas del pool"""
+    
+    def test_build_engine_options_from_env(self, monkeypatch):
+        """
+        Prueba Unitaria: Las opciones del pool se leen de variables de entorno
+        """
+        monkeypatch.setenv('DB_POOL_SIZE', '20')
+        monkeypatch.setenv('DB_MAX_OVERFLOW', '5')
+        monkeypatch.setenv('DB_POOL_PRE_PING', 'False')
+        options = build_engine_options()
+        assert options['poolclass'] is InstrumentedQueuePool
+        assert options['pool_size'] == 20
+        assert options['max_overflow'] == 5
+        assert options['pool_pre_ping'] is False
+        
+        # Modo transacción de PgBouncer: sin pool propio
+        monkeypatch.setenv('DB_PGBOUNCER_TRANSACTION_MODE', 'True')
+        assert build_engine_options() == {'poolclass': NullPool}
+    
+    def test_instrumented_pool_records_wait_and_timeouts(self, tmp_path):
+        """
+        Prueba Unitaria: El pool instrumentado mide checkouts, esperas y timeouts
+        """
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05
+        )
+        try:
+            with engine.connect():
+                status = pool_status(engine)
+                assert status['checked_out'] == 1
+                assert status['checkouts'] == 1
+                
+                # Pool agotado: la segunda conexión espera y hace timeout
+                with pytest.raises(exc.TimeoutError):
+                    engine.connect()
+            
+            status = pool_status(engine)
+            assert status['pool_class'] == 'InstrumentedQueuePool'
+            assert status['checked_out'] == 0
+            assert status['timeouts'] == 1
+            assert status['wait_seconds_max'] >= 0.05
+        finally:
+            engine.dispose()
+
+
+class TestProfiling:
+    """Pruebas unitarias para el perfilado por petición"""
+    
+    def test_sql_breakdown_groups_statements_by_total_time(self):
+        """
+        Prueba Unitaria: El desglose SQL agrupa sentencias y ordena por tiempo
+        """
+        queries = [
+            ('SELECT users', 0.001),
+            ('UPDATE tasks', 0.004),
+            ('SELECT users', 0.002)
+        ]
+        
+        assert sql_breakdown(queries) == [
+            {'statement': 'UPDATE tasks', 'count': 1, 'total_ms': 4.0},
+            {'statement': 'SELECT users', 'count': 2, 'total_ms': 3.0}
+        ]
+        assert sql_breakdown([]) == []
+    
+    def test_should_profile_requires_the_exact_token(self, app):
+        """
+        Prueba Unitaria: Solo la cabecera X-Profile con el token exacto perfila
+        """
+        config = {'PROFILING_TOKEN': 's3cret', 'PROFILING_SAMPLE_RATE': 0.0}
+        cases = [({PROFILING_HEADER: 's3cret'}, True), ({PROFILING_HEADER: 's3cre'}, False),
+                 ({PROFILING_HEADER: ''}, False), ({}, False)]
+        for headers, expected in cases:
+            with app.test_request_context(headers=headers):
+                assert _should_profile(config) is expected
+        
+        # Sin token configurado la cabecera no tiene efecto
+        with app.test_request_context(headers={PROFILING_HEADER: ''}):
+            assert _should_profile({'PROFILING_TOKEN': None}) is False
@@ -3,11 +3,14 @@ Pruebas Unitarias - Capa de Servicios
 Prueban la lógica de negocio aislada sin dependencias HTTP
 """
 import pytest
+from src.config.metrics import Histogram, QUERY_COUNT_BUCKETS
+from src.services.cache import LRUCache, LocalSharedStore, SharedStoreCache, MISSING, create_cache
 from src.services.user_service import UserService
 from src.services.task_service import TaskService
 from src.models.user import User
 from src.models.task import Task
 from src.config.database import db
+from tests.query_budget import QueryBudgetExceeded
 
 
 class TestUserService:
@@ -30,6 +33,23 @@ class TestUserService:
             
             # Verificar mensaje de error
             assert 'ya está registrado' in str(exc_info.value).lower()
+    
+    def test_create_user_is_a_single_upsert(self, app, query_recorder):
+        """
+        Prueba Unitaria 11: create_user ejecuta un único INSERT ... ON CONFLICT
+        Verifica que no hay SELECT previo, ni en el alta ni en un duplicado
+        """
+        with app.app_context():
+            with query_recorder.recording() as statements:
+                user = UserService.create_user('Eva Ríos', 'eva@example.com')
+                assert user.to_dict()['email'] == 'eva@example.com'
+                with pytest.raises(ValueError):
+                    UserService.create_user('Otra Eva', 'eva@example.com')
+            
+            assert len(statements) == 2
+            assert all(statement.startswith('INSERT') for statement in statements)
+            assert all('ON CONFLICT' in statement for statement in statements)
+            assert User.query.count() == 1
 
 
 class TestTaskService:
@@ -101,3 +121,268 @@ class TestTaskService:
             # Intentar eliminar tarea inexistente
             with pytest.raises(ValueError):
                 TaskService.delete_task(999)
+    
+    def test_create_tasks_bulk_atomic_and_partial(self, app):
+        """
+        Prueba Unitaria 5: Creación masiva de tareas
+        Validación de negocio: modo atómico (todo o nada) y éxito parcial
+        """
+        with app.app_context():
+            user = UserService.create_user('Lucía Herrera', 'lucia@example.com')
+            items = [
+                {'title': 'Tarea A', 'user_id': user.id},
+                {'title': 'Tarea B', 'user_id': 999},
+                {'title': '', 'user_id': user.id},
+                {'title': 'Tarea C', 'user_id': user.id, 'description': 'Con detalle'}
+            ]
+            
+            # Modo atómico: un solo error cancela todo el lote
+            created, errors = TaskService.create_tasks(items, atomic=True)
+            assert created == []
+            assert [error['index'] for error in errors] == [1, 2]
+            assert Task.query.count() == 0
+            
+            # Modo parcial: se crean las válidas y se reportan las demás
+            created, errors = TaskService.create_tasks(items, atomic=False)
+            assert [index for index, _ in created] == [0, 3]
+            assert [row.title for _, row in created] == ['Tarea A', 'Tarea C']
+            assert all(row.is_completed is False for _, row in created)
+            assert [error['index'] for error in errors] == [1, 2]
+            assert 'no existe' in errors[0]['error']
+            assert Task.query.filter_by(user_id=user.id).count() == 2
+            
+            # Lote vacío
+            with pytest.raises(ValueError):
+                TaskService.create_tasks([])
+    
+    def test_create_tasks_bulk_rolls_back_on_foreign_key_violation(self, app, monkeypatch):
+        """
+        Prueba Unitaria: Si la clave foránea rechaza el INSERT masivo (el
+        usuario dejó de existir tras validarlo) se deshace la transacción y
+        se lanza ValueError, como en create_task
+        """
+        with app.app_context():
+            user = UserService.create_user('Iris Peña', 'iris@example.com')
+            # La validación previa "ve" al usuario 999, pero la fila no existe
+            monkeypatch.setattr(db.session, 'scalars', lambda statement: [user.id, 999])
+            items = [{'title': 'Válida', 'user_id': user.id}, {'title': 'Huérfana', 'user_id': 999}]
+            
+            with pytest.raises(ValueError) as exc_info:
+                TaskService.create_tasks(items)
+            assert 'no existe' in str(exc_info.value)
+            monkeypatch.undo()
+            
+            # La sesión sigue utilizable y no quedó ninguna tarea
+            assert Task.query.count() == 0
+            assert TaskService.create_task('Después', user.id).title == 'Después'
+    
+    def test_delete_tasks_by_predicate_in_chunks(self, app):
+        """
+        Prueba Unitaria 6: Borrado masivo por predicado y por lotes
+        Verifica el conteo de filas eliminadas y que no se toquen otras tareas
+        """
+        with app.app_context():
+            user = UserService.create_user('Andrés Mejía', 'andres@example.com')
+            created, _ = TaskService.create_tasks(
+                [{'title': f'Tarea {i}', 'user_id': user.id} for i in range(7)]
+            )
+            task_ids = [row.id for _, row in created]
+            TaskService.set_tasks_completion(True, task_ids=task_ids[:5])
+            
+            # Solo las completadas, en lotes de 2
+            deleted = TaskService.delete_tasks(user_id=user.id, is_completed=True, chunk_size=2)
+            assert deleted == 5
+            assert [task.id for task in Task.query.all()] == task_ids[5:]
+            
+            # Por lista de IDs en una sola sentencia
+            assert TaskService.delete_tasks(task_ids=task_ids) == 2
+            assert Task.query.count() == 0
+            
+            # Nunca se borra la tabla completa sin task_ids ni user_id
+            with pytest.raises(ValueError):
+                TaskService.delete_tasks(is_completed=True)
+    
+    def test_create_task_relies_on_foreign_key(self, app, query_recorder):
+        """
+        Prueba Unitaria 10: create_task valida el usuario con la clave foránea
+        Verifica que no hay SELECT previo ni posterior al INSERT y que un
+        usuario inexistente produce el mismo ValueError
+        """
+        with app.app_context():
+            user = UserService.create_user('Lina Mora', 'lina@example.com')
+            user_id = user.id
+            
+            with query_recorder.recording() as statements:
+                task = TaskService.create_task('Leer', user_id, 'Capítulo 3')
+                assert task.to_dict()['title'] == 'Leer'
+                assert task.created_at is not None
+            
+            # INSERT ... RETURNING más el incremento de task_version
+            assert [statement.split()[0] for statement in statements] == ['INSERT', 'UPDATE']
+            
+            with pytest.raises(ValueError) as exc_info:
+                TaskService.create_task('Huérfana', 999)
+            assert str(exc_info.value) == 'El usuario con ID 999 no existe'
+            assert Task.query.count() == 1
+    
+    def test_single_task_mutations_use_returning(self, app, query_recorder):
+        """
+        Prueba Unitaria 12: Actualizar y eliminar una tarea son una sola sentencia
+        Verifica que no se lee la fila antes de UPDATE/DELETE ... RETURNING
+        """
+        with app.app_context():
+            user = UserService.create_user('Iván Soto', 'ivan@example.com')
+            task_id = TaskService.create_task('Revisar', user.id).id
+            
+            with query_recorder.recording() as statements:
+                task = TaskService.mark_task_as_completed(task_id)
+                assert task.is_completed is True
+                assert Task.row_to_dict(task)['title'] == 'Revisar'
+                # Sin cambio de estado no se escribe nada
+                assert TaskService.mark_task_as_completed(task_id).is_completed is True
+                assert TaskService.delete_task(task_id) is True
+            
+            # UPDATE tasks + versión; UPDATE sin filas + SELECT; DELETE + versión
+            assert [statement.split()[0] for statement in statements] == [
+                'UPDATE', 'UPDATE', 'UPDATE', 'SELECT', 'DELETE', 'UPDATE'
+            ]
+            
+            with pytest.raises(ValueError):
+                TaskService.update_task_completion(task_id, False)
+            with pytest.raises(ValueError):
+                TaskService.delete_task(task_id)
+
+
+class TestUserCache:
+    """Pruebas unitarias para la caché de usuarios"""
+    
+    def test_lru_cache_evicts_and_expires(self):
+        """
+        Prueba Unitaria 7: La caché LRU expulsa por tamaño y expira por TTL
+        """
+        now = [0.0]
+        cache = LRUCache(max_size=2, ttl=10, clock=lambda: now[0])
+        cache.set('a', 1)
+        cache.set('b', 2)
+        assert cache.get('a') == 1
+        
+        # 'b' es la menos usada y se expulsa al insertar 'c'
+        cache.set('c', 3)
+        assert cache.get('b') is MISSING
+        assert cache.get('c') == 3
+        
+        # Expiración por TTL
+        now[0] = 11
+        assert cache.get('a') is MISSING
+        
+        stats = cache.stats()
+        assert stats['hits'] == 2
+        assert stats['misses'] == 2
+        assert stats['evictions'] == 1
+        assert stats['expirations'] == 1
+    
+    def test_shared_store_cache_round_trips_json(self):
+        """
+        Prueba Unitaria 8: La caché compartida serializa e invalida valores
+        Sobre el sustituto local no se considera compartida entre workers
+        """
+        cache = SharedStoreCache(LocalSharedStore(max_size=10), ttl=30)
+        assert cache.get('user:1') is MISSING
+        cache.set('user:1', {'id': 1, 'name': 'Ana'})
+        assert cache.get('user:1') == {'id': 1, 'name': 'Ana'}
+        cache.delete('user:1')
+        assert cache.get('user:1') is MISSING
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 2
+        
+        assert cache.shared is False
+        assert create_cache({'USER_CACHE_BACKEND': 'shared'}).shared is False
+        assert SharedStoreCache(LocalSharedStore(), shared=True).shared is True
+    
+    def test_get_user_by_id_reads_through_cache(self, app, query_recorder):
+        """
+        Prueba Unitaria 9: get_user_by_id y user_exists se sirven desde la caché
+        La caché en proceso guarda solo el perfil y lee la versión y los
+        contadores con un SELECT de esas columnas; la compartida guarda el
+        usuario completo y un acierto no consulta la base de datos
+        """
+        with app.app_context():
+            user = UserService.create_user('Sara Gil', 'sara@example.com')
+            user_id = user.id
+            
+            # Caché en proceso: el primer acceso es un fallo y cachea el perfil
+            assert UserService.get_user_by_id(user_id).email == 'sara@example.com'
+            db.session.remove()
+            with query_recorder.recording() as statements:
+                assert UserService.user_exists(user_id) is True
+                cached_user = UserService.get_user_by_id(user_id)
+            assert len(statements) == 1
+            assert 'task_version' in statements[0] and 'email' not in statements[0]
+            assert cached_user.to_dict()['name'] == 'Sara Gil'
+            assert UserService.cache_stats()['hits'] == 2
+            db.session.remove()
+            
+            # Caché compartida: primer acceso es un fallo y consulta la base de datos
+            app.extensions['user_cache'] = SharedStoreCache(LocalSharedStore(), shared=True)
+            assert UserService.get_user_by_id(user_id).email == 'sara@example.com'
+            db.session.remove()
+            
+            with query_recorder.recording() as statements:
+                cached_user = UserService.get_user_by_id(user_id)
+                assert UserService.user_exists(user_id) is True
+            
+            assert statements == []
+            assert cached_user.to_dict()['name'] == 'Sara Gil'
+            assert UserService.cache_stats()['hits'] == 2
+            
+            # Los usuarios inexistentes no se cachean
+            assert UserService.user_exists(999) is False
+
+
+class TestMetrics:
+    """Pruebas unitarias para el registro de métricas"""
+    
+    def test_histogram_renders_cumulative_buckets(self):
+        """
+        Prueba Unitaria 13: El histograma acumula buckets, suma y conteo
+        """
+        histogram = Histogram('queries', 'Sentencias', ('route',), buckets=QUERY_COUNT_BUCKETS)
+        for value in (0, 1, 1, 4, 200):
+            histogram.observe(value, ('/api/users',))
+        
+        lines = histogram.render()
+        assert lines[:2] == ['# HELP queries Sentencias', '# TYPE queries histogram']
+        assert 'queries_bucket{route="/api/users",le="0"} 1' in lines
+        assert 'queries_bucket{route="/api/users",le="1"} 3' in lines
+        assert 'queries_bucket{route="/api/users",le="5"} 4' in lines
+        assert 'queries_bucket{route="/api/users",le="100"} 4' in lines
+        assert 'queries_bucket{route="/api/users",le="+Inf"} 5' in lines
+        assert 'queries_sum{route="/api/users"} 206.0' in lines
+        assert 'queries_count{route="/api/users"} 5' in lines
+
+
+class TestQueryBudget:
+    """Pruebas unitarias para el presupuesto de consultas de un bloque"""
+    
+    def test_query_budget_catches_lazy_relationship_n_plus_one(self, app, query_budget):
+        """
+        Prueba Unitaria 14: query_budget detecta el N+1 de User.tasks (lazy)
+        """
+        with app.app_context():
+            for index in range(3):
+                user = UserService.create_user(f'Usuario {index}', f'usuario{index}@example.com')
+                TaskService.create_task(f'Tarea {index}', user.id)
+            db.session.remove()
+            
+            # Recorrer User.tasks lanza una consulta por usuario
+            with pytest.raises(QueryBudgetExceeded) as exc_info:
+                with query_budget(1, label='Listado de usuarios'):
+                    assert [len(user.tasks) for user in User.query.all()] == [1, 1, 1]
+            assert 'Listado de usuarios ejecutó 4 sentencias SQL' in str(exc_info.value)
+            db.session.remove()
+            
+            # La página de tareas de un usuario es una única consulta
+            with query_budget(1) as statements:
+                task_version, tasks, _ = TaskService.get_user_tasks_page(user.id)
+            assert len(statements) == 1
+            assert [task['title'] for task in tasks] == ['Tarea 2']